@@ -0,0 +1,242 @@
+import asyncio
+import contextlib
+import hashlib
+import io
+import logging
+import math
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+# Run fully offline and keep benchmark state out of the real stores; set before main is imported
+os.environ.setdefault('GEMINI_API_KEY', 'offline-benchmark')
+os.environ.setdefault('CREWAI_DISABLE_TELEMETRY', 'true')
+os.environ.setdefault('OTEL_SDK_DISABLED', 'true')
+os.environ.setdefault('SEMANTIC_CACHE_ENABLED', 'false')
+_BENCHMARK_DIR = tempfile.mkdtemp(prefix='legal-benchmark-')
+os.environ.setdefault('LEGAL_JOB_STORE_PATH', os.path.join(_BENCHMARK_DIR, 'jobs.sqlite3'))
+os.environ.setdefault('LEGAL_UPLOAD_DIR', os.path.join(_BENCHMARK_DIR, 'uploads'))
+
+import httpx
+from crewai import BaseLLM
+import main
+from legal_crew.legal_crew import LegalCrew
+from legal_crew.crew_pool import LegalCrewPool
+from legal_crew.law_retriever import estimate_tokens
+from legal_crew.contract_clauses import get_clause_cache
+
+BENCHMARK_CONTRACT = """HUUROVEREENKOMST WOONRUIMTE
+Huurder: {tenant}
+
+Artikel 1 Het gehuurde
+1.1 Verhuurder verhuurt aan huurder de woning aan de {address}.
+1.2 Het gehuurde is bestemd om te worden gebruikt als woonruimte.
+
+Artikel 2 Duur
+2.1 Deze overeenkomst is aangegaan voor onbepaalde tijd.
+
+Artikel 3 Huurprijs
+3.1 De huurprijs bedraagt EUR {rent} per maand.
+3.2 De huurprijs wordt jaarlijks per 1 juli verhoogd met 15%.
+
+Artikel 4 Servicekosten
+4.1 Huurder betaalt een voorschot op de servicekosten van EUR 50 per maand.
+
+Artikel 5 Onderhoud
+5.1 Kleine herstellingen komen voor rekening van huurder.
+5.2 Onderhoud aan de cv-ketel komt voor rekening van huurder.
+"""
+
+# Request bodies per scenario; n makes every request unique so the response cache does not answer it
+SCENARIOS = {
+    'easy_answer': lambda n: {"question": f"How high may the deposit for my apartment be? (case {n})"},
+    # Dated within the shipped indicator series, so the rent fast path can answer it
+    'rent_increase': lambda n: {"question": f"My landlord announced a rent increase from €{900 + n} to €{990 + n} per month from 1 July 2025. Is that legal?"},
+    # No amounts, so the rent fast path cannot answer it and the rent analyst does
+    'rent_analysis': lambda n: {"question": f"My landlord announced a rent increase for next year (case {n}). Is that legal?"},
+    'contract': lambda n: {
+        "question": f"Is my rental contract legal? (case {n})",
+        "contract_text": BENCHMARK_CONTRACT.format(tenant=f"Tenant {n}", address=f"Dorpsstraat {n}", rent=1000 + n),
+    },
+    'full_debate': lambda n: {"question": f"My landlord has not repaired the heating for weeks. Can I withhold rent? (case {n})"},
+}
+
+
+def canned_outputs() -> dict:
+    """Outputs per agent role that drive each scenario down its intended path."""
+    def easy_answer(prompt):
+        question = re.search(r"Question: (.*)", prompt)
+        if question and "deposit" in question.group(1).lower():
+            return "The deposit may not exceed twice the basic monthly rent."
+        return "NEEDS_EXPERT"
+
+    def contract_clause(prompt):
+        clause = prompt.split("CLAUSE:", 1)[-1].split("RELEVANT_LAW_ARTICLES", 1)[0]
+        if "15%" in clause:
+            return "An annual increase of 15% exceeds the legal maximum (Huurprijzenwet woonruimte)."
+        return "NO_ISSUES"
+
+    return {
+        'Easy Answer Finder': easy_answer,
+        'Law Selector': "Huurprijzenwet woonruimte, Burgerlijk Wetboek Boek 5, Besluit kleine herstellingen",
+        'Contract Analyzer': contract_clause,
+        'Rent Increase Analyst': "The increase is within the legal limit for the applicable CPI.",
+        'Tenant Rights Lawyer': "The landlord must remedy defects; the tenant may claim a rent reduction.",
+        'Landlord Rights Lawyer': "The tenant must first give the landlord notice and a reasonable term.",
+        # Split first-round votes: the debate goes to a second round, then the tenant side wins
+        'Left-Leaning Judge': "obviously_tenant",
+        'Right-Leaning Judge': "obviously_landlord",
+        'Centrist Judge': "most_likely_tenant",
+    }
+
+
+class BenchmarkLLM(BaseLLM):
+    """
+    Deterministic stand-in for Gemini. Answers with a canned output for the calling
+    agent's role after a simulated latency drawn from a log-normal distribution
+    around median_latency. The latency of a call depends only on its prompt and the
+    seed, so repeated runs are comparable. Counts calls and estimated tokens.
+    """
+
+    def __init__(self, outputs: dict, median_latency: float = 0.5, latency_sigma: float = 0.35, seed: int = 42):
+        super().__init__(model="benchmark-stand-in")
+        self.outputs = outputs
+        self.median_latency = median_latency
+        self.latency_sigma = latency_sigma
+        self.seed = seed
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        prompt = "\n".join(str(message.get("content", "")) for message in messages)
+        system = str(messages[0].get("content", ""))
+        role = next((role for role in self.outputs if f"You are {role}." in system), None)
+        output = self.outputs.get(role, "NEEDS_EXPERT")
+        if callable(output):
+            output = output(prompt)
+
+        rng = random.Random(hashlib.sha256(f"{self.seed}:{prompt}".encode('utf-8')).digest())
+        if self.median_latency > 0:
+            time.sleep(self.median_latency * math.exp(rng.gauss(0, self.latency_sigma)))
+
+        completion = f"Thought: I now know the final answer\nFinal Answer: {output}"
+        usage = SimpleNamespace(prompt_tokens=estimate_tokens(prompt), completion_tokens=estimate_tokens(completion))
+        # Report usage the way litellm does, so crewai's token counts and the stage metrics see it
+        for callback in callbacks or []:
+            if hasattr(callback, 'log_success_event'):
+                callback.log_success_event({}, {"usage": usage}, None, None)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += usage.prompt_tokens
+            self.completion_tokens += usage.completion_tokens
+        return completion
+
+    def take_counts(self) -> tuple:
+        """(calls, prompt tokens, completion tokens) since the last call, and reset them."""
+        with self._lock:
+            counts = (self.calls, self.prompt_tokens, self.completion_tokens)
+            self.calls = self.prompt_tokens = self.completion_tokens = 0
+            return counts
+
+
+def percentile(values: list, p: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+async def run_cell(client, llm, scenario: str, concurrency: int, requests: int, first_case: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], [0]
+
+    async def one(case):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post('/legal-advice', json=SCENARIOS[scenario](case))
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200 or response.json().get("status") == "error":
+                errors[0] += 1
+
+    # Each cell starts cold so cells are comparable
+    main.response_cache.clear()
+    get_clause_cache().clear()
+    llm.take_counts()
+    start = time.perf_counter()
+    await asyncio.gather(*(one(first_case + index) for index in range(requests)))
+    wall_seconds = time.perf_counter() - start
+    # Wait for speculative stages still running so their LLM calls are counted in this cell
+    while main.crew_pool.stats()["available"] < main.crew_pool.size:
+        await asyncio.sleep(0.05)
+    calls, prompt_tokens, completion_tokens = llm.take_counts()
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors[0],
+        "throughput": requests / wall_seconds,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "llm_calls": calls / requests,
+        "prompt_tokens": prompt_tokens / requests,
+        "completion_tokens": completion_tokens / requests,
+    }
+
+
+def benchmark_pipeline(concurrency_levels=(1, 4, 8), requests_per_level: int = 16, scenarios=tuple(SCENARIOS),
+                       median_latency: float = 0.5, latency_sigma: float = 0.35, seed: int = 42):
+    """
+    Drive /legal-advice end to end with a deterministic stand-in LLM: every scenario
+    at every concurrency level, through the real app (crew pool, pipeline executor,
+    caches, fast path) in-process via httpx's ASGI transport. Reports throughput,
+    p50/p95/p99 latency, and LLM calls and estimated tokens per request.
+    """
+    logging.disable(logging.INFO)
+    llm = BenchmarkLLM(canned_outputs(), median_latency, latency_sigma, seed)
+    print(f"Benchmarking {', '.join(scenarios)} at concurrency {', '.join(map(str, concurrency_levels))}, "
+          f"{requests_per_level} requests each, LLM latency median {median_latency * 1000:.0f} ms "
+          f"(sigma {latency_sigma}, seed {seed})")
+
+    async def run():
+        main.crew_pool = LegalCrewPool(size=max(concurrency_levels), crew_factory=lambda: LegalCrew(llm=llm))
+        await main.build_crew_pool()
+        results = []
+        try:
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+                case = 0
+                for scenario in scenarios:
+                    for concurrency in concurrency_levels:
+                        # The agents print verbosely; keep that out of the report
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            result = await run_cell(client, llm, scenario, concurrency, requests_per_level, case)
+                        case += requests_per_level
+                        results.append(result)
+                        print(f"- {scenario} at concurrency {concurrency} done", file=sys.stderr)
+        finally:
+            await main.stop_pipeline_executor()
+        return results
+
+    results = asyncio.run(run())
+
+    print(f"\n{'scenario':<14}{'conc':>5}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'LLM calls':>11}{'prompt tok':>12}{'compl tok':>11}{'errors':>8}")
+    for result in results:
+        print(f"{result['scenario']:<14}{result['concurrency']:>5}{result['throughput']:>8.2f}"
+              f"{result['p50'] * 1000:>9.0f}{result['p95'] * 1000:>9.0f}{result['p99'] * 1000:>9.0f}"
+              f"{result['llm_calls']:>11.1f}{result['prompt_tokens']:>12.0f}{result['completion_tokens']:>11.0f}"
+              f"{result['errors']:>8}")
+    print("\nLLM calls and tokens are per request; tokens are estimated at four characters per token.")
+    return results
+
+if __name__ == "__main__":
+    benchmark_pipeline()
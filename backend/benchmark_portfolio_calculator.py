@@ -0,0 +1,66 @@
+import time
+import logging
+import numpy as np
+from legal_crew.percentage_calculator import PercentageCalculator
+from legal_crew.portfolio_calculator import PortfolioCalculator
+from legal_crew.cpi_tool import CPITool
+
+def benchmark_portfolio_calculator(rows: int = 50000, seed: int = 42):
+    """
+    Compare checking a synthetic housing portfolio row by row with the scalar
+    PercentageCalculator against one PortfolioCalculator.check_rent_changes call,
+    and verify both give the same answers.
+    """
+    rng = np.random.default_rng(seed)
+    current = rng.uniform(400, 2500, rows).round(2)
+    proposed = (current * (1 + rng.uniform(-0.02, 0.08, rows))).round(2)
+
+    percentage_calculator = PercentageCalculator()
+    legal_limit = CPITool().calculate_legal_increase()
+    portfolio_calculator = PortfolioCalculator(percentage_calculator)
+
+    print(f"Checking {rows} rent changes against a {legal_limit:.2f}% limit")
+
+    def run_scalar_path():
+        start = time.perf_counter()
+        changes, legal = [], []
+        for original, new in zip(current.tolist(), proposed.tolist()):
+            change = percentage_calculator.calculate_percentage_change(original, new)
+            changes.append(change)
+            legal.append(percentage_calculator.is_increase_legal(change, legal_limit))
+        return time.perf_counter() - start, changes, legal
+
+    # The scalar path logs two INFO lines per row; measure it with the records going
+    # to a NullHandler (so terminal output does not dominate) and with logging disabled
+    root = logging.getLogger()
+    root.handlers, root_level = [logging.NullHandler()], root.level
+    root.setLevel(logging.INFO)
+    logged_seconds, _, _ = run_scalar_path()
+    root.setLevel(root_level)
+
+    logging.disable(logging.INFO)
+    scalar_seconds, scalar_changes, scalar_legal = run_scalar_path()
+
+    print(f"\nScalar PercentageCalculator with INFO logging:")
+    print(f"- Total: {logged_seconds * 1000:.1f} ms")
+    print(f"- Per row: {logged_seconds / rows * 1e6:.2f} µs")
+    print(f"\nScalar PercentageCalculator, logging disabled:")
+    print(f"- Total: {scalar_seconds * 1000:.1f} ms")
+    print(f"- Per row: {scalar_seconds / rows * 1e6:.2f} µs")
+
+    start = time.perf_counter()
+    results = portfolio_calculator.check_rent_changes(current, proposed)
+    vector_seconds = time.perf_counter() - start
+    print(f"\nPortfolioCalculator.check_rent_changes:")
+    print(f"- Total: {vector_seconds * 1000:.1f} ms")
+    print(f"- Per row: {vector_seconds / rows * 1e6:.3f} µs")
+    print(f"- Speedup: {scalar_seconds / vector_seconds:.0f}x over the scalar path without logging, "
+          f"{logged_seconds / vector_seconds:.0f}x with logging")
+
+    matches = np.allclose(results['percentage_change'], scalar_changes) and \
+        np.array_equal(results['is_legal'], np.array(scalar_legal))
+    print(f"\nResults identical to scalar path: {matches}")
+    print(f"Summary: {portfolio_calculator.summarize(results)}")
+
+if __name__ == "__main__":
+    benchmark_portfolio_calculator()
@@ -0,0 +1,22 @@
+import sys
+from legal_crew.article_store import STORE_DIR
+from legal_crew.law_ingestion import ingest_laws
+
+def main():
+    # --full re-parses every file; by default only new or changed files are parsed
+    report = ingest_laws(full='--full' in sys.argv[1:])
+    manifest = report['manifest']
+
+    print(f"Updated article store in {STORE_DIR} in {report['seconds']:.2f}s")
+    print(f"Parsed {len(report['parsed'])} files, removed {len(report['removed'])}, {report['unchanged']} unchanged")
+    for name in report['parsed']:
+        print(f"- parsed {name}")
+    for name in report['removed']:
+        print(f"- removed {name}")
+    print(f"Corpus version: {manifest['corpus_version']}")
+    for bwb_id, law in sorted(manifest['laws'].items()):
+        versions = ', '.join(f"{v['date']} ({v['articles']} articles)" for v in law['versions'])
+        print(f"- {bwb_id}: {law['citeertitel']} [{versions}]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+On-disk article store built from the wetten.overheid.nl BWB XML files in backend/laws.
+
+Every BWB file is parsed once into a small JSON shard holding its articles, and a
+manifest records which laws and consolidations exist (see law_ingestion, which
+only re-parses files that changed). At runtime only the manifest
+is read up front; a law's shard is loaded the first time one of its articles is
+needed, so no XML is touched while answering a question.
+
+A law can have several consolidations (one BWB file per inwerkingtreding date).
+Lookups take an optional reference date and resolve to the consolidation in force
+on that date; only that version's shard is loaded. Articles that did not change
+between versions are shared in memory rather than held once per version.
+"""
+import bisect
+import hashlib
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from .law_catalogue import TitleCatalogue
+
+logger = logging.getLogger(__name__)
+
+# Bump when the shard/manifest layout changes so old stores get rebuilt
+STORE_FORMAT_VERSION = 3
+
+LAWS_DIR = Path(__file__).parent.parent / 'laws'
+STORE_DIR = LAWS_DIR / 'article_store'
+MANIFEST_NAME = 'manifest.json'
+
+# BWB file names look like BWBR0014315_2025-02-12_0.xml
+BWB_FILE_PATTERN = re.compile(r'^(BWBR\d+)_(\d{4}-\d{2}-\d{2})_(\d+)\.xml$')
+
+
+def file_fingerprint(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def corpus_version(fingerprints: dict) -> str:
+    """Short, stable version id for a set of file fingerprints."""
+    sha = hashlib.sha256()
+    for name in sorted(fingerprints):
+        sha.update(f"{name}:{fingerprints[name]}\n".encode('utf-8'))
+    return sha.hexdigest()[:16]
+
+
+class ArticleStore:
+    """
+    Read-only view of the article store with constant-time lookups by law title,
+    BWB id and article number. Shards are loaded on first use and kept in memory.
+    """
+
+    def __init__(self, store_dir: Path = STORE_DIR):
+        logger.info("Initializing ArticleStore")
+        self.store_dir = store_dir
+        with open(store_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format_version') != STORE_FORMAT_VERSION:
+            raise ValueError(f"Article store format {manifest.get('format_version')} is not supported")
+
+        self._articles = {}  # (bwb_id, version date) -> {number: article}
+        # One article dict per distinct (label, text), shared by every version containing it
+        self._shared_articles = {}
+        self._lock = threading.Lock()
+        self._apply_manifest(manifest)
+
+    def _apply_manifest(self, manifest: dict):
+        catalogue = TitleCatalogue(manifest['catalogue'])
+        # Consolidation dates per law, oldest first, for bisecting by reference date
+        version_dates = {
+            bwb_id: [version['date'] for version in law['versions']]
+            for bwb_id, law in manifest['laws'].items()
+        }
+        self.manifest = manifest
+        self.corpus_version = manifest['corpus_version']
+        self.laws = manifest['laws']
+        self.catalogue = catalogue
+        self._version_dates = version_dates
+
+    def refresh(self, manifest: dict, affected_bwb_ids):
+        """
+        Switch to a new manifest after an incremental ingest. Loaded versions of the
+        affected laws are dropped and reloaded from their new shards on next use;
+        every other law keeps its loaded articles.
+        """
+        affected = set(affected_bwb_ids)
+        with self._lock:
+            self._apply_manifest(manifest)
+            self._articles = {key: articles for key, articles in self._articles.items() if key[0] not in affected}
+            self._shared_articles = {
+                (article['label'], article['text']): article
+                for articles in self._articles.values()
+                for article in articles.values()
+            }
+        logger.info(f"Refreshed article store for {len(affected)} laws (corpus version {self.corpus_version})")
+
+    def resolve_title(self, title: str):
+        """Return the BWB id for a law title, alias or BWB id, or None if unknown."""
+        return self.catalogue.resolve(title)
+
+    def law_titles(self) -> list:
+        """The citeertitel of every law in the store, alphabetically."""
+        return sorted(law['citeertitel'] for law in self.laws.values() if law['citeertitel'])
+
+    def version_on(self, bwb_id: str, on_date=None) -> dict:
+        """
+        Return the manifest entry of the consolidation of a law in force on a date
+        (a datetime.date or ISO string; default: the latest consolidation). For a
+        date before the first consolidation in the corpus, the oldest one is returned.
+        """
+        versions = self.laws[bwb_id]['versions']
+        if on_date is None:
+            return versions[-1]
+        on_date = on_date if isinstance(on_date, str) else on_date.isoformat()
+        position = bisect.bisect_right(self._version_dates[bwb_id], on_date) - 1
+        return versions[max(position, 0)]
+
+    def get_articles(self, bwb_id: str, on_date=None) -> dict:
+        """Return {article number: {'label', 'text'}} for the consolidation of a law in force on on_date."""
+        version = self.version_on(bwb_id, on_date)
+        key = (bwb_id, version['date'])
+        articles = self._articles.get(key)
+        if articles is not None:
+            return articles
+
+        with self._lock:
+            if key not in self._articles:
+                with open(self.store_dir / 'shards' / version['shard'], 'r', encoding='utf-8') as f:
+                    shard = json.load(f)
+                self._articles[key] = {
+                    number: self._shared_articles.setdefault((label, text), {'label': label, 'text': text})
+                    for number, label, text in shard['articles']
+                }
+            return self._articles[key]
+
+    def get_article(self, bwb_id: str, number: str, on_date=None):
+        return self.get_articles(bwb_id, on_date).get(number)
+
+    def get_law(self, title: str, on_date=None):
+        """
+        Look up a law by title or BWB id, as in force on on_date (default: latest).
+        Returns:
+            Dict with title, bwb_id, version date and articles, or None if unknown
+        """
+        bwb_id = self.resolve_title(title)
+        if bwb_id is None:
+            return None
+        law = self.laws[bwb_id]
+        version = self.version_on(bwb_id, on_date)
+        return {
+            'title': law['citeertitel'],
+            'bwb_id': bwb_id,
+            'version': version['date'],
+            'articles': self.get_articles(bwb_id, on_date),
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "laws": len(self.laws),
+                "loaded_versions": len(self._articles),
+                "article_slots": sum(len(articles) for articles in self._articles.values()),
+                "distinct_articles": len(self._shared_articles),
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+# Serializes ingestion runs, which write the same manifest and shard files; always
+# taken before _store_lock
+ingest_lock = threading.RLock()
+
+
+def get_article_store() -> ArticleStore:
+    """
+    Process-wide ArticleStore. Changes to the XML corpus in backend/laws are ingested
+    first, re-parsing only the files that are new or changed since the last run.
+    """
+    global _store
+    with _store_lock:
+        if _store is not None:
+            return _store
+    with ingest_lock, _store_lock:
+        if _store is None:
+            from .law_ingestion import ingest_laws  # law_ingestion builds on this module
+            ingest_laws()
+            _store = ArticleStore()
+        return _store
+
+
+def refresh_article_store(manifest: dict, affected_bwb_ids):
+    """Update the process-wide ArticleStore, if one was created, after an incremental ingest."""
+    with _store_lock:
+        store = _store
+    if store is not None:
+        store.refresh(manifest, affected_bwb_ids)
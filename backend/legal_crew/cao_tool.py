@@ -1,17 +1,35 @@
 import logging
+from datetime import date
+from .indicator_store import get_indicator_store
 
 logger = logging.getLogger(__name__)
 
+# Used when the indicator store has no CAO value for the requested date
+DEFAULT_CAO_INDEX = 3.0
+
 class CAOTool:
-    def __init__(self):
+    def __init__(self, indicator_store=None):
         logger.info("Initializing CAO Tool")
+        self.indicator_store = indicator_store or get_indicator_store()
         
     def get_current_cao_index(self) -> float:
         """
         Get the current CAO (Collective Labor Agreement) wage index percentage.
-        For now, returns a fixed 3% as requested.
-        In the future, this could be replaced with a real API call to get actual CAO data.
         """
         logger.info("Getting current CAO index")
-        # TODO: Replace with actual CAO API call
-        return 3.0  # Fixed 3% for now 
\ No newline at end of file
+        return self.get_cao_index_on(date.today())
+
+    def get_cao_index_on(self, on_date: date) -> float:
+        """
+        Get the CAO wage index percentage in force on a date, from the indicator store.
+        Falls back to DEFAULT_CAO_INDEX if the store has no value for that date.
+        """
+        cao_index = self.indicator_store.value_on('cao', on_date)
+        if cao_index is None:
+            logger.warning(f"No CAO index value for {on_date}, using default {DEFAULT_CAO_INDEX}%")
+            return DEFAULT_CAO_INDEX
+        return cao_index 
+
+    def has_cao_index_for(self, on_date: date) -> bool:
+        """Whether the indicator store holds the CAO wage index published for a date."""
+        return self.indicator_store.covers('cao', on_date)
@@ -0,0 +1,139 @@
+"""
+Clause-level view of rental contracts for the contract-analysis stage.
+
+Contracts are segmented into clauses at their article/clause headings so each
+clause can be analysed on its own, concurrently and with only the law articles
+relevant to it. Findings are memoized process-wide by the normalized clause text
+(numbering stripped), so standard model clauses (e.g. the ROZ general provisions)
+are analysed once for all customers, and merged back into one report. A clause
+that another request is already analysing is waited for rather than analysed again.
+"""
+import logging
+import os
+import re
+import threading
+from .law_retriever import chunk_article
+from .response_cache import ResponseCache
+from .single_flight import ThreadSingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Clauses are packed up to this size; longer ones are split on line boundaries
+MAX_CLAUSE_CHARS = 2500
+MAX_LABEL_CHARS = 60
+DEFAULT_CLAUSE_CACHE_MAX_ENTRIES = 20000
+DEFAULT_CLAUSE_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# An analysis that found nothing wrong with a clause starts with this marker
+NO_ISSUES = 'NO_ISSUES'
+
+# "Artikel 4", "Article 4a", "§ 4", "4." or "4)" start a clause; "4.2" starts a sub-clause
+_TOP_HEADING = re.compile(r'^\s*(?:(?:artikel|article|clause)\s+\d+[a-z]?\b|§\s*\d+|\d{1,2}[.)]\s)', re.IGNORECASE)
+_SUB_HEADING = re.compile(r'^\s*\d{1,2}\.\d{1,2}(?:\.\d{1,2})*\.?\s')
+# Numbering at the start of a line, which differs between otherwise identical contracts
+_LINE_NUMBERING = re.compile(
+    r'^\s*(?:(?:artikel|article|clause)\s+\d+[a-z]?(?:\.\d+)*|§\s*\d+|\d{1,2}(?:\.\d{1,2})*[.)]?(?=\s))[.:]?',
+    re.IGNORECASE | re.MULTILINE
+)
+# Markdown emphasis, headings, quotes and bullets an LLM may put around its reply
+_DECORATION = re.compile(r'^[\s*_`#>"\'-]+')
+
+
+def _label(text: str, index: int) -> str:
+    first_line = text.strip().split('\n', 1)[0].strip()
+    if not first_line:
+        return f"Clause {index}"
+    return first_line if len(first_line) <= MAX_LABEL_CHARS else first_line[:MAX_LABEL_CHARS - 1].rstrip() + '…'
+
+
+def segment_clauses(contract_text: str, max_chars: int = MAX_CLAUSE_CHARS) -> list:
+    """
+    Split a contract into clauses.
+    Clauses start at top-level headings; sub-clauses ("4.2") stay with their clause
+    while it is below max_chars. A contract without headings is split into
+    paragraphs packed up to max_chars.
+    Returns:
+        List of dicts with label and text, in contract order
+    """
+    lines = contract_text.replace('\r\n', '\n').split('\n')
+    segments, current = [], []
+    has_headings = any(_TOP_HEADING.match(line) or _SUB_HEADING.match(line) for line in lines)
+
+    if has_headings:
+        for line in lines:
+            top = _TOP_HEADING.match(line)
+            sub = _SUB_HEADING.match(line)
+            current_size = sum(len(part) + 1 for part in current)
+            if current and (top or (sub and current_size + len(line) > max_chars)):
+                segments.append('\n'.join(current))
+                current = []
+            current.append(line)
+        if current:
+            segments.append('\n'.join(current))
+    else:
+        paragraphs = [paragraph for paragraph in re.split(r'\n\s*\n', contract_text) if paragraph.strip()]
+        for paragraph in paragraphs:
+            current_size = sum(len(part) + 2 for part in current)
+            if current and current_size + len(paragraph) > max_chars:
+                segments.append('\n\n'.join(current))
+                current = []
+            current.append(paragraph)
+        if current:
+            segments.append('\n\n'.join(current))
+
+    clauses = []
+    for segment in segments:
+        if not segment.strip():
+            continue
+        for chunk in chunk_article(segment.strip(), max_chars):
+            clauses.append({'label': _label(chunk, len(clauses) + 1), 'text': chunk})
+    return clauses
+
+
+def clause_cache_text(clause_text: str) -> str:
+    """The part of a clause its analysis depends on: the text without its numbering."""
+    return _LINE_NUMBERING.sub('', clause_text)
+
+
+def has_issues(finding: str) -> bool:
+    """Whether a clause finding reports issues; "NO_ISSUES", also as "**NO_ISSUES**", does not."""
+    return not _DECORATION.sub('', str(finding)).upper().startswith(NO_ISSUES)
+
+
+def merge_clause_findings(clauses: list, findings: list) -> str:
+    """Combine per-clause findings into one contract analysis report."""
+    flagged = [(clause, finding) for clause, finding in zip(clauses, findings) if has_issues(finding)]
+    summary = f"Contract analysis of {len(clauses)} clause(s): {len(flagged)} with potential issues."
+    if not flagged:
+        return f"{summary}\nNo potentially illegal clauses were found."
+    sections = [f"### {clause['label']}\n{str(finding).strip()}" for clause, finding in flagged]
+    return summary + "\n\n" + "\n\n".join(sections)
+
+
+_clause_cache = None
+_clause_cache_lock = threading.Lock()
+_clause_flight = None
+
+
+def get_clause_cache() -> ResponseCache:
+    """
+    Process-wide cache of clause findings. Keys include the CPI/CAO values and the
+    law corpus like the response cache, so findings are redone when either changes.
+    """
+    global _clause_cache
+    with _clause_cache_lock:
+        if _clause_cache is None:
+            _clause_cache = ResponseCache(
+                max_entries=int(os.getenv('CLAUSE_CACHE_MAX_ENTRIES', DEFAULT_CLAUSE_CACHE_MAX_ENTRIES)),
+                ttl_seconds=float(os.getenv('CLAUSE_CACHE_TTL_SECONDS', DEFAULT_CLAUSE_CACHE_TTL_SECONDS))
+            )
+        return _clause_cache
+
+
+def get_clause_flight() -> ThreadSingleFlight:
+    """Process-wide coalescing of clause analyses, keyed by clause cache key."""
+    global _clause_flight
+    with _clause_cache_lock:
+        if _clause_flight is None:
+            _clause_flight = ThreadSingleFlight()
+        return _clause_flight
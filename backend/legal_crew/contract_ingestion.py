@@ -0,0 +1,328 @@
+"""
+Uploaded contracts: streamed to disk and turned into text for the contract-analysis
+path.
+
+Uploads are read in chunks and written to a content-addressed file in the upload
+directory while their sha256 and size are accumulated, so a large PDF is never held
+in memory and oversized uploads are cut off early. Text extraction (pdfplumber for
+PDF, the document XML for DOCX) is CPU-bound and runs in a process pool, off the
+API workers. Extracted text is cached on disk by content hash, so the same contract
+uploaded again is not extracted twice.
+
+Starlette receives a multipart body in full before an endpoint runs, so the size
+limit is enforced on the upload routes by UploadSizeLimitMiddleware, before the body
+is read. Uploads are tenants' personal documents: stored files and extracted text
+are deleted after a retention period (prune).
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+import xml.etree.ElementTree as ET
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from starlette.exceptions import HTTPException
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = Path(__file__).parent.parent / 'uploads'
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+DEFAULT_MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+DEFAULT_EXTRACTION_WORKERS = 2
+# Room for the multipart boundaries and form fields around the file in an upload request
+MULTIPART_OVERHEAD_BYTES = 1024 * 1024
+DEFAULT_UPLOAD_RETENTION_SECONDS = 24 * 60 * 60
+# Uploads older than the retention period are deleted at most this often
+PRUNE_INTERVAL_SECONDS = 60 * 60
+
+PDF, DOCX, TEXT = 'pdf', 'docx', 'text'
+_WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class UploadTooLargeError(Exception):
+    status_code = 413
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        super().__init__(f"Uploaded file exceeds the limit of {max_bytes} bytes")
+
+
+class UnsupportedDocumentError(Exception):
+    status_code = 415
+
+
+def detect_kind(head: bytes, filename: str = None, content_type: str = None):
+    """
+    Document type from the first bytes of a file, falling back to its name and
+    content type for plain text. Returns PDF, DOCX, TEXT or None.
+    """
+    if head.startswith(b'%PDF'):
+        return PDF
+    if head.startswith(b'PK\x03\x04'):
+        # Other zip-based formats fail in extraction with a clear error
+        return DOCX
+    name = (filename or '').lower()
+    if (content_type or '').startswith('text/') or name.endswith(('.txt', '.md')):
+        return TEXT
+    return None
+
+
+def extract_pdf_text(path: str) -> str:
+    import pdfplumber  # only needed in the extraction workers
+
+    pages = []
+    try:
+        with pdfplumber.open(path) as pdf:
+            for page in pdf.pages:
+                pages.append(page.extract_text() or '')
+                # pdfplumber caches layout objects per page; free them as we go
+                page.flush_cache()
+    except Exception as e:
+        # pdfminer raises a variety of parser errors for damaged or encrypted files
+        raise UnsupportedDocumentError(f"Not a readable PDF document: {e}") from e
+    return '\n\n'.join(page for page in pages if page.strip())
+
+
+def extract_docx_text(path: str) -> str:
+    try:
+        with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as document:
+            paragraphs, current = [], []
+            for event, element in ET.iterparse(document, events=('end',)):
+                if element.tag == f'{_WORD_NAMESPACE}t':
+                    current.append(element.text or '')
+                elif element.tag == f'{_WORD_NAMESPACE}tab':
+                    current.append('\t')
+                elif element.tag in (f'{_WORD_NAMESPACE}br', f'{_WORD_NAMESPACE}cr'):
+                    current.append('\n')
+                elif element.tag == f'{_WORD_NAMESPACE}p':
+                    paragraphs.append(''.join(current))
+                    current = []
+                    element.clear()
+    except (KeyError, zipfile.BadZipFile) as e:
+        raise UnsupportedDocumentError(f"Not a readable DOCX document: {e}") from e
+    return '\n'.join(paragraph for paragraph in paragraphs if paragraph.strip())
+
+
+def extract_text(path: str, kind: str) -> str:
+    """Extract the text of a stored upload. Runs in an extraction worker process."""
+    if kind == PDF:
+        return extract_pdf_text(path)
+    if kind == DOCX:
+        return extract_docx_text(path)
+    with open(path, 'rb') as f:
+        return f.read().decode('utf-8', errors='replace')
+
+
+def max_upload_request_bytes() -> int:
+    """Largest upload request body accepted: LEGAL_UPLOAD_MAX_REQUEST_BYTES, or one maximum-size file."""
+    default = int(os.getenv('LEGAL_UPLOAD_MAX_BYTES', DEFAULT_MAX_UPLOAD_BYTES)) + MULTIPART_OVERHEAD_BYTES
+    return int(os.getenv('LEGAL_UPLOAD_MAX_REQUEST_BYTES', default))
+
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware that keeps oversized request bodies on the given paths from being
+    received. A request whose Content-Length is over the limit is answered with 413
+    before any of its body is read; a body without Content-Length (chunked) is cut
+    off with 413 as soon as it passes the limit.
+    """
+
+    def __init__(self, app, paths, max_bytes: int = None):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = max_bytes or max_upload_request_bytes()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        message = f"Upload exceeds the limit of {self.max_bytes} bytes"
+        headers = dict(scope["headers"])
+        try:
+            content_length = int(headers.get(b"content-length", b""))
+        except ValueError:
+            content_length = None
+        if content_length is not None and content_length > self.max_bytes:
+            logger.warning(f"Rejected upload of {content_length} bytes to {scope['path']}")
+            await self._send_too_large(send, message)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            event = await receive()
+            if event["type"] == "http.request":
+                received += len(event.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    logger.warning(f"Cut off upload to {scope['path']} after {received} bytes")
+                    # Raised while FastAPI parses the form; HTTPExceptions stop the request there
+                    raise HTTPException(status_code=UploadTooLargeError.status_code, detail=message)
+            return event
+
+        async def guarded_send(event):
+            nonlocal response_started
+            # The app's own error response to the cut-off body is replaced by ours below
+            if exceeded and not response_started:
+                return
+            response_started = response_started or event["type"] == "http.response.start"
+            await send(event)
+
+        await self.app(scope, limited_receive, guarded_send)
+        if exceeded and not response_started:
+            await self._send_too_large(send, message)
+
+    @staticmethod
+    async def _send_too_large(send, message: str):
+        """Answer 413 in the {"status": "error", "message": ...} shape of the API's other errors."""
+        body = json.dumps({"status": "error", "message": message}).encode('utf-8')
+        await send({
+            "type": "http.response.start",
+            "status": UploadTooLargeError.status_code,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                        (b"connection", b"close")],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class ContractIngestion:
+    def __init__(self, upload_dir: Path = None, max_upload_bytes: int = None, workers: int = None):
+        self.upload_dir = Path(upload_dir or os.getenv('LEGAL_UPLOAD_DIR', UPLOAD_DIR))
+        self.max_upload_bytes = max_upload_bytes or int(os.getenv('LEGAL_UPLOAD_MAX_BYTES', DEFAULT_MAX_UPLOAD_BYTES))
+        workers = workers or int(os.getenv('CONTRACT_EXTRACTION_WORKERS', DEFAULT_EXTRACTION_WORKERS))
+        logger.info(f"Initializing ContractIngestion in {self.upload_dir} with {workers} extraction workers")
+        (self.upload_dir / 'files').mkdir(parents=True, exist_ok=True)
+        (self.upload_dir / 'text').mkdir(parents=True, exist_ok=True)
+        # Spawned, not forked: the API process runs threads that must not be copied mid-flight
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        # Extractions in progress by content hash, so concurrent uploads of one file share a run
+        self._in_flight = {}
+        self._extractions = 0
+        self._cache_hits = 0
+        self._stored_bytes = 0
+        self._pruned = 0
+        self._last_prune = 0.0
+
+    async def save_upload(self, upload) -> dict:
+        """
+        Stream an UploadFile to disk in chunks.
+        Returns:
+            Dict with filename, content_type, size, sha256, kind and path
+        Raises:
+            UploadTooLargeError: The upload is larger than the configured limit
+            UnsupportedDocumentError: The file is not a PDF, DOCX or text document
+        """
+        temporary_path = self.upload_dir / 'files' / f".{uuid.uuid4().hex}.part"
+        sha = hashlib.sha256()
+        size, head = 0, b''
+        try:
+            with open(temporary_path, 'wb') as f:
+                while chunk := await upload.read(UPLOAD_CHUNK_BYTES):
+                    size += len(chunk)
+                    if size > self.max_upload_bytes:
+                        raise UploadTooLargeError(self.max_upload_bytes)
+                    if len(head) < 8:
+                        head += chunk[:8 - len(head)]
+                    sha.update(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+
+            kind = detect_kind(head, upload.filename, upload.content_type)
+            if kind is None:
+                raise UnsupportedDocumentError(
+                    f"Unsupported file type for {upload.filename}; upload a PDF, DOCX or text file")
+            sha256 = sha.hexdigest()
+            path = self.upload_dir / 'files' / sha256
+            # Content-addressed: an identical upload replaces the file with the same bytes
+            os.replace(temporary_path, path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+
+        self._stored_bytes += size
+        logger.info(f"Stored upload {upload.filename} ({size} bytes, {kind}) as {sha256[:12]}")
+        if time.monotonic() - self._last_prune > PRUNE_INTERVAL_SECONDS:
+            await asyncio.to_thread(self.prune)
+        return {
+            "filename": upload.filename,
+            "content_type": upload.content_type,
+            "size": size,
+            "sha256": sha256,
+            "kind": kind,
+            "path": str(path),
+        }
+
+    async def extract(self, stored: dict) -> str:
+        """Text of a stored upload, from the cache or extracted in the process pool."""
+        sha256 = stored["sha256"]
+        text_path = self.upload_dir / 'text' / f"{sha256}.txt"
+        if text_path.exists():
+            self._cache_hits += 1
+            # Retention counts from the latest upload of the document
+            text_path.touch()
+            return await asyncio.to_thread(text_path.read_text, encoding='utf-8')
+
+        future = self._in_flight.get(sha256)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = asyncio.ensure_future(self._extract(loop, stored, text_path))
+            self._in_flight[sha256] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(sha256, None))
+        else:
+            self._cache_hits += 1
+        return await asyncio.shield(future)
+
+    async def _extract(self, loop, stored: dict, text_path: Path) -> str:
+        text = await loop.run_in_executor(self._executor, extract_text, stored["path"], stored["kind"])
+        self._extractions += 1
+        temporary_path = text_path.with_suffix('.tmp')
+        await asyncio.to_thread(temporary_path.write_text, text, encoding='utf-8')
+        os.replace(temporary_path, text_path)
+        logger.info(f"Extracted {len(text)} characters from {stored['filename']}")
+        return text
+
+    async def ingest(self, upload) -> dict:
+        """Store an upload and extract its text; the stored details plus 'text'."""
+        stored = await self.save_upload(upload)
+        return {**stored, "text": await self.extract(stored)}
+
+    def prune(self, retention_seconds: float = None) -> int:
+        """Delete stored uploads and extracted text older than the retention period. Returns the number deleted."""
+        retention_seconds = retention_seconds or float(
+            os.getenv('LEGAL_UPLOAD_RETENTION_SECONDS', DEFAULT_UPLOAD_RETENTION_SECONDS))
+        self._last_prune = time.monotonic()
+        cutoff = time.time() - retention_seconds
+        deleted = 0
+        for directory in (self.upload_dir / 'files', self.upload_dir / 'text'):
+            for path in directory.iterdir():
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                        deleted += 1
+                except FileNotFoundError:
+                    # Replaced or deleted concurrently
+                    continue
+        self._pruned += deleted
+        if deleted:
+            logger.info(f"Pruned {deleted} upload file(s) older than {retention_seconds:.0f}s")
+        return deleted
+
+    def stats(self) -> dict:
+        return {
+            "extractions": self._extractions,
+            "text_cache_hits": self._cache_hits,
+            "in_flight": len(self._in_flight),
+            "stored_bytes": self._stored_bytes,
+            "pruned_files": self._pruned,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
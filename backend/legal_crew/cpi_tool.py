@@ -1,30 +1,49 @@
 import logging
+from datetime import date
+from .indicator_store import get_indicator_store
 
 logger = logging.getLogger(__name__)
 
+# Used when the indicator store has no CPI value for the requested date
+DEFAULT_CPI = 2.0
+
 class CPITool:
-    def __init__(self):
+    def __init__(self, indicator_store=None):
         logger.info("Initializing CPI Tool")
+        self.indicator_store = indicator_store or get_indicator_store()
         
     def get_current_cpi(self) -> float:
         """
         Get the current CPI (Consumer Price Index) percentage.
-        For now, returns a fixed 2% as requested.
-        In the future, this could be replaced with a real API call to get actual CPI data.
         """
         logger.info("Getting current CPI")
-        # TODO: Replace with actual CPI API call
-        return 2.0  # Fixed 2% for now
+        return self.get_cpi_on(date.today())
+
+    def get_cpi_on(self, on_date: date) -> float:
+        """
+        Get the CPI percentage in force on a date, from the indicator store.
+        Falls back to DEFAULT_CPI if the store has no value for that date.
+        """
+        cpi = self.indicator_store.value_on('cpi', on_date)
+        if cpi is None:
+            logger.warning(f"No CPI value for {on_date}, using default {DEFAULT_CPI}%")
+            return DEFAULT_CPI
+        return cpi
+
+    def has_cpi_for(self, on_date: date) -> bool:
+        """Whether the indicator store holds the CPI figure published for a date."""
+        return self.indicator_store.covers('cpi', on_date)
         
-    def calculate_legal_increase(self, base_percentage: float = 1.0) -> float:
+    def calculate_legal_increase(self, base_percentage: float = 1.0, on_date: date = None) -> float:
         """
         Calculate the legal rent increase percentage based on CPI.
         Args:
             base_percentage: The base percentage to add to CPI (default 1.0%)
+            on_date: Date of the increase (default today)
         Returns:
             The total legal increase percentage
         """
-        cpi = self.get_current_cpi()
+        cpi = self.get_cpi_on(on_date or date.today())
         total_increase = cpi + base_percentage
         logger.info(f"Calculated legal increase: CPI ({cpi}%) + base ({base_percentage}%) = {total_increase}%")
-        return total_increase 
\ No newline at end of file
+        return total_increase 
@@ -0,0 +1,91 @@
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from .legal_crew import LegalCrew
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 4
+
+
+class LegalCrewPool:
+    """
+    Process-wide pool of ready-to-use LegalCrew instances.
+
+    Building a LegalCrew creates the CPI/CAO/percentage tools, the tool wrappers
+    and all nine agents. The pool does that once at startup and lends the same
+    instances to every request. A crew is only ever used by one request at a time;
+    per-request state such as the VotingTracker is created inside process_question
+    and never stored on the crew.
+    """
+
+    def __init__(self, size: int = None, crew_factory=LegalCrew):
+        self.size = size or int(os.getenv('LEGAL_CREW_POOL_SIZE', DEFAULT_POOL_SIZE))
+        if self.size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self._crews = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._acquisitions = 0
+        self._total_wait_seconds = 0.0
+
+        start = time.perf_counter()
+        for _ in range(self.size):
+            self._crews.put(crew_factory())
+        self.build_seconds = time.perf_counter() - start
+        logger.info(f"Built LegalCrew pool with {self.size} crews in {self.build_seconds:.3f}s")
+
+    @contextmanager
+    def acquire(self, timeout: float = None):
+        """
+        Borrow a crew for the duration of a request.
+        Args:
+            timeout: Seconds to wait for a free crew (None waits forever)
+        Raises:
+            queue.Empty: If no crew became available within the timeout
+        """
+        start = time.perf_counter()
+        crew = self._crews.get(timeout=timeout)
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._acquisitions += 1
+            self._total_wait_seconds += waited
+        try:
+            yield crew
+        finally:
+            self._release(crew)
+
+    def _release(self, crew):
+        # A stage abandoned by an early exit may still be using this crew's agents;
+        # only hand the crew out again once all of them have finished.
+        pending = crew.take_abandoned_stages()
+        if not pending:
+            self._crews.put(crew)
+            return
+
+        logger.info(f"Deferring crew release until {len(pending)} abandoned stage(s) finish")
+        remaining = [len(pending)]
+        lock = threading.Lock()
+
+        def on_stage_done(_future):
+            with lock:
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                self._crews.put(crew)
+
+        for future in pending:
+            future.add_done_callback(on_stage_done)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "available": self._crews.qsize(),
+                "acquisitions": self._acquisitions,
+                "total_wait_seconds": round(self._total_wait_seconds, 6),
+                "build_seconds": round(self.build_seconds, 6),
+            }
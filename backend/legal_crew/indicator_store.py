@@ -0,0 +1,159 @@
+"""
+File-backed time series of the economic indicators rent increases are tied to.
+
+backend/indicators/indicators.csv lists, per indicator (cpi, cao), the value that
+applies from an effective date onwards. The file is loaded once per process into
+sorted arrays so "value on date X" is a binary search, and it is re-read
+automatically when it changes on disk.
+"""
+import bisect
+import csv
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+INDICATORS_PATH = Path(__file__).parent.parent / 'indicators' / 'indicators.csv'
+# How often to re-stat the indicator file for changes
+RELOAD_CHECK_SECONDS = 5.0
+# Indicators are published yearly; an older value is a stand-in, not the figure for the date
+MAX_VALUE_AGE_DAYS = 366
+
+
+def load_indicator_series(path: Path) -> dict:
+    """
+    Read the indicator file.
+    Returns:
+        Dict of indicator name -> (sorted effective dates, values); rows that cannot
+        be read are logged and skipped, and a later row for the same date wins
+    """
+    rows = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        lines = (line for line in f if line.strip() and not line.lstrip().startswith('#'))
+        for row in csv.DictReader(lines):
+            try:
+                name = row['indicator'].strip().lower()
+                effective_date = date.fromisoformat(row['effective_date'].strip())
+                value = float(row['value'])
+            except (KeyError, AttributeError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping unreadable indicator row {dict(row)} in {path}: {e}")
+                continue
+            rows.setdefault(name, {})[effective_date] = value
+
+    series = {}
+    for name, values in rows.items():
+        dates = sorted(values)
+        series[name] = (dates, [values[effective_date] for effective_date in dates])
+    return series
+
+
+class IndicatorStore:
+    def __init__(self, path: Path = None):
+        self.path = Path(path or os.getenv('LEGAL_INDICATORS_PATH', INDICATORS_PATH))
+        logger.info(f"Initializing IndicatorStore from {self.path}")
+        self._lock = threading.Lock()
+        self._series = {}
+        self._file_state = None
+        self.version = ''
+        self._checked_at = time.monotonic()
+        self._load()
+
+    def value_on(self, indicator: str, on_date: date = None):
+        """
+        The indicator value in force on a date (default today).
+        Returns:
+            The value, or None if the series is unknown or starts after the date
+        """
+        self._reload_if_changed()
+        series = self._series.get(indicator.lower())
+        if series is None:
+            return None
+        dates, values = series
+        position = bisect.bisect_right(dates, on_date or date.today()) - 1
+        return values[position] if position >= 0 else None
+
+    def effective_date(self, indicator: str, on_date: date = None):
+        """The effective date of the value in force on a date, or None."""
+        self._reload_if_changed()
+        series = self._series.get(indicator.lower())
+        if series is None:
+            return None
+        dates, _ = series
+        position = bisect.bisect_right(dates, on_date or date.today()) - 1
+        return dates[position] if position >= 0 else None
+
+    def covers(self, indicator: str, on_date: date = None) -> bool:
+        """
+        Whether the file holds the figure published for a date (default today): the
+        value in force took effect at most MAX_VALUE_AGE_DAYS before it. Only then may
+        the value be presented as the one in force on that date.
+        """
+        on_date = on_date or date.today()
+        effective_date = self.effective_date(indicator, on_date)
+        return effective_date is not None and (on_date - effective_date).days <= MAX_VALUE_AGE_DAYS
+
+    def series(self, indicator: str) -> list:
+        """All (effective date, value) pairs of an indicator, oldest first."""
+        self._reload_if_changed()
+        dates, values = self._series.get(indicator.lower(), ([], []))
+        return list(zip(dates, values))
+
+    def reload(self):
+        with self._lock:
+            self._load()
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_CHECK_SECONDS:
+            return
+        with self._lock:
+            self._checked_at = now
+            if self._stat() != self._file_state:
+                logger.info(f"Indicator file {self.path} changed, reloading")
+                self._load()
+
+    def _stat(self):
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _load(self):
+        file_state = self._stat()
+        if file_state is None:
+            logger.warning(f"Indicator file {self.path} not found; the tools fall back to their defaults")
+            series, version = {}, ''
+        else:
+            try:
+                series = load_indicator_series(self.path)
+            except (OSError, UnicodeDecodeError, csv.Error) as e:
+                # Keep serving the last good series rather than failing requests
+                logger.error(f"Could not read indicator file {self.path}: {e}")
+                self._file_state = file_state
+                return
+            with open(self.path, 'rb') as f:
+                version = hashlib.sha256(f.read()).hexdigest()[:16]
+        # Swap in complete structures so lock-free readers never see a partial load
+        self._series = series
+        self.version = version
+        self._file_state = file_state
+        logger.info(f"Loaded indicator series: {', '.join(f'{name} ({len(dates)})' for name, (dates, _) in series.items())}")
+
+
+_indicator_store = None
+_indicator_store_lock = threading.Lock()
+
+
+def get_indicator_store() -> IndicatorStore:
+    """Process-wide IndicatorStore, loaded on first use."""
+    global _indicator_store
+    with _indicator_store_lock:
+        if _indicator_store is None:
+            _indicator_store = IndicatorStore()
+        return _indicator_store
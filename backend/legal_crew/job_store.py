@@ -0,0 +1,161 @@
+"""
+SQLite-backed store for asynchronous legal advice jobs.
+
+Every stage result is written as soon as the pipeline reports it, so a job that is
+interrupted (client gone, worker crash, restart) can be resumed later without
+recomputing the stages that already finished.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_STORE_PATH = Path(__file__).parent.parent / 'jobs.sqlite3'
+DEFAULT_RETENTION_SECONDS = 7 * 24 * 60 * 60
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    question TEXT NOT NULL,
+    contract_text TEXT,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_stages (
+    job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    stage_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (job_id, stage_key)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status);
+"""
+
+
+class JobStore:
+    def __init__(self, path: str = None):
+        self.path = str(path or os.getenv('LEGAL_JOB_STORE_PATH', DEFAULT_JOB_STORE_PATH))
+        logger.info(f"Initializing JobStore at {self.path}")
+        # One connection shared by the event loop and pipeline threads, serialized by the lock
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA foreign_keys=ON")
+            self._connection.executescript(SCHEMA)
+
+    def create_job(self, question: str, contract_text: str = None) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO jobs (id, question, contract_text, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, question, contract_text, QUEUED, now, now)
+            )
+        return job_id
+
+    def get_job(self, job_id: str, include_stages: bool = True):
+        """
+        Returns:
+            Dict with the job's fields (and its stage events in order), or None
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            job = dict(row)
+            if include_stages:
+                stages = self._connection.execute(
+                    "SELECT event FROM job_stages WHERE job_id = ? ORDER BY seq", (job_id,)
+                ).fetchall()
+                job['stages'] = [json.loads(stage['event']) for stage in stages]
+        return job
+
+    def add_stage(self, job_id: str, event: dict):
+        """Record a stage event. Re-reporting a stage (e.g. after a resume) replaces it."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO job_stages (job_id, stage_key, seq, event, created_at) "
+                "VALUES (?, ?, (SELECT COUNT(*) FROM job_stages WHERE job_id = ?), ?, ?) "
+                "ON CONFLICT (job_id, stage_key) DO UPDATE SET event = excluded.event",
+                (job_id, event['key'], job_id, json.dumps(event), time.time())
+            )
+
+    def stage_results(self, job_id: str) -> dict:
+        """Results of the stages a job already completed, keyed by stage key."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT stage_key, event FROM job_stages WHERE job_id = ?", (job_id,)
+            ).fetchall()
+        return {row['stage_key']: json.loads(row['event'])['result'] for row in rows}
+
+    def mark_running(self, job_id: str):
+        with self._lock:
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, error = NULL, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (RUNNING, time.time(), job_id)
+            )
+
+    def mark_queued(self, job_id: str):
+        self._set_status(job_id, QUEUED)
+
+    def mark_completed(self, job_id: str, result: str):
+        self._set_status(job_id, COMPLETED, result=result)
+
+    def mark_failed(self, job_id: str, error: str):
+        self._set_status(job_id, FAILED, error=error)
+
+    def _set_status(self, job_id: str, status: str, result: str = None, error: str = None):
+        with self._lock:
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, result, error, time.time(), job_id)
+            )
+
+    def unfinished_jobs(self) -> list:
+        """Ids of jobs that were queued or running, e.g. when the server last stopped."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+        return [row['id'] for row in rows]
+
+    def prune(self, retention_seconds: float = None) -> int:
+        """Delete finished jobs older than the retention period. Returns the number deleted."""
+        retention_seconds = retention_seconds or float(os.getenv('LEGAL_JOB_RETENTION_SECONDS', DEFAULT_RETENTION_SECONDS))
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (COMPLETED, FAILED, time.time() - retention_seconds)
+            )
+        if cursor.rowcount:
+            logger.info(f"Pruned {cursor.rowcount} old jobs")
+        return cursor.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._connection.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in (QUEUED, RUNNING, COMPLETED, FAILED)}
+        counts.update({row['status']: row['count'] for row in rows})
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
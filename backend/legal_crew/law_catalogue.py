@@ -0,0 +1,130 @@
+"""
+Catalogue of law titles, generated from the citeertitel and intitule of every law
+in the article store at ingest time.
+
+The catalogue maps normalized titles, BWB ids, common abbreviations ("Hpw",
+"BW Boek 5") and short titles ("Huurprijzenwet") to BWB ids, so resolving a title the Law Selector returned is a dict
+lookup. Titles that are not in the catalogue fall back to a fuzzy match against
+it, which absorbs small spelling and punctuation differences in LLM output.
+"""
+import difflib
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Abbreviations in common use, by citeertitel
+ABBREVIATIONS = {
+    'Huurprijzenwet woonruimte': ['Hpw'],
+    'Uitvoeringswet huurprijzen woonruimte': ['UHW'],
+    'Besluit huurprijzen woonruimte': ['Bhw'],
+    'Wet op het overleg huurders verhuurder': ['Wohv'],
+    'Wet goed verhuurderschap': ['Wgv'],
+    'Huisvestingswet 2014': ['Hvw 2014'],
+}
+
+# Minimum similarity for a fuzzy title match
+FUZZY_CUTOFF = 0.85
+# A title this long that starts exactly one catalogue title resolves to it
+MIN_PREFIX_LENGTH = 20
+# Shorter titles resolve the same way when they are whole leading words ("Uitvoeringswet")
+MIN_WORD_PREFIX_LENGTH = 8
+MAX_FUZZY_CACHE = 1024
+
+_BURGERLIJK_WETBOEK = re.compile(r'^burgerlijk wetboek boek (\d+)$')
+_TRAILING_YEAR = re.compile(r'^(.*\D) \d{4}$')
+_TRAILING_WOONRUIMTE = re.compile(r'^(.+) woonruimte$')
+_NUMBER = re.compile(r'\d+')
+
+
+def normalize_title(title: str) -> str:
+    """Lower-case a law title and strip punctuation and extra whitespace for lookups."""
+    title = re.sub(r"[\"'`‘’“”\[\]()*.,;:\-–]", ' ', title.lower())
+    return ' '.join(title.split())
+
+
+def title_aliases(citeertitel: str) -> list:
+    """Alternative names a law is commonly referred to by, derived from its citeertitel."""
+    key = normalize_title(citeertitel)
+    aliases = [normalize_title(alias) for alias in ABBREVIATIONS.get(citeertitel, [])]
+    book = _BURGERLIJK_WETBOEK.match(key)
+    if book:
+        number = book.group(1)
+        aliases += [f'bw boek {number}', f'bw {number}', f'bw{number}', f'boek {number} bw',
+                    f'boek {number} burgerlijk wetboek', f'civil code book {number}', f'dutch civil code book {number}']
+    year = _TRAILING_YEAR.match(key)
+    if year:
+        # "Huisvestingswet" for "Huisvestingswet 2014"
+        aliases.append(year.group(1))
+    short = _TRAILING_WOONRUIMTE.match(key)
+    if short:
+        # "Huurprijzenwet" for "Huurprijzenwet woonruimte"
+        aliases.append(short.group(1))
+    return aliases
+
+
+def build_title_catalogue(laws: dict) -> dict:
+    """
+    Build the lookup table for the laws of a manifest.
+    Returns:
+        Dict of normalized title -> BWB id. Citeertitels, intitules and BWB ids always
+        resolve; an alias that two laws share is left out as ambiguous
+    """
+    catalogue = {}
+    for bwb_id, law in sorted(laws.items()):
+        for title in (law['citeertitel'], law['intitule'], bwb_id):
+            if title:
+                catalogue[normalize_title(title)] = bwb_id
+
+    aliases = {}
+    for bwb_id, law in sorted(laws.items()):
+        for alias in title_aliases(law['citeertitel']):
+            aliases.setdefault(alias, set()).add(bwb_id)
+    for alias, bwb_ids in aliases.items():
+        if alias in catalogue:
+            continue
+        if len(bwb_ids) > 1:
+            logger.warning(f"Title alias '{alias}' is ambiguous ({', '.join(sorted(bwb_ids))}), leaving it out")
+            continue
+        catalogue[alias] = next(iter(bwb_ids))
+    return catalogue
+
+
+class TitleCatalogue:
+    """Resolves law titles through the catalogue, with a cached fuzzy fallback."""
+
+    def __init__(self, catalogue: dict):
+        self.catalogue = catalogue
+        self._keys = sorted(catalogue)
+        self._fuzzy = {}  # normalized title -> BWB id or None
+
+    def resolve(self, title: str):
+        """Return the BWB id for a law title, alias or BWB id, or None if unknown."""
+        key = normalize_title(title)
+        bwb_id = self.catalogue.get(key)
+        if bwb_id is not None or not key:
+            return bwb_id
+        if key in self._fuzzy:
+            return self._fuzzy[key]
+
+        bwb_id = self._fuzzy_match(key)
+        if len(self._fuzzy) >= MAX_FUZZY_CACHE:
+            self._fuzzy.clear()
+        self._fuzzy[key] = bwb_id
+        if bwb_id is not None:
+            logger.info(f"Resolved law title '{title}' to {bwb_id} by fuzzy match")
+        return bwb_id
+
+    def _fuzzy_match(self, key: str):
+        # Book numbers and years tell laws apart ("BW Boek 7" is not "BW Boek 5"), so a
+        # candidate may not carry numbers the title does not have
+        numbers = set(_NUMBER.findall(key))
+        candidates = [candidate for candidate in self._keys if set(_NUMBER.findall(candidate)) <= numbers]
+        # A truncated long title, or the leading words of a title
+        if len(key) >= MIN_WORD_PREFIX_LENGTH:
+            prefix = key if len(key) >= MIN_PREFIX_LENGTH else key + ' '
+            prefixed = {self.catalogue[candidate] for candidate in candidates if candidate.startswith(prefix)}
+            if len(prefixed) == 1:
+                return prefixed.pop()
+        matches = difflib.get_close_matches(key, candidates, n=1, cutoff=FUZZY_CUTOFF)
+        return self.catalogue[matches[0]] if matches else None
@@ -0,0 +1,301 @@
+"""
+Incremental ingestion of the BWB XML corpus in backend/laws into the article store.
+
+Each file is fingerprinted (size and modification time first, content hash when
+those changed) against the previous manifest, so a refresh only parses the files
+that were added or changed. Files are streamed with iterparse and freed element by
+element, keeping peak memory flat even for the largest statutes, and changed files
+are parsed in parallel worker processes. Only the shards of changed files and the
+manifest are rewritten, and the running ArticleStore and LawRetriever update just
+the affected laws.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from .article_store import (
+    LAWS_DIR, STORE_DIR, MANIFEST_NAME, STORE_FORMAT_VERSION, BWB_FILE_PATTERN,
+    file_fingerprint, corpus_version, refresh_article_store, ingest_lock,
+)
+from .law_retriever import refresh_law_retriever
+from .law_catalogue import build_title_catalogue
+
+logger = logging.getLogger(__name__)
+
+# Block-level elements that start a new line in the extracted article text
+_BLOCK_TAGS = {'lid', 'li', 'al'}
+_SKIP_TAGS = {'meta-data', 'kop'}
+# Member/list numbers ("1", "a.") stay on the line of the text they introduce
+_NUMBER_LABEL = re.compile(r'^[0-9a-z]{1,4}[.°]?$', re.IGNORECASE)
+# Elements whose full subtree is read, so they are only cleared once complete
+_KEPT_TAGS = {'artikel', 'citeertitel', 'intitule'}
+
+
+def _article_text(element) -> str:
+    lines = []
+    current = []
+
+    def flush():
+        text = ' '.join(''.join(current).split())
+        if _NUMBER_LABEL.match(text):
+            current[:] = [text, ' ']
+            return
+        if text:
+            lines.append(text)
+        current.clear()
+
+    def walk(el):
+        if el.tag in _SKIP_TAGS:
+            return
+        if el.tag in _BLOCK_TAGS:
+            flush()
+        if el.text:
+            current.append(el.text)
+        for child in el:
+            walk(child)
+            if child.tail:
+                current.append(child.tail)
+        if el.tag in _BLOCK_TAGS:
+            flush()
+
+    walk(element)
+    flush()
+    return '\n'.join(lines)
+
+
+def parse_bwb_file(path: Path) -> dict:
+    """
+    Stream one BWB XML file into its metadata and articles. Elements are cleared as
+    soon as they have been processed, so the whole document is never held in memory.
+    Returns:
+        Dict with bwb_id, date, citeertitel, intitule and a list of
+        (number, label, text) article tuples in document order
+    """
+    path = Path(path)
+    match = BWB_FILE_PATTERN.match(path.name)
+    bwb_id = date = citeertitel = intitule = None
+    articles = []
+    open_articles = []  # positions in articles of the artikel elements being read
+    open_kept = 0  # number of _KEPT_TAGS elements currently open
+
+    for event, element in ET.iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            if bwb_id is None:
+                # The root element carries the identification
+                bwb_id = element.get('bwb-id') or match.group(1)
+                date = element.get('inwerkingtreding') or match.group(2)
+            if element.tag == 'artikel':
+                open_articles.append(len(articles))
+                articles.append(None)
+            if element.tag in _KEPT_TAGS:
+                open_kept += 1
+            continue
+
+        if element.tag == 'citeertitel' and citeertitel is None:
+            citeertitel = (element.text or '').strip()
+        elif element.tag == 'intitule' and intitule is None:
+            # Skips the publication meta-data nested in the intitule
+            intitule = ' '.join(_article_text(element).split())
+        elif element.tag == 'artikel':
+            nr = element.find('kop/nr')
+            label = element.get('label') or ''
+            number = nr.text.strip() if nr is not None and nr.text else label.replace('Artikel', '').strip()
+            articles[open_articles.pop()] = (number, label, _article_text(element))
+        if element.tag in _KEPT_TAGS:
+            open_kept -= 1
+        # Text is read from complete subtrees; anything outside them is done with
+        if not open_kept:
+            element.clear()
+
+    return {
+        'bwb_id': bwb_id,
+        'date': date,
+        'citeertitel': citeertitel or '',
+        'intitule': intitule or '',
+        'articles': articles,
+    }
+
+
+def _ingest_file(path: str, shards_dir: str, sha256: str) -> dict:
+    """
+    Parse one BWB file and write its shard. Runs in a worker process.
+    Returns:
+        The file's manifest entry
+    """
+    path = Path(path)
+    parsed = parse_bwb_file(path)
+    shard_name = path.with_suffix('.json').name
+    shard_path = Path(shards_dir) / shard_name
+    # Write next to the shard and swap it in, so readers never see a partial file
+    temporary_path = shard_path.with_suffix('.json.tmp')
+    with open(temporary_path, 'w', encoding='utf-8') as f:
+        json.dump({'bwb_id': parsed['bwb_id'], 'date': parsed['date'], 'articles': parsed['articles']},
+                  f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temporary_path, shard_path)
+
+    stat = path.stat()
+    return {
+        'bwb_id': parsed['bwb_id'],
+        'date': parsed['date'],
+        'citeertitel': parsed['citeertitel'],
+        'intitule': parsed['intitule'],
+        'shard': shard_name,
+        'articles': len(parsed['articles']),
+        'sha256': sha256,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+
+
+def _laws_from_files(files: dict) -> dict:
+    """Group the per-file manifest entries into laws with their consolidations, oldest first."""
+    laws = {}
+    for name, entry in sorted(files.items()):
+        law = laws.setdefault(entry['bwb_id'], {'citeertitel': '', 'intitule': '', 'versions': []})
+        law['versions'].append({'date': entry['date'], 'file': name, 'shard': entry['shard'], 'articles': entry['articles']})
+    for bwb_id, law in laws.items():
+        law['versions'].sort(key=lambda version: version['date'])
+        # Titles come from the most recent consolidation
+        latest = files[law['versions'][-1]['file']]
+        law['citeertitel'] = latest['citeertitel']
+        law['intitule'] = latest['intitule']
+    return laws
+
+
+def read_manifest(store_dir: Path = STORE_DIR):
+    """The current manifest, or None if there is none in the supported format."""
+    try:
+        with open(store_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return manifest if manifest.get('format_version') == STORE_FORMAT_VERSION else None
+
+
+def ingest_laws(laws_dir: Path = LAWS_DIR, store_dir: Path = STORE_DIR, full: bool = False, workers: int = None) -> dict:
+    """
+    Bring the article store in store_dir up to date with the BWB files in laws_dir.
+    Args:
+        laws_dir: Directory with the BWB XML files
+        store_dir: Article store directory
+        full: Re-parse every file instead of only the changed ones
+        workers: Parser processes (default LAW_INGEST_WORKERS or the number of CPUs)
+    Returns:
+        Dict with the manifest, the parsed and removed file names, the number of
+        unchanged files, the BWB ids of the affected laws and the elapsed seconds
+    """
+    # Concurrent runs would write the same temporary manifest and shard files
+    with ingest_lock:
+        return _ingest_laws(laws_dir, store_dir, full, workers)
+
+
+def _ingest_laws(laws_dir: Path, store_dir: Path, full: bool, workers: int) -> dict:
+    start = time.perf_counter()
+    shards_dir = store_dir / 'shards'
+    shards_dir.mkdir(parents=True, exist_ok=True)
+    previous = None if full else read_manifest(store_dir)
+    previous_files = previous['files'] if previous else {}
+
+    files, to_parse, touched = {}, {}, False
+    names = sorted(path.name for path in laws_dir.glob('*.xml') if BWB_FILE_PATTERN.match(path.name))
+    for name in names:
+        path = laws_dir / name
+        stat = path.stat()
+        entry = previous_files.get(name)
+        if entry is not None and (shards_dir / entry['shard']).exists():
+            if (entry['size'], entry['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+                files[name] = entry
+                continue
+            sha256 = file_fingerprint(path)
+            if sha256 == entry['sha256']:
+                # Touched but identical; only remember the new modification time
+                files[name] = {**entry, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+                touched = True
+                continue
+        else:
+            sha256 = file_fingerprint(path)
+        to_parse[name] = sha256
+
+    if to_parse:
+        workers = workers or int(os.getenv('LAW_INGEST_WORKERS', os.cpu_count() or 1))
+        workers = min(workers, len(to_parse))
+        jobs = [(str(laws_dir / name), str(shards_dir), sha256) for name, sha256 in to_parse.items()]
+        if workers > 1:
+            # Spawned, not forked: ingestion also runs inside the API process (/laws/refresh and
+            # a first-request store build), whose threads must not be copied mid-flight
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                entries = list(pool.map(_ingest_file, *zip(*jobs)))
+        else:
+            entries = [_ingest_file(*job) for job in jobs]
+        for name, entry in zip(to_parse, entries):
+            files[name] = entry
+            logger.info(f"Parsed {name}: {entry['articles']} articles")
+
+    removed = [name for name in previous_files if name not in files]
+    for name in removed:
+        (shards_dir / previous_files[name]['shard']).unlink(missing_ok=True)
+        logger.info(f"Removed {name} from the article store")
+
+    affected = {files[name]['bwb_id'] for name in to_parse} | {previous_files[name]['bwb_id'] for name in removed}
+    laws = _laws_from_files(files)
+    # Regenerated every run (it is cheap) so alias changes apply without re-parsing
+    catalogue = build_title_catalogue(laws)
+    if previous is None or to_parse or removed or touched or catalogue != previous.get('catalogue'):
+        fingerprints = {name: entry['sha256'] for name, entry in files.items()}
+        manifest = {
+            'format_version': STORE_FORMAT_VERSION,
+            'corpus_version': corpus_version(fingerprints),
+            'fingerprints': fingerprints,
+            'files': files,
+            'laws': laws,
+            'catalogue': catalogue,
+        }
+        temporary_path = store_dir / f"{MANIFEST_NAME}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(temporary_path, store_dir / MANIFEST_NAME)
+    else:
+        manifest = previous
+
+    seconds = time.perf_counter() - start
+    logger.info(f"Ingested law corpus in {seconds:.2f}s: {len(to_parse)} parsed, {len(removed)} removed, "
+                f"{len(files) - len(to_parse)} unchanged (corpus version {manifest['corpus_version']})")
+    return {
+        'manifest': manifest,
+        'parsed': list(to_parse),
+        'removed': removed,
+        'unchanged': len(files) - len(to_parse),
+        'affected_laws': sorted(affected),
+        'seconds': seconds,
+    }
+
+
+def build_article_store(laws_dir: Path = LAWS_DIR, store_dir: Path = STORE_DIR) -> dict:
+    """
+    Parse every BWB file in laws_dir and write the shards and manifest to store_dir.
+    Returns:
+        The written manifest
+    """
+    return ingest_laws(laws_dir, store_dir, full=True)['manifest']
+
+
+def refresh_law_corpus() -> dict:
+    """
+    Ingest changes to backend/laws and update the running ArticleStore and
+    LawRetriever for the affected laws only.
+    Returns:
+        The ingest_laws report
+    """
+    # Held until the manifest is swapped in, so concurrent refreshes apply in ingestion order
+    with ingest_lock:
+        report = ingest_laws()
+        # Always swap in the manifest: the title catalogue can change without any law changing
+        refresh_article_store(report['manifest'], report['affected_laws'])
+    if report['affected_laws']:
+        refresh_law_retriever(report['affected_laws'])
+    return report
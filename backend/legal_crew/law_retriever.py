@@ -0,0 +1,288 @@
+"""
+Local lexical retrieval over the law corpus.
+
+Articles from the article store are split into chunks and indexed in a BM25
+inverted index, so prompts only carry the handful of articles that matter for the
+question instead of whole statutes.
+"""
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from .article_store import get_article_store
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 8
+DEFAULT_TOKEN_BUDGET = 3000
+# Articles longer than this are split into several chunks
+MAX_CHUNK_CHARS = 2000
+
+_TOKEN_PATTERN = re.compile(r"[0-9a-zà-ÿ]+")
+
+STOPWORDS = {
+    # Dutch
+    'de', 'het', 'een', 'en', 'van', 'in', 'op', 'te', 'voor', 'met', 'aan', 'bij', 'dat', 'die', 'dit',
+    'door', 'of', 'om', 'als', 'tot', 'is', 'zijn', 'wordt', 'worden', 'kan', 'niet', 'ook', 'naar',
+    'deze', 'over', 'onder', 'dan', 'wel', 'uit', 'er', 'hij', 'zij', 'ze', 'wij', 'ik', 'mijn', 'hun',
+    'artikel', 'lid', 'bedoeld',
+    # English
+    'the', 'a', 'an', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'with', 'is', 'are', 'be', 'can',
+    'my', 'me', 'i', 'it', 'this', 'that', 'what', 'how', 'do', 'does', 'if', 'by', 'as', 'at', 'from',
+    'was', 'will', 'about', 'am',
+}
+
+# Questions usually arrive in English while the statutes are Dutch
+QUERY_EXPANSIONS = {
+    'rent': ['huur', 'huurprijs'],
+    'rental': ['huur', 'verhuur'],
+    'increase': ['verhoging', 'huurverhoging'],
+    'raise': ['verhoging', 'huurverhoging'],
+    'hike': ['verhoging', 'huurverhoging'],
+    'tenant': ['huurder'],
+    'tenants': ['huurders'],
+    'landlord': ['verhuurder'],
+    'landlords': ['verhuurders'],
+    'lease': ['huurovereenkomst', 'huur'],
+    'contract': ['overeenkomst', 'huurovereenkomst'],
+    'deposit': ['waarborgsom'],
+    'repair': ['herstelling', 'onderhoud', 'gebrek'],
+    'repairs': ['herstellingen', 'onderhoud', 'gebreken'],
+    'maintenance': ['onderhoud'],
+    'defect': ['gebrek'],
+    'defects': ['gebreken'],
+    'service': ['servicekosten'],
+    'costs': ['kosten'],
+    'terminate': ['opzegging', 'beëindiging'],
+    'termination': ['opzegging', 'beëindiging'],
+    'evict': ['ontruiming', 'opzegging'],
+    'eviction': ['ontruiming', 'opzegging'],
+    'notice': ['opzegtermijn', 'kennisgeving'],
+    'tribunal': ['huurcommissie'],
+    'committee': ['huurcommissie'],
+    'points': ['punten', 'woningwaarderingsstelsel'],
+    'inflation': ['inflatiepercentage'],
+    'vacant': ['leegstand'],
+    'permit': ['vergunning'],
+    'discrimination': ['discriminatie'],
+    'housing': ['woonruimte', 'huisvesting'],
+    'apartment': ['woonruimte', 'woning'],
+    'house': ['woning', 'woonruimte'],
+    'home': ['woning', 'woonruimte'],
+    'temporary': ['tijdelijke'],
+    'mould': ['gebrek'],
+    'mold': ['gebrek'],
+}
+
+
+def tokenize(text: str) -> list:
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if len(token) > 1 and token not in STOPWORDS]
+
+
+def expand_query(tokens: list) -> list:
+    expanded = list(tokens)
+    for token in tokens:
+        expanded.extend(QUERY_EXPANSIONS.get(token, []))
+    return expanded
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt token estimate (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class BM25Index:
+    """
+    Minimal in-memory BM25 inverted index. Documents can be added and removed at any
+    time; collection statistics are kept up to date incrementally.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(dict)  # term -> {doc_id: term frequency}
+        self.doc_lengths = {}
+        self.doc_terms = {}
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def add(self, doc_id, tokens: list):
+        if doc_id in self.doc_lengths:
+            self.remove(doc_id)
+        counts = Counter(tokens)
+        for term, count in counts.items():
+            self.postings[term][doc_id] = count
+        self.doc_lengths[doc_id] = len(tokens)
+        self.doc_terms[doc_id] = list(counts)
+        self.total_length += len(tokens)
+
+    def remove(self, doc_id):
+        for term in self.doc_terms.pop(doc_id, []):
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc_id, 0)
+
+    def search(self, query_tokens: list, top_k: int = 10, accept=None) -> list:
+        """
+        Score documents against the query.
+        Args:
+            query_tokens: Tokenized query
+            top_k: Maximum number of results
+            accept: Optional predicate on doc_id to restrict the search
+        Returns:
+            List of (doc_id, score) sorted by descending score
+        """
+        if not self.doc_lengths:
+            return []
+        n_docs = len(self.doc_lengths)
+        avg_length = self.total_length / n_docs
+        scores = defaultdict(float)
+        for term in set(query_tokens):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, tf in docs.items():
+                if accept is not None and not accept(doc_id):
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+
+def chunk_article(text: str, max_chars: int = MAX_CHUNK_CHARS) -> list:
+    """Split an article on line boundaries into chunks of at most max_chars."""
+    if len(text) <= max_chars:
+        return [text]
+    chunks, current, size = [], [], 0
+    for line in text.split('\n'):
+        if current and size + len(line) > max_chars:
+            chunks.append('\n'.join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
+
+
+class LawRetriever:
+    """
+    BM25 retrieval over article chunks of every law in the article store.
+    Document ids are (bwb_id, article number, chunk index).
+    """
+
+    def __init__(self, article_store=None):
+        logger.info("Initializing LawRetriever")
+        self.article_store = article_store or get_article_store()
+        self.index = BM25Index()
+        self.chunks = {}
+        self._law_docs = {}  # bwb_id -> doc ids of its chunks
+        self._lock = threading.Lock()
+        for bwb_id in self.article_store.laws:
+            self.index_law(bwb_id)
+        logger.info(f"Indexed {len(self.chunks)} article chunks")
+
+    def index_law(self, bwb_id: str):
+        """(Re)index the latest consolidation of a law."""
+        articles = self.article_store.get_articles(bwb_id)
+        with self._lock:
+            self.remove_law(bwb_id)
+            doc_ids = []
+            for number, article in articles.items():
+                for chunk_index, chunk in enumerate(chunk_article(article['text'])):
+                    doc_id = (bwb_id, number, chunk_index)
+                    self.chunks[doc_id] = chunk
+                    self.index.add(doc_id, tokenize(f"{article['label']} {chunk}"))
+                    doc_ids.append(doc_id)
+            self._law_docs[bwb_id] = doc_ids
+
+    def remove_law(self, bwb_id: str):
+        """Drop a law's chunks from the index. Callers hold the lock."""
+        for doc_id in self._law_docs.pop(bwb_id, []):
+            self.index.remove(doc_id)
+            del self.chunks[doc_id]
+
+    def refresh_laws(self, bwb_ids):
+        """
+        Reindex only the given laws after an incremental ingest; laws no longer in
+        the article store are removed from the index.
+        """
+        for bwb_id in bwb_ids:
+            if bwb_id in self.article_store.laws:
+                self.index_law(bwb_id)
+            else:
+                with self._lock:
+                    self.remove_law(bwb_id)
+        logger.info(f"Reindexed {len(bwb_ids)} laws, {len(self.chunks)} article chunks indexed")
+
+    def retrieve(self, question: str, bwb_ids=None, top_k: int = None, token_budget: int = None) -> list:
+        """
+        Find the article chunks most relevant to a question.
+        Args:
+            question: The user's question
+            bwb_ids: Optional collection of BWB ids to search within
+            top_k: Maximum number of chunks (default LAW_RETRIEVAL_TOP_K)
+            token_budget: Maximum estimated tokens across all returned chunks
+                (default LAW_RETRIEVAL_TOKEN_BUDGET)
+        Returns:
+            List of dicts with bwb_id, title, article, chunk, text and score, best first.
+            The text is from the latest consolidation of each law
+        """
+        top_k = top_k or int(os.getenv('LAW_RETRIEVAL_TOP_K', DEFAULT_TOP_K))
+        token_budget = token_budget or int(os.getenv('LAW_RETRIEVAL_TOKEN_BUDGET', DEFAULT_TOKEN_BUDGET))
+        allowed = set(bwb_ids) if bwb_ids is not None else None
+
+        with self._lock:
+            hits = self.index.search(
+                expand_query(tokenize(question)),
+                top_k=top_k,
+                accept=(lambda doc_id: doc_id[0] in allowed) if allowed is not None else None
+            )
+            hits = [(doc_id, score, self.chunks[doc_id]) for doc_id, score in hits]
+
+        results, used_tokens = [], 0
+        for doc_id, score, text in hits:
+            bwb_id, number, chunk_index = doc_id
+            cost = estimate_tokens(text)
+            if used_tokens + cost > token_budget:
+                continue
+            used_tokens += cost
+            results.append({
+                'bwb_id': bwb_id,
+                'title': self.article_store.laws[bwb_id]['citeertitel'],
+                'article': number,
+                'chunk': chunk_index,
+                'text': text,
+                'score': round(score, 3),
+            })
+        logger.info(f"Retrieved {len(results)} article chunks (~{used_tokens} tokens) for question")
+        return results
+
+
+_retriever = None
+_retriever_lock = threading.Lock()
+
+
+def get_law_retriever() -> LawRetriever:
+    """Process-wide LawRetriever, built on first use."""
+    global _retriever
+    with _retriever_lock:
+        if _retriever is None:
+            _retriever = LawRetriever()
+        return _retriever
+
+
+def refresh_law_retriever(bwb_ids):
+    """Reindex the given laws in the process-wide LawRetriever, if one was built."""
+    with _retriever_lock:
+        retriever = _retriever
+    if retriever is not None:
+        retriever.refresh_laws(bwb_ids)
@@ -2,13 +2,28 @@ from crewai import Agent, Task, Crew, Process, LLM
 from crewai.tools import tool
 from google import genai
 import os
+import queue
+import threading
+import time
+from concurrent.futures import wait
+from datetime import date
 from dotenv import load_dotenv
 from pathlib import Path
 from .laws_database import LAWS_DATABASE
-from .voting_tracker import VotingTracker, Vote
+from .article_store import get_article_store
+from .law_catalogue import normalize_title
+from .law_retriever import get_law_retriever, chunk_article
+from .overview_index import get_overview_index
+from .voting_tracker import VotingTracker, Vote, parse_vote
 from .cpi_tool import CPITool
 from .cao_tool import CAOTool
 from .percentage_calculator import PercentageCalculator
+from .stage_runner import run_stages_concurrently, get_speculation_stats
+from .pipeline_metrics import get_pipeline_metrics
+from .rent_fast_path import RentIncreaseFastPath, is_rent_increase_question
+from .reference_date import find_reference_date
+from .contract_clauses import segment_clauses, clause_cache_text, merge_clause_findings, get_clause_cache, \
+    get_clause_flight, NO_ISSUES
 import logging
 
 # Configure logging
@@ -29,17 +44,43 @@ gemini_llm = LLM(
     temperature=0.7
 )
 
-# Load overview.txt
-overview_path = Path(__file__).parent.parent / 'laws' / 'overview.txt'
-with open(overview_path, 'r', encoding='utf-8') as f:
-    OVERVIEW_TEXT = f.read()
+# The judges deliberate for at most three rounds
+MAX_VOTING_ROUNDS = 3
+ROUND_NAMES = {1: "first", 2: "second", 3: "third"}
+
+# Judges in later rounds get this much of each initial argument as a digest of the case
+CASE_DIGEST_CHARS = 600
+
+DEFAULT_CLAUSE_WORKERS = 3
+# Law context per contract clause
+CLAUSE_LAW_TOP_K = 3
+CLAUSE_LAW_TOKEN_BUDGET = 800
+
+# Fallback laws by normalized title and by key ("contract_law" as "contract law")
+LAWS_DATABASE_BY_TITLE = {}
+for _key, _law_data in LAWS_DATABASE.items():
+    LAWS_DATABASE_BY_TITLE[normalize_title(_key.replace("_", " "))] = _law_data
+    LAWS_DATABASE_BY_TITLE[normalize_title(_law_data.get("title", ""))] = _law_data
 
 class LegalCrew:
-    def __init__(self):
+    def __init__(self, concurrent_stages=None, speculative_law_selection=None, llm=None):
         logger.info("Initializing LegalCrew")
+        # The LLM every agent talks to; a stand-in can be injected for offline benchmarks
+        self.llm = llm or gemini_llm
+        # Run independent stages (e.g. the two lawyers) in parallel unless disabled
+        if concurrent_stages is None:
+            concurrent_stages = os.getenv('LEGAL_CREW_CONCURRENT_STAGES', 'true').lower() in ('1', 'true', 'yes')
+        self.concurrent_stages = concurrent_stages
+        # Start law selection alongside the easy answer instead of after it (needs concurrent stages)
+        if speculative_law_selection is None:
+            speculative_law_selection = os.getenv('LEGAL_CREW_SPECULATIVE_LAW_SELECTION', 'true').lower() in ('1', 'true', 'yes')
+        self.speculative_law_selection = speculative_law_selection and concurrent_stages
+        # Stages abandoned by an early exit that may still be using our agents
+        self._abandoned_stages = []
         self.cpi_tool = CPITool()
         self.cao_tool = CAOTool()
         self.percentage_calculator = PercentageCalculator()
+        self.rent_fast_path = RentIncreaseFastPath(self.cpi_tool, self.percentage_calculator)
         
         # Create percentage calculator tools using the @tool decorator
         @tool("Calculate Percentage Change")
@@ -57,18 +98,11 @@ class LegalCrew:
             """Calculate the new amount based on a percentage change."""
             return self.percentage_calculator.calculate_new_amount(original_amount, percentage_change)
 
-        # Initialize the contract analyzer
-        self.contract_analyzer = Agent(
-            role='Contract Analyzer',
-            goal='Analyze rental contracts and identify potentially illegal clauses',
-            backstory="""You are an expert in rental contract analysis with deep knowledge of 
-            housing laws and regulations. You excel at identifying clauses that may violate 
-            tenant rights or exceed legal limits. You can spot both obvious and subtle 
-            violations of rental laws.""",
-            verbose=True,
-            allow_delegation=False,
-            llm=gemini_llm
-        )
+        # Initialize the contract analyzers; clauses of a contract are analysed by up to
+        # LEGAL_CREW_CLAUSE_WORKERS of them at once, each agent handling one clause at a time
+        clause_workers = max(1, int(os.getenv('LEGAL_CREW_CLAUSE_WORKERS', DEFAULT_CLAUSE_WORKERS)))
+        self.contract_analyzers = [self._create_contract_analyzer() for _ in range(clause_workers)]
+        self.contract_analyzer = self.contract_analyzers[0]
 
         # Initialize the easy answer agent
         self.easy_answer_agent = Agent(
@@ -79,7 +113,7 @@ class LegalCrew:
             can be answered directly from the overview without needing deeper legal analysis.""",
             verbose=True,
             allow_delegation=False,
-            llm=gemini_llm
+            llm=self.llm
         )
 
         # Initialize the law selector agent
@@ -92,7 +126,7 @@ class LegalCrew:
             which ones are most likely to contain relevant information.""",
             verbose=True,
             allow_delegation=False,
-            llm=gemini_llm
+            llm=self.llm
         )
 
         # Initialize the rent increase analyst
@@ -107,7 +141,7 @@ class LegalCrew:
             and validate them against legal limits.""",
             verbose=True,
             allow_delegation=False,
-            llm=gemini_llm,
+            llm=self.llm,
             tools=[calculate_percentage_change, is_increase_legal, calculate_new_amount]
         )
 
@@ -120,7 +154,7 @@ class LegalCrew:
             and can present compelling arguments in favor of tenant protections.""",
             verbose=True,
             allow_delegation=False,
-            llm=gemini_llm
+            llm=self.llm
         )
 
         # Initialize the landlord's lawyer
@@ -132,7 +166,7 @@ class LegalCrew:
             landlord protections while maintaining professional objectivity.""",
             verbose=True,
             allow_delegation=False,
-            llm=gemini_llm
+            llm=self.llm
         )
 
         # Initialize the judges
@@ -144,7 +178,7 @@ class LegalCrew:
             to fair and impartial judgment based on the law.""",
             verbose=True,
             allow_delegation=False,
-            llm=gemini_llm
+            llm=self.llm
         )
 
         self.right_judge = Agent(
@@ -155,7 +189,7 @@ class LegalCrew:
             are committed to fair and impartial judgment based on the law.""",
             verbose=True,
             allow_delegation=False,
-            llm=gemini_llm
+            llm=self.llm
         )
 
         self.centrist_judge = Agent(
@@ -166,55 +200,68 @@ class LegalCrew:
             that carefully consider both tenant and landlord rights.""",
             verbose=True,
             allow_delegation=False,
-            llm=gemini_llm
+            llm=self.llm
+        )
+
+    def _create_contract_analyzer(self):
+        return Agent(
+            role='Contract Analyzer',
+            goal='Analyze rental contracts and identify potentially illegal clauses',
+            backstory="""You are an expert in rental contract analysis with deep knowledge of 
+            housing laws and regulations. You excel at identifying clauses that may violate 
+            tenant rights or exceed legal limits. You can spot both obvious and subtle 
+            violations of rental laws.""",
+            verbose=True,
+            allow_delegation=False,
+            llm=self.llm
+        )
+
+    def create_clause_analysis_task(self, agent, clause_text, law_articles):
+        """Task analysing one contract clause against the law articles relevant to it."""
+        return Task(
+            description=f"""Analyze this clause of a rental contract and determine whether it is potentially illegal.
+            Consider in particular:
+            1. Rent increase clauses and their compliance with current laws
+            2. Service cost provisions
+            3. Maintenance and repair obligations
+            4. Termination conditions
+            5. Any other provisions that might violate tenant rights
+
+            CLAUSE: {clause_text}
+            RELEVANT_LAW_ARTICLES: {law_articles}
+
+            If the clause is not problematic, answer only '{NO_ISSUES}'. Otherwise:
+            1. Quote the problematic part of the clause
+            2. Explain why it might be illegal
+            3. Cite the relevant law
+            4. Suggest how it should be modified to be legal
+
+            If you need more context about the rental situation, include "MORE_CONTEXT_NEEDED" in your response.""",
+            expected_output=f"'{NO_ISSUES}', or an analysis of why the clause may be illegal with a suggested modification.",
+            agent=agent
         )
 
-    def create_tasks(self, question, selected_law_texts=None, tenant_argument=None, landlord_argument=None, contract_text=None):
+    def create_tasks(self, question, selected_law_texts=None, tenant_argument=None, landlord_argument=None):
         logger.info("Creating tasks for question: %s", question)
         
         tasks = []
 
-        # If we have a contract, analyze it first
-        if contract_text:
-            contract_analysis_task = Task(
-                description=f"""Analyze the rental contract and identify any potentially illegal clauses.
-                Focus on:
-                1. Rent increase clauses and their compliance with current laws
-                2. Service cost provisions
-                3. Maintenance and repair obligations
-                4. Termination conditions
-                5. Any other clauses that might violate tenant rights
-                
-                CONTRACT_TEXT: {contract_text}
-                SELECTED_LAW_DETAILS: {selected_law_texts}
-                
-                For each potentially illegal clause:
-                1. Quote the exact clause
-                2. Explain why it might be illegal
-                3. Cite the relevant law
-                4. Suggest how it should be modified to be legal
-                
-                If you need more context about the rental situation, include "MORE_CONTEXT_NEEDED" in your response.""",
-                expected_output="A detailed analysis of the rental contract, identifying any illegal clauses with explanations and suggested modifications.",
-                agent=self.contract_analyzer
-            )
-            logger.debug("Created contract_analysis_task: %s", contract_analysis_task)
-            tasks.append(contract_analysis_task)
-
-        # Task 1: Easy Answer
+        # Task 1: Easy Answer (only the overview sections relevant to the question are sent)
+        overview_sections = get_overview_index().relevant_text(question)
         easy_answer_task = Task(
             description=f"""Check if the following question can be answered directly from the
-            overview document. If you find a clear answer, return it. If not, return 'NEEDS_EXPERT'.
+            overview document excerpts. If you find a clear answer, return it. If not, return 'NEEDS_EXPERT'.
             For rent increase questions, always return 'NEEDS_EXPERT' as we need to analyze the specific increase.
             Question: {question}
-            Overview Document: {OVERVIEW_TEXT}""",
+            Overview Document (relevant sections): {overview_sections}""",
             expected_output="Either a direct answer from the overview document or 'NEEDS_EXPERT' if deeper analysis is required.",
             agent=self.easy_answer_agent
         )
         logger.debug("Created easy_answer_task: %s", easy_answer_task)
         tasks.append(easy_answer_task)
 
-        # Task 2: Select relevant laws
+        # Task 2: Select relevant laws (the list comes from the article store's title catalogue)
+        available_laws = "\n            ".join(f"- {title}" for title in get_article_store().law_titles())
         law_selection_task = Task(
             description=f"""Analyze the question and select the most relevant laws from the
             AVAILABLE LAWS list. Return a list of the most relevant law titles, ordered by relevance.
@@ -222,22 +269,7 @@ class LegalCrew:
             For rent increase questions, make sure to include 'Huurprijzenwet woonruimte' and 'Burgerlijk Wetboek Boek 5'.
             Question: {question}
             AVAILABLE LAWS:
-            - Bouwbesluit 2012
-            - Leegstandwet
-            - Besluit bouwwerken leefomgeving
-            - Wet goed verhuurderschap
-            - Besluit kleine herstellingen
-            - Regeling Bouwbesluit 2012
-            - Besluit mandaat en machtiging Toelatingsorganisatie Kwaliteitsborging Bouw
-            - Uitvoeringsregeling huurprijzen woonruimte
-            - Woningwet
-            - Besluit servicekosten
-            - Huurprijzenwet woonruimte
-            - Uitvoeringswet huurprijzen woonruimte
-            - Besluit huurprijzen woonruimte
-            - Wet op het overleg huurders verhuurder
-            - Burgerlijk Wetboek Boek 5
-            - Huisvestingswet 2014""",
+            {available_laws}""",
             expected_output="A list of relevant law titles, ordered by relevance to the question.",
             agent=self.law_selector
         )
@@ -246,13 +278,22 @@ class LegalCrew:
 
         # Only create these tasks if we have the required data
         if selected_law_texts is not None:
-            # Task 3: Rent Increase Analysis
+            # Task 3: Rent Increase Analysis, with the indicators in force on the date of the increase
+            reference_date = find_reference_date(question) or date.today()
+            if self.cpi_tool.has_cpi_for(reference_date) and self.cao_tool.has_cao_index_for(reference_date):
+                indicators_in_force = (f"Economic indicators in force on {reference_date.isoformat()} "
+                                       "(the date of the increase, or today if none is given):")
+            else:
+                # Stand-in values must not be presented as the figures for the date
+                indicators_in_force = (f"The most recent configured economic indicators; the figures for "
+                                       f"{reference_date.isoformat()} are not available, so present any limit "
+                                       "derived from them as an indication and do not attribute them to that date:")
             rent_analysis_task = Task(
                 description=f"""Analyze the rent increase situation based on the provided information.
                 You have access to:
-                1. Economic indicators:
-                   - CPI: {self.cpi_tool.get_current_cpi()}%
-                   - CAO wage index: {self.cao_tool.get_current_cao_index()}%
+                1. {indicators_in_force}
+                   - CPI: {self.cpi_tool.get_cpi_on(reference_date)}%
+                   - CAO wage index: {self.cao_tool.get_cao_index_on(reference_date)}%
                 2. Percentage calculator tools:
                    - calculate_percentage_change(original_amount: float, new_amount: float) -> float
                    - is_increase_legal(percentage_change: float, legal_limit: float) -> bool
@@ -313,69 +354,537 @@ class LegalCrew:
             # Only create the judge task if we have all arguments
             if tenant_argument is not None and landlord_argument is not None:
                 # Task 6: Judges evaluate
-                judge_task = Task(
-                    description=f"""Evaluate the arguments presented by both the Tenant's Lawyer and the Landlord's Lawyer
-                    based on the user's QUESTION and the SELECTED_LAW_DETAILS that were used by the lawyers.
-                    Vote on whether the tenant or landlord has the stronger legal case.
-                    Consider the laws cited and the strength of their arguments.
-                    Do NOT attempt to delegate legal research; make your judgment based on the provided arguments.
-                    If you determine that the rental contract is necessary to make a proper judgment, include the text "CONTRACT_NEEDED" in your response.
-
-                    QUESTION: {question}
-                    SELECTED_LAW_DETAILS: {selected_law_texts}
-                    TENANT_ARGUMENT: {tenant_argument}
-                    LANDLORD_ARGUMENT: {landlord_argument}
-
-                    Vote using ONLY one of these exact string options:
-                    - obviously_tenant
-                    - most_likely_tenant
-                    - not_sure
-                    - most_likely_landlord
-                    - obviously_landlord""",
-                    expected_output="A clear vote on the case with justification based on the presented arguments and laws.",
-                    agent=self.left_judge
-                )
+                judge_task = self.create_judge_task(self.left_judge, question, selected_law_texts, tenant_argument, landlord_argument)
                 logger.debug("Created judge_task: %s", judge_task)
                 tasks.append(judge_task)
 
         return tasks
 
-    def _get_law_texts_from_titles(self, law_titles: list):
+    def create_judge_task(self, judge_agent, question, selected_law_texts, tenant_argument, landlord_argument):
+        """
+        Create the first-round voting task for one judge. Every judge needs its own
+        task so the panel can deliberate concurrently.
+        """
+        return Task(
+            description=f"""Evaluate the arguments presented by both the Tenant's Lawyer and the Landlord's Lawyer
+            based on the user's QUESTION and the SELECTED_LAW_DETAILS that were used by the lawyers.
+            Vote on whether the tenant or landlord has the stronger legal case.
+            Consider the laws cited and the strength of their arguments.
+            Do NOT attempt to delegate legal research; make your judgment based on the provided arguments.
+            If you determine that the rental contract is necessary to make a proper judgment, include the text "CONTRACT_NEEDED" in your response.
+
+            QUESTION: {question}
+            SELECTED_LAW_DETAILS: {selected_law_texts}
+            TENANT_ARGUMENT: {tenant_argument}
+            LANDLORD_ARGUMENT: {landlord_argument}
+
+            Vote using ONLY one of these exact string options:
+            - obviously_tenant
+            - most_likely_tenant
+            - not_sure
+            - most_likely_landlord
+            - obviously_landlord""",
+            expected_output="A clear vote on the case with justification based on the presented arguments and laws.",
+            agent=judge_agent
+        )
+
+    def create_rebuttal_task(self, lawyer_agent, side, question, previous_round_summary, opposing_argument):
+        """
+        Create a rebuttal task for a later voting round. Only the opponent's latest
+        argument and last round's votes are sent, not the law details again.
+        """
+        opponent = "landlord" if side == "tenant" else "tenant"
+        return Task(
+            description=f"""The judges could not reach a clear decision in the previous round.
+            Write a short rebuttal from the {side}'s perspective that answers the {opponent}'s latest argument
+            and addresses any doubts visible in the judges' votes. Do not repeat your earlier argument in full.
+            Do NOT attempt to delegate this task.
+            If you determine that the rental contract is necessary, include the text "CONTRACT_NEEDED" in your response.
+
+            QUESTION: {question}
+            PREVIOUS_ROUND_SUMMARY: {previous_round_summary}
+            {opponent.upper()}_ARGUMENT: {opposing_argument}""",
+            expected_output=f"A concise rebuttal from the {side}'s perspective.",
+            agent=lawyer_agent
+        )
+
+    @staticmethod
+    def _digest(text, max_chars=CASE_DIGEST_CHARS) -> str:
+        """The start of a text up to max_chars, cut at a sentence end where possible."""
+        text = " ".join(str(text).split())
+        if len(text) <= max_chars:
+            return text
+        cut = text[:max_chars]
+        sentence_end = cut.rfind(". ")
+        if sentence_end > max_chars // 2:
+            cut = cut[:sentence_end + 1]
+        return cut.rstrip() + " …"
+
+    def create_case_summary(self, tenant_argument, landlord_argument) -> str:
+        """Compact digest of the initial arguments for the judges of later rounds."""
+        return (f"Tenant's initial argument (digest): {self._digest(tenant_argument)}\n"
+                f"Landlord's initial argument (digest): {self._digest(landlord_argument)}")
+
+    def create_rebuttal_judge_task(self, judge_agent, question, case_summary, previous_round_summary,
+                                   tenant_rebuttal, landlord_rebuttal):
+        """
+        Create the voting task for rounds two and three. Every task runs in a fresh
+        crew, so the judge has no memory of round one: it gets the question, a digest
+        of the initial arguments and last round's votes with the new rebuttals, but
+        not the full law details and arguments again.
+        """
+        return Task(
+            description=f"""You are re-voting on a case where the panel could not reach a clear decision.
+            The CASE_SUMMARY digests the initial arguments of both lawyers and the PREVIOUS_ROUND_SUMMARY
+            shows how each judge voted. Both lawyers have now submitted rebuttals.
+            Reconsider the case in light of the rebuttals.
+            Do NOT attempt to delegate legal research; make your judgment based on the provided arguments and rebuttals.
+            If you determine that the rental contract is necessary to make a proper judgment, include the text "CONTRACT_NEEDED" in your response.
+
+            QUESTION: {question}
+            CASE_SUMMARY: {case_summary}
+            PREVIOUS_ROUND_SUMMARY: {previous_round_summary}
+            TENANT_REBUTTAL: {tenant_rebuttal}
+            LANDLORD_REBUTTAL: {landlord_rebuttal}
+
+            Vote using ONLY one of these exact string options:
+            - obviously_tenant
+            - most_likely_tenant
+            - not_sure
+            - most_likely_landlord
+            - obviously_landlord""",
+            expected_output="A clear vote on the case with justification based on the rebuttals.",
+            agent=judge_agent
+        )
+
+    def _run_judge_panel(self, judges, judge_tasks, voting_tracker, round_number, on_stage=None, completed_stages=None) -> bool:
+        """
+        Let all judges vote on their task at once, recording votes as they arrive and
+        stopping as soon as the round's outcome is settled. Each vote is reported to
+        on_stage as it arrives; votes already in completed_stages are not asked again.
+        Returns:
+            True if a judge indicated the rental contract is needed
+        """
+        # A judge abandoned in the previous round may still be deliberating, and an agent must not run two tasks at once
+        self._wait_for_abandoned_stages()
+        contract_needed = []
+
+        def record_judge_vote(judge_role, vote_result):
+            logger.info("Judge %s vote: %s", judge_role, vote_result)
+            vote_result_str = str(vote_result)
+            # Check if judge indicates we need the contract
+            if "CONTRACT_NEEDED" in vote_result_str.upper():
+                contract_needed.append(judge_role)
+                return True
+            vote = self._parse_vote(judge_role, vote_result_str)
+            voting_tracker.record_vote(judge_role, vote)
+            self._emit_stage(on_stage, "vote", vote_result_str, judge=judge_role, vote=vote.value, round=round_number)
+            remaining_voters = len(judges) - len(voting_tracker.get_current_round_votes())
+            if remaining_voters and voting_tracker.is_round_decided(remaining_voters):
+                logger.info("Round outcome settled with %d judge(s) still deliberating", remaining_voters)
+                return True
+            return False
+
+        self._run_stages(
+            {
+                judge.role: (lambda judge=judge: self._kickoff(judge, judge_tasks[judge.role], "vote", round=round_number))
+                for judge in judges
+            },
+            stop_when=record_judge_vote,
+            reused=self._reusable_stages(completed_stages, "vote", "judge", [judge.role for judge in judges], round=round_number)
+        )
+        return bool(contract_needed)
+
+    def _lawyers_stop_when(self, on_stage, stage, round_number):
+        """
+        stop_when for a pair of concurrent lawyer stages: report each argument as it
+        arrives and stop early if either lawyer asks for the contract, which makes the
+        other argument moot.
+        """
+        def stop_when(side, argument):
+            self._emit_stage(on_stage, stage, argument, side=side, round=round_number)
+            return "CONTRACT_NEEDED" in str(argument).upper()
+        return stop_when
+
+    @staticmethod
+    def _stage_key(stage, round=None, side=None, judge=None, **details) -> str:
+        """Identifies a stage within one pipeline run, e.g. 'vote:2:Centrist Judge'."""
+        return ":".join([stage] + [str(part) for part in (round, side, judge) if part is not None])
+
+    def _emit_stage(self, on_stage, stage, result, **details):
+        """Report a finished stage to the caller's on_stage callback, if any."""
+        if on_stage is None:
+            return
+        try:
+            on_stage({"stage": stage, "key": self._stage_key(stage, **details), "result": str(result), **details})
+        except Exception:
+            # A broken progress consumer must not fail the pipeline
+            logger.warning("on_stage callback failed for stage %s", stage, exc_info=True)
+
+    @staticmethod
+    def _token_usage(agent) -> tuple:
+        """Tokens the agent has used so far as counted by crewai: (prompt, completion, cached prompt, requests)."""
+        usage = agent._token_process.get_summary()
+        return usage.prompt_tokens, usage.completion_tokens, usage.cached_prompt_tokens, usage.successful_requests
+
+    def _kickoff(self, agent, task, stage, **details):
+        """Run one agent on one task as an instrumented pipeline stage."""
+        with get_pipeline_metrics().stage(stage, agent=agent.role, **details) as record:
+            # crewai counts tokens per agent over its lifetime; an agent runs one task at a time
+            usage_before = self._token_usage(agent)
+            crew = Crew(agents=[agent], tasks=[task], verbose=True, process=Process.sequential)
+            result = crew.kickoff()
+            record.record_usage(*(after - before for after, before in zip(self._token_usage(agent), usage_before)))
+            return result
+
+    def _run_single_stage(self, completed_stages, stage, fn, **details):
+        """Run one stage, or reuse its result from an earlier, interrupted run."""
+        key = self._stage_key(stage, **details)
+        reused = bool(completed_stages) and key in completed_stages
+        if completed_stages:
+            get_pipeline_metrics().record_cache("completed_stage", reused)
+        if reused:
+            logger.info("Reusing result of completed stage %s", key)
+            return completed_stages[key]
+        return fn()
+
+    def _reusable_stages(self, completed_stages, stage, name_field, names, **details) -> dict:
+        """Results in completed_stages for the named stages of a concurrent group."""
+        if not completed_stages:
+            return {}
+        keys = {name: self._stage_key(stage, **details, **{name_field: name}) for name in names}
+        reused = {name: completed_stages[key] for name, key in keys.items() if key in completed_stages}
+        get_pipeline_metrics().record_cache("completed_stage", True, len(reused))
+        get_pipeline_metrics().record_cache("completed_stage", False, len(keys) - len(reused))
+        return reused
+
+    def _run_stages(self, stages: dict, stop_when=None, reused=None) -> dict:
+        """
+        Run independent stages, concurrently when enabled, otherwise one after the
+        other in the given order. stop_when(name, result) ends the run early.
+        Stages with a result in reused are not run; their results are passed
+        through stop_when first.
+        """
+        results = {}
+        for name, result in (reused or {}).items():
+            results[name] = result
+            if stop_when is not None and stop_when(name, result):
+                return results
+        stages = {name: stage for name, stage in stages.items() if name not in results}
+
+        if self.concurrent_stages:
+            try:
+                fresh, abandoned = run_stages_concurrently(stages, stop_when=stop_when)
+            except Exception as e:
+                # Siblings of a failed stage may still be using our agents
+                self._abandoned_stages.extend(getattr(e, 'abandoned_stages', []))
+                raise
+            self._abandoned_stages.extend(abandoned)
+            results.update(fresh)
+            return results
+
+        for name, stage in stages.items():
+            results[name] = stage()
+            if stop_when is not None and stop_when(name, results[name]):
+                break
+        return results
+
+    def _parse_vote(self, judge_role: str, vote_result_str: str) -> Vote:
+        vote = parse_vote(vote_result_str)
+        if vote is not None:
+            return vote
+        logger.warning("Judge %s returned an invalid vote: '%s'. Recording as 'not_sure'.", judge_role, vote_result_str)
+        return Vote.NOT_SURE
+
+    def _wait_for_abandoned_stages(self):
+        """Wait until the stages abandoned so far in this run have finished, so their agents can be reused."""
+        pending = [future for future in self._abandoned_stages if not future.done()]
+        if pending:
+            logger.info("Waiting for %d abandoned stage(s) before reusing their agents", len(pending))
+            wait(pending)
+        self._abandoned_stages = []
+
+    def take_abandoned_stages(self) -> list:
+        """
+        Return (and forget) stages abandoned by early exits or failed siblings that are still running.
+        The crew must not be reused until they have finished.
+        """
+        abandoned = [future for future in self._abandoned_stages if not future.done()]
+        self._abandoned_stages = []
+        return abandoned
+
+    def _get_law_texts_from_titles(self, law_titles: list, question: str = None, on_date=None):
+        """
+        Resolve law titles to their texts, as in force on on_date (default: the latest
+        consolidation). When a question is given, statutes from the article store are
+        narrowed down to the articles most relevant to it, so the prompt size stays
+        bounded however large the selected laws are.
+        """
         logger.info("Getting law texts for titles: %s", law_titles)
         law_details = {}
         if not isinstance(law_titles, list):
             logger.warning("law_titles is not a list: %s", law_titles)
             return law_details
 
+        article_store = get_article_store()
+        titles_by_bwb_id = {}
         for title in law_titles:
-            found = False
-            for key, law_data in LAWS_DATABASE.items():
-                if law_data.get("title", "").lower() == title.lower() or key.lower() == title.lower().replace(" ", "_"):
-                    law_details[title] = law_data
-                    found = True
-                    break
-            if not found:
-                logger.warning("Law title '%s' not found in LAWS_DATABASE", title)
+            # Real statutes from the BWB article store first
+            law = article_store.get_law(title, on_date=on_date)
+            if law is not None:
+                # The selector may name one law twice ("Huurprijzenwet woonruimte", "Hpw"); keep it once,
+                # otherwise only one of the titles would be narrowed down to the relevant articles
+                if law["bwb_id"] in titles_by_bwb_id:
+                    logger.info("Law title '%s' is the same law as '%s', skipping it", title, titles_by_bwb_id[law["bwb_id"]])
+                    continue
+                titles_by_bwb_id[law["bwb_id"]] = title
+                law_details[title] = law
+                continue
+
+            law_data = LAWS_DATABASE_BY_TITLE.get(normalize_title(title))
+            if law_data is not None:
+                law_details[title] = law_data
+            else:
+                logger.warning("Law title '%s' not found in article store or LAWS_DATABASE", title)
                 law_details[title] = "Content not found in database."
+
+        if question is not None:
+            law_details = self._retrieve_relevant_articles(question, law_details, on_date)
         logger.debug("Retrieved law details: %s", law_details)
         return law_details
 
-    def process_question(self, question, contract_text=None):
+    def _retrieve_relevant_articles(self, question: str, law_details: dict, on_date=None) -> dict:
+        titles_by_bwb_id = {
+            law["bwb_id"]: title
+            for title, law in law_details.items()
+            if isinstance(law, dict) and "bwb_id" in law
+        }
+        if not titles_by_bwb_id:
+            return law_details
+
+        relevant = {
+            title: {"title": law_details[title]["title"], "bwb_id": bwb_id, "version": law_details[title]["version"], "articles": {}}
+            for bwb_id, title in titles_by_bwb_id.items()
+        }
+        article_store = get_article_store()
+        for hit in get_law_retriever().retrieve(question, bwb_ids=titles_by_bwb_id):
+            law = relevant[titles_by_bwb_id[hit["bwb_id"]]]
+            text = hit["text"]
+            if on_date is not None and law["version"] != article_store.version_on(hit["bwb_id"])["date"]:
+                # The index holds the latest consolidation; take the same article as it read on the reference date
+                article = law_details[titles_by_bwb_id[hit["bwb_id"]]]["articles"].get(hit["article"])
+                chunks = chunk_article(article["text"]) if article is not None else []
+                if hit["chunk"] >= len(chunks):
+                    continue
+                text = chunks[hit["chunk"]]
+            key = f"Artikel {hit['article']}"
+            law["articles"][key] = f"{law['articles'][key]}\n{text}" if key in law["articles"] else text
+
+        for title, law in relevant.items():
+            if not law["articles"]:
+                law["articles"] = "No articles relevant to the question found."
+            law_details[title] = law
+        return law_details
+
+    @staticmethod
+    def _is_direct_answer(easy_answer_result) -> bool:
+        easy_answer_str = str(easy_answer_result)
+        return bool(easy_answer_str) and easy_answer_str.strip().upper() != 'NEEDS_EXPERT' \
+            and not easy_answer_str.startswith("NEEDS_EXPERT")
+
+    def _run_easy_answer_and_law_selection(self, tasks, on_stage, completed_stages):
+        """
+        Run the easy-answer and law-selection stages at the same time. Law selection
+        only depends on the question, so on the expert path this saves one LLM
+        round-trip of latency; when the easy answer turns out to be direct, the law
+        selection is discarded (and abandoned if still running). Saved and wasted
+        time are recorded in the process-wide SpeculationStats.
+        Returns:
+            (easy answer result, law selection result or None if it was discarded)
+        """
+        logger.info("Starting easy answer check with speculative law selection")
+        reused = {
+            stage: completed_stages[stage]
+            for stage in ("easy_answer", "law_selection")
+            if completed_stages and stage in completed_stages
+        }
+        if completed_stages:
+            get_pipeline_metrics().record_cache("completed_stage", True, len(reused))
+            get_pipeline_metrics().record_cache("completed_stage", False, 2 - len(reused))
+        seconds = {}
+        outcome = {"direct": None}
+        outcome_lock = threading.Lock()
+        speculation_stats = get_speculation_stats()
+
+        def timed(stage, agent, task):
+            def run():
+                start = time.perf_counter()
+                try:
+                    return self._kickoff(agent, task, stage)
+                except Exception as e:
+                    if stage != "law_selection":
+                        raise
+                    # Raised below only if the expert path needs the law selection
+                    return e
+                finally:
+                    with outcome_lock:
+                        seconds[stage] = time.perf_counter() - start
+                        direct = outcome["direct"]
+                    # Law selection finishing after the answer was found to be direct
+                    if stage == "law_selection" and direct:
+                        speculation_stats.record_discarded(seconds[stage])
+            return run
+
+        def stop_when(stage, result):
+            if stage != "easy_answer":
+                return False
+            logger.info("Easy answer result: %s", result)
+            self._emit_stage(on_stage, "easy_answer", result)
+            return self._is_direct_answer(result)
+
+        start = time.perf_counter()
+        results = self._run_stages(
+            {
+                "easy_answer": timed("easy_answer", self.easy_answer_agent, tasks[0]),
+                "law_selection": timed("law_selection", self.law_selector, tasks[1]),
+            },
+            stop_when=stop_when,
+            reused=reused
+        )
+        elapsed = time.perf_counter() - start
+
+        direct = self._is_direct_answer(results["easy_answer"])
+        with outcome_lock:
+            outcome["direct"] = direct
+            law_selection_seconds = seconds.get("law_selection")
+        if direct:
+            if law_selection_seconds is not None:
+                speculation_stats.record_discarded(law_selection_seconds)
+            logger.info("Discarding speculative law selection")
+            return results["easy_answer"], None
+        if not reused:
+            # Sequentially the two stages would have taken the sum of their durations
+            saved = seconds["easy_answer"] + seconds["law_selection"] - elapsed
+            speculation_stats.record_used(saved)
+            logger.info("Speculative law selection saved %.2fs", saved)
+        if isinstance(results["law_selection"], Exception):
+            raise results["law_selection"]
+        return results["easy_answer"], results["law_selection"]
+
+    def _analyze_contract(self, contract_text: str) -> str:
+        """
+        Analyse a contract clause by clause. Clauses are analysed concurrently by the
+        pool of contract analyzers, each against the law articles relevant to it;
+        findings are memoized across requests by normalized clause text (a clause
+        another request is analysing is waited for), and merged into one report in
+        contract order.
+        """
+        clauses = segment_clauses(contract_text)
+        with get_pipeline_metrics().stage("contract_analysis", clauses=len(clauses)):
+            return self._analyze_clauses(clauses)
+
+    def _analyze_clauses(self, clauses: list) -> str:
+        clause_cache = get_clause_cache()
+        clause_flight = get_clause_flight()
+        keys = [clause_cache.make_key(clause_cache_text(clause["text"])) for clause in clauses]
+
+        findings = {}
+        # Futures this run publishes its findings on, and those of clauses other requests are analysing
+        claimed, joined = {}, {}
+        work = queue.Queue()
+        for key, clause in zip(keys, clauses):
+            if key in findings:
+                continue
+            cached = clause_cache.get(key)
+            if cached is not None:
+                findings[key] = cached
+                continue
+            # Placeholder so a clause repeated within the contract is analysed once
+            findings[key] = None
+            future, owner = clause_flight.claim(key)
+            if not owner:
+                joined[key] = future
+                continue
+            # The analysis that just finished may have cached the finding after our lookup
+            cached = clause_cache.get(key)
+            if cached is not None:
+                findings[key] = cached
+                future.set_result(cached)
+                continue
+            claimed[key] = future
+            work.put((key, clause))
+        pending = work.qsize()
+        get_pipeline_metrics().record_cache("clause", True, len(clauses) - pending)
+        get_pipeline_metrics().record_cache("clause", False, pending)
+        logger.info("Contract has %d clauses: %d to analyse, %d analysed by other requests, %d from cache or repeated",
+                    len(clauses), pending, len(joined), len(clauses) - pending - len(joined))
+
+        def analyzer(agent):
+            def run():
+                while True:
+                    try:
+                        key, clause = work.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        law_articles = "\n\n".join(
+                            f"{hit['title']}, Artikel {hit['article']}: {hit['text']}"
+                            for hit in get_law_retriever().retrieve(
+                                clause["text"], top_k=CLAUSE_LAW_TOP_K, token_budget=CLAUSE_LAW_TOKEN_BUDGET)
+                        ) or "No specific articles found."
+                        finding = str(self._kickoff(
+                            agent, self.create_clause_analysis_task(agent, clause["text"], law_articles), "clause_analysis"))
+                    except BaseException as e:
+                        claimed[key].set_exception(e)
+                        raise
+                    findings[key] = finding
+                    # Context requests depend on the customer's situation, not only on the clause
+                    if "MORE_CONTEXT_NEEDED" not in finding.upper():
+                        clause_cache.set(key, finding)
+                    claimed[key].set_result(finding)
+            return run
+
+        try:
+            if pending:
+                analyzers = self.contract_analyzers[:pending]
+                self._run_stages({f"clause_analyzer_{index}": analyzer(agent) for index, agent in enumerate(analyzers)})
+        finally:
+            # Clauses left unanalysed by a failed stage must not keep other requests waiting
+            while True:
+                try:
+                    key, _ = work.get_nowait()
+                except queue.Empty:
+                    break
+                claimed[key].set_exception(RuntimeError("Clause analysis was abandoned"))
+        for key, future in joined.items():
+            findings[key] = future.result()
+        return merge_clause_findings(clauses, [findings[key] for key in keys])
+
+    def process_question(self, question, contract_text=None, on_stage=None, completed_stages=None):
+        """
+        Run the pipeline for a question.
+        Args:
+            question: The user's question
+            contract_text: Optional rental contract to analyze
+            on_stage: Optional callback receiving a dict (stage, result and details such
+                as side, judge or round) as soon as each stage finishes. It is called
+                from pipeline and stage worker threads.
+            completed_stages: Optional results of an earlier, interrupted run keyed by
+                stage key (the "key" of on_stage events); those stages are not run again
+        Returns:
+            The answer
+        """
         logger.info("Processing question: %s", question)
-        tasks = self.create_tasks(question, contract_text=contract_text)
+        tasks = self.create_tasks(question)
         voting_tracker = VotingTracker()
 
         # If we have a contract, analyze it first
         if contract_text:
             logger.info("Starting contract analysis")
-            contract_analysis_crew = Crew(
-                agents=[self.contract_analyzer],
-                tasks=[tasks[0]],  # Contract analysis is the first task
-                verbose=True,
-                process=Process.sequential
-            )
-            contract_analysis_result = contract_analysis_crew.kickoff()
+            contract_analysis_result = self._run_single_stage(
+                completed_stages, "contract_analysis", lambda: self._analyze_contract(contract_text))
             logger.info("Contract analysis result: %s", contract_analysis_result)
+            self._emit_stage(on_stage, "contract_analysis", contract_analysis_result)
             
             # Check if we need more context
             contract_analysis_str = str(contract_analysis_result)
@@ -385,30 +894,34 @@ class LegalCrew:
             # If we have a clear analysis, return it
             return contract_analysis_result
 
-        logger.info("Starting easy answer check")
-        easy_answer_crew = Crew(
-            agents=[self.easy_answer_agent],
-            tasks=[tasks[0]],  # Easy answer is now the first task if no contract
-            verbose=True,
-            process=Process.sequential
-        )
-        easy_answer_result = easy_answer_crew.kickoff()
-        logger.info("Easy answer result: %s", easy_answer_result)
+        # Rent increases with clear amounts are plain arithmetic; answer them without any LLM call
+        fast_answer = self.rent_fast_path.answer(question)
+        if is_rent_increase_question(question):
+            get_pipeline_metrics().record_cache("rent_fast_path", fast_answer is not None)
+        if fast_answer is not None:
+            logger.info("Answered rent increase question on the fast path")
+            return fast_answer
+
+        if self.speculative_law_selection:
+            easy_answer_result, selected_laws_titles = self._run_easy_answer_and_law_selection(
+                tasks, on_stage, completed_stages)
+        else:
+            logger.info("Starting easy answer check")
+            easy_answer_result = self._run_single_stage(
+                completed_stages, "easy_answer", lambda: self._kickoff(self.easy_answer_agent, tasks[0], "easy_answer"))
+            logger.info("Easy answer result: %s", easy_answer_result)
+            self._emit_stage(on_stage, "easy_answer", easy_answer_result)
+            selected_laws_titles = None
 
         # Only return early if we got a real answer (not NEEDS_EXPERT)
-        easy_answer_str = str(easy_answer_result)
-        if easy_answer_str and easy_answer_str.strip().upper() != 'NEEDS_EXPERT' and not easy_answer_str.startswith("NEEDS_EXPERT"):
+        if self._is_direct_answer(easy_answer_result):
             logger.info("Found direct answer in overview")
-            return easy_answer_str
+            return str(easy_answer_result)
 
-        logger.info("No direct answer found, proceeding with law selection")
-        law_selection_crew = Crew(
-            agents=[self.law_selector],
-            tasks=[tasks[1]],  # Law selection is now the second task
-            verbose=True,
-            process=Process.sequential
-        )
-        selected_laws_titles = law_selection_crew.kickoff()
+        if selected_laws_titles is None:
+            logger.info("No direct answer found, proceeding with law selection")
+            selected_laws_titles = self._run_single_stage(
+                completed_stages, "law_selection", lambda: self._kickoff(self.law_selector, tasks[1], "law_selection"))
         logger.info("Selected laws titles: %s", selected_laws_titles)
 
         # Parse the law titles from the string output
@@ -441,7 +954,12 @@ class LegalCrew:
             logger.warning("No law titles could be parsed from the Law Selector output")
             return "Error: Could not retrieve law titles for analysis."
 
-        selected_law_texts = self._get_law_texts_from_titles(selected_laws_titles)
+        self._emit_stage(on_stage, "law_selection", ", ".join(selected_laws_titles))
+
+        # Laws are taken as in force on the date the question refers to, if it names one
+        with get_pipeline_metrics().stage("law_lookup", laws=len(selected_laws_titles)):
+            selected_law_texts = self._get_law_texts_from_titles(
+                selected_laws_titles, question=question, on_date=find_reference_date(question))
         if not selected_law_texts:
             logger.warning("No law texts could be retrieved for the selected titles")
             return "Error: Could not retrieve law texts for analysis."
@@ -450,16 +968,12 @@ class LegalCrew:
         tasks = self.create_tasks(question, selected_law_texts=selected_law_texts)
 
         # If this is a rent increase question, run the rent analysis first
-        if "rent increase" in question.lower() or "rent hike" in question.lower():
+        if is_rent_increase_question(question):
             logger.info("Starting rent increase analysis")
-            rent_analysis_crew = Crew(
-                agents=[self.rent_analyst],
-                tasks=[tasks[2]],  # Rent analysis task is now the third task
-                verbose=True,
-                process=Process.sequential
-            )
-            rent_analysis_result = rent_analysis_crew.kickoff()
+            rent_analysis_result = self._run_single_stage(
+                completed_stages, "rent_analysis", lambda: self._kickoff(self.rent_analyst, tasks[2], "rent_analysis"))
             logger.info("Rent analysis result: %s", rent_analysis_result)
+            self._emit_stage(on_stage, "rent_analysis", rent_analysis_result)
             
             # Convert CrewOutput to string for checking
             rent_analysis_str = str(rent_analysis_result)
@@ -473,87 +987,85 @@ class LegalCrew:
             if "legal" in rent_analysis_str.lower() or "illegal" in rent_analysis_str.lower():
                 return rent_analysis_str
 
-        logger.info("Starting tenant lawyer analysis")
-        tenant_crew = Crew(agents=[self.tenant_lawyer], tasks=[tasks[3]], verbose=True, process=Process.sequential)
-        tenant_argument = tenant_crew.kickoff()
-        logger.info("Tenant argument received")
-        voting_tracker.add_argument(f"Tenant's Initial Argument: {tenant_argument}")
-
-        # Convert CrewOutput to string for checking
-        tenant_argument_str = str(tenant_argument)
+        # The landlord's task does not depend on the tenant's argument, so both lawyers can work at once
+        logger.info("Starting tenant and landlord lawyer analysis")
+        arguments = self._run_stages(
+            {
+                "tenant": lambda: self._kickoff(self.tenant_lawyer, tasks[3], "argument", side="tenant", round=1),
+                "landlord": lambda: self._kickoff(self.landlord_lawyer, tasks[4], "argument", side="landlord", round=1),
+            },
+            stop_when=self._lawyers_stop_when(on_stage, "argument", 1),
+            reused=self._reusable_stages(completed_stages, "argument", "side", ["tenant", "landlord"], round=1)
+        )
 
-        # Check if tenant lawyer indicates we need the contract
-        if "CONTRACT_NEEDED" in tenant_argument_str.upper():
-            logger.info("Tenant lawyer indicates contract is needed")
-            return f"To properly evaluate your case, we need to see your rental contract. This will help us understand the specific terms and conditions that apply to your situation. CONTRACT_NEEDED"
+        # Check if either lawyer indicates we need the contract
+        for side, argument in arguments.items():
+            if "CONTRACT_NEEDED" in str(argument).upper():
+                logger.info("%s lawyer indicates contract is needed", side.capitalize())
+                return f"To properly evaluate your case, we need to see your rental contract. This will help us understand the specific terms and conditions that apply to your situation. CONTRACT_NEEDED"
 
-        logger.info("Starting landlord lawyer analysis")
-        landlord_crew = Crew(agents=[self.landlord_lawyer], tasks=[tasks[4]], verbose=True, process=Process.sequential)
-        landlord_argument = landlord_crew.kickoff()
-        logger.info("Landlord argument received")
+        tenant_argument = arguments["tenant"]
+        landlord_argument = arguments["landlord"]
+        logger.info("Tenant and landlord arguments received")
+        voting_tracker.add_argument(f"Tenant's Initial Argument: {tenant_argument}")
         voting_tracker.add_argument(f"Landlord's Initial Argument: {landlord_argument}")
 
-        # Convert CrewOutput to string for checking
-        landlord_argument_str = str(landlord_argument)
-
-        # Check if landlord lawyer indicates we need the contract
-        if "CONTRACT_NEEDED" in landlord_argument_str.upper():
-            logger.info("Landlord lawyer indicates contract is needed")
-            return f"To properly evaluate your case, we need to see your rental contract. This will help us understand the specific terms and conditions that apply to your situation. CONTRACT_NEEDED"
+        judges = [self.left_judge, self.right_judge, self.centrist_judge]
+        case_summary = self.create_case_summary(tenant_argument, landlord_argument)
+        round_summaries = []
+        latest_arguments = {"tenant": tenant_argument, "landlord": landlord_argument}
 
-        # Create final task with all arguments
-        final_task = Task(
-            description=f"""Evaluate the arguments presented by both the Tenant's Lawyer and the Landlord's Lawyer
-            based on the user's QUESTION and the SELECTED_LAW_DETAILS that were used by the lawyers.
-            Vote on whether the tenant or landlord has the stronger legal case.
-            Consider the laws cited and the strength of their arguments.
-            Do NOT attempt to delegate legal research; make your judgment based on the provided arguments.
-            If you determine that the rental contract is necessary to make a proper judgment, include the text "CONTRACT_NEEDED" in your response.
-
-            QUESTION: {question}
-            SELECTED_LAW_DETAILS: {selected_law_texts}
-            TENANT_ARGUMENT: {tenant_argument}
-            LANDLORD_ARGUMENT: {landlord_argument}
+        for round_number in range(1, MAX_VOTING_ROUNDS + 1):
+            if round_number == 1:
+                logger.info("Starting judge voting")
+                judge_tasks = {
+                    judge.role: self.create_judge_task(judge, question, selected_law_texts, tenant_argument, landlord_argument)
+                    for judge in judges
+                }
+            else:
+                # Later rounds only carry the delta: last round's votes and fresh rebuttals
+                logger.info("Starting rebuttals for voting round %d", round_number)
+                voting_tracker.start_new_round()
+                previous_round_summary = round_summaries[-1]
+                rebuttals = self._run_stages(
+                    {
+                        "tenant": lambda: self._kickoff(self.tenant_lawyer, self.create_rebuttal_task(
+                            self.tenant_lawyer, "tenant", question, previous_round_summary, latest_arguments["landlord"]),
+                            "rebuttal", side="tenant", round=round_number),
+                        "landlord": lambda: self._kickoff(self.landlord_lawyer, self.create_rebuttal_task(
+                            self.landlord_lawyer, "landlord", question, previous_round_summary, latest_arguments["tenant"]),
+                            "rebuttal", side="landlord", round=round_number),
+                    },
+                    stop_when=self._lawyers_stop_when(on_stage, "rebuttal", round_number),
+                    reused=self._reusable_stages(completed_stages, "rebuttal", "side", ["tenant", "landlord"], round=round_number)
+                )
+                for side, rebuttal in rebuttals.items():
+                    if "CONTRACT_NEEDED" in str(rebuttal).upper():
+                        logger.info("%s lawyer indicates contract is needed", side.capitalize())
+                        return f"To properly evaluate your case, we need to see your rental contract. This will help us understand the specific terms and conditions that apply to your situation. CONTRACT_NEEDED"
+                latest_arguments = rebuttals
+                voting_tracker.add_argument(f"Tenant's Round {round_number} Rebuttal: {rebuttals['tenant']}")
+                voting_tracker.add_argument(f"Landlord's Round {round_number} Rebuttal: {rebuttals['landlord']}")
 
-            Vote using ONLY one of these exact string options:
-            - obviously_tenant
-            - most_likely_tenant
-            - not_sure
-            - most_likely_landlord
-            - obviously_landlord""",
-            expected_output="A clear vote on the case with justification based on the presented arguments and laws.",
-            agent=self.left_judge
-        )
+                logger.info("Starting judge voting round %d", round_number)
+                judge_tasks = {
+                    judge.role: self.create_rebuttal_judge_task(
+                        judge, question, case_summary, previous_round_summary, rebuttals["tenant"], rebuttals["landlord"])
+                    for judge in judges
+                }
 
-        logger.info("Starting judge voting")
-        # First round voting
-        for judge_agent in [self.left_judge, self.right_judge, self.centrist_judge]:
-            judge_crew = Crew(
-                agents=[judge_agent],
-                tasks=[final_task],
-                verbose=True,
-                process=Process.sequential
-            )
-            vote_result = judge_crew.kickoff()
-            logger.info("Judge %s vote: %s", judge_agent.role, vote_result)
-            
-            # Check if judge indicates we need the contract
-            vote_result_str = str(vote_result)
-            if "CONTRACT_NEEDED" in vote_result_str.upper():
+            if self._run_judge_panel(judges, judge_tasks, voting_tracker, round_number,
+                                     on_stage=on_stage, completed_stages=completed_stages):
                 logger.info("Judge indicates contract is needed")
                 return f"To properly evaluate your case, we need to see your rental contract. This will help us understand the specific terms and conditions that apply to your situation. CONTRACT_NEEDED"
-            
-            try:
-                vote_enum_member = Vote(vote_result_str.strip().lower())
-                voting_tracker.record_vote(judge_agent.role, vote_enum_member)
-            except ValueError:
-                logger.warning("Judge %s returned an invalid vote: '%s'. Recording as 'not_sure'.", judge_agent.role, vote_result)
-                voting_tracker.record_vote(judge_agent.role, Vote.NOT_SURE)
-
-        decision = voting_tracker.check_decision_criteria()
-        if decision:
-            logger.info("Decision reached in favor of %s", decision)
-            return f"Decision reached in favor of {decision} after first round.\n{voting_tracker.get_vote_summary()}\nArguments:\n{voting_tracker.get_all_arguments_formatted()}"
-        else:
-            logger.info("No clear decision reached")
-            return f"Could not reach a clear decision after first round.\n{voting_tracker.get_vote_summary()}\nArguments:\n{voting_tracker.get_all_arguments_formatted()}" 
\ No newline at end of file
+
+            round_summaries.append(voting_tracker.get_vote_summary())
+            self._emit_stage(on_stage, "round_summary", round_summaries[-1], round=round_number)
+            decision = voting_tracker.check_decision_criteria()
+            if decision:
+                logger.info("Decision reached in favor of %s in round %d", decision, round_number)
+                return f"Decision reached in favor of {decision} after {ROUND_NAMES[round_number]} round.\n{''.join(round_summaries)}\nArguments:\n{voting_tracker.get_all_arguments_formatted()}"
+            logger.info("No clear decision reached in round %d", round_number)
+
+        logger.info("No clear decision reached")
+        return f"Could not reach a clear decision after {ROUND_NAMES[MAX_VOTING_ROUNDS]} round.\n{''.join(round_summaries)}\nArguments:\n{voting_tracker.get_all_arguments_formatted()}"
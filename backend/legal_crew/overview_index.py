@@ -0,0 +1,102 @@
+"""
+Sectioned, searchable view of laws/overview.txt for the easy-answer stage.
+
+The overview is split into sections once at load time and indexed with BM25, so
+each question only sends the few sections that relate to it instead of the whole
+81 KB document.
+"""
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from .law_retriever import BM25Index, tokenize, expand_query, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+OVERVIEW_PATH = Path(__file__).parent.parent / 'laws' / 'overview.txt'
+
+DEFAULT_TOP_K = 4
+DEFAULT_TOKEN_BUDGET = 1500
+# Target section size; consecutive short paragraphs are merged up to this size
+SECTION_CHARS = 1200
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+(?=[A-Z"(])')
+
+
+def split_sections(text: str, section_chars: int = SECTION_CHARS) -> list:
+    """Split the overview into sections of roughly section_chars, on paragraph then sentence boundaries."""
+    pieces = []
+    for paragraph in text.split('\n'):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= section_chars:
+            pieces.append(paragraph)
+            continue
+        # Very long paragraphs (several headings run together) are split on sentences
+        current = ''
+        for sentence in _SENTENCE_END.split(paragraph):
+            if current and len(current) + len(sentence) > section_chars:
+                pieces.append(current)
+                current = ''
+            current = f"{current} {sentence}".strip()
+        if current:
+            pieces.append(current)
+
+    sections, current = [], ''
+    for piece in pieces:
+        if current and len(current) + len(piece) > section_chars:
+            sections.append(current)
+            current = ''
+        current = f"{current}\n{piece}".strip()
+    if current:
+        sections.append(current)
+    return sections
+
+
+class OverviewIndex:
+    def __init__(self, path: Path = OVERVIEW_PATH):
+        logger.info("Initializing OverviewIndex")
+        with open(path, 'r', encoding='utf-8') as f:
+            self.full_text = f.read()
+        self.sections = split_sections(self.full_text)
+        self.index = BM25Index()
+        for position, section in enumerate(self.sections):
+            self.index.add(position, tokenize(section))
+        logger.info(f"Split overview into {len(self.sections)} sections")
+
+    def relevant_text(self, question: str, top_k: int = None, token_budget: int = None) -> str:
+        """
+        Return the overview sections most relevant to the question, in document order.
+        Args:
+            question: The user's question
+            top_k: Maximum number of sections (default OVERVIEW_TOP_K)
+            token_budget: Maximum estimated tokens (default OVERVIEW_TOKEN_BUDGET)
+        """
+        top_k = top_k or int(os.getenv('OVERVIEW_TOP_K', DEFAULT_TOP_K))
+        token_budget = token_budget or int(os.getenv('OVERVIEW_TOKEN_BUDGET', DEFAULT_TOKEN_BUDGET))
+
+        selected, used_tokens = [], 0
+        for position, _ in self.index.search(expand_query(tokenize(question)), top_k=top_k):
+            cost = estimate_tokens(self.sections[position])
+            if used_tokens + cost > token_budget:
+                continue
+            used_tokens += cost
+            selected.append(position)
+
+        logger.info(f"Selected {len(selected)} overview sections (~{used_tokens} tokens)")
+        return '\n\n'.join(self.sections[position] for position in sorted(selected))
+
+
+_overview_index = None
+_overview_index_lock = threading.Lock()
+
+
+def get_overview_index() -> OverviewIndex:
+    """Process-wide OverviewIndex, built on first use."""
+    global _overview_index
+    with _overview_index_lock:
+        if _overview_index is None:
+            _overview_index = OverviewIndex()
+        return _overview_index
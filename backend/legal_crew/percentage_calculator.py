@@ -1,4 +1,5 @@
 import logging
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -49,4 +50,41 @@ class PercentageCalculator:
             
         new_amount = original_amount * (1 + (percentage_change / 100))
         logger.info(f"Calculated new amount: {new_amount} (from {original_amount} with {percentage_change}% change)")
-        return new_amount 
\ No newline at end of file
+        return new_amount
+
+    def calculate_percentage_changes(self, original_amounts, new_amounts) -> np.ndarray:
+        """
+        Calculate the percentage changes for whole arrays of amounts at once.
+        Args:
+            original_amounts: Array-like of original amounts
+            new_amounts: Array-like of new amounts
+        Returns:
+            Array of percentage changes; NaN where the original amount is missing or not greater than 0
+        """
+        original = np.asarray(original_amounts, dtype=float)
+        new = np.asarray(new_amounts, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentage_changes = np.where(original > 0, (new - original) / original * 100, np.nan)
+        logger.info(f"Calculated {percentage_changes.size} percentage changes")
+        return percentage_changes
+
+    def are_increases_legal(self, percentage_changes, legal_limit) -> np.ndarray:
+        """
+        Check whole arrays of percentage increases against legal limits.
+        Args:
+            percentage_changes: Array-like of percentage changes
+            legal_limit: The maximum allowed percentage increase (scalar or per row)
+        Returns:
+            Boolean array; False where the percentage change is NaN
+        """
+        return np.asarray(percentage_changes, dtype=float) <= np.asarray(legal_limit, dtype=float)
+
+    def calculate_new_amounts(self, original_amounts, percentage_changes) -> np.ndarray:
+        """
+        Apply percentage changes to whole arrays of amounts at once.
+        Returns:
+            Array of new amounts; NaN where the original amount is missing or not greater than 0
+        """
+        original = np.asarray(original_amounts, dtype=float)
+        percentage = np.asarray(percentage_changes, dtype=float)
+        return np.where(original > 0, original * (1 + percentage / 100), np.nan)
@@ -0,0 +1,137 @@
+import asyncio
+import contextvars
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_MAX_QUEUE = 16
+DEFAULT_QUEUE_TIMEOUT = 30.0
+
+
+class PipelineSaturatedError(Exception):
+    """
+    Raised when the pipeline cannot accept more work.
+    status_code is 429 when the wait queue is full and 503 when a queued
+    request timed out waiting for a free worker.
+    """
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class PipelineExecutor:
+    """
+    Runs the synchronous LegalCrew pipeline on a dedicated thread pool so the
+    event loop stays free for other requests.
+
+    At most max_in_flight pipelines run at once. Up to max_queue further requests
+    may wait for a slot; anything beyond that is rejected straight away (429), and
+    a request that waits longer than queue_timeout is shed (503).
+    """
+
+    def __init__(self, max_in_flight: int = None, max_queue: int = None, queue_timeout: float = None):
+        self.max_in_flight = max_in_flight or int(os.getenv('LEGAL_PIPELINE_MAX_IN_FLIGHT', DEFAULT_MAX_IN_FLIGHT))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv('LEGAL_PIPELINE_MAX_QUEUE', DEFAULT_MAX_QUEUE))
+        self.queue_timeout = queue_timeout or float(os.getenv('LEGAL_PIPELINE_QUEUE_TIMEOUT', DEFAULT_QUEUE_TIMEOUT))
+        if self.max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="legal-pipeline")
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+
+        # Counters are only touched from the event loop thread
+        self._in_flight = 0
+        self._queued = 0
+        self._peak_queued = 0
+        self._queued_total = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected_queue_full = 0
+        self._rejected_timeout = 0
+        self._total_queue_wait = 0.0
+        self._total_run_time = 0.0
+        logger.info(f"Initializing PipelineExecutor (max_in_flight={self.max_in_flight}, "
+                    f"max_queue={self.max_queue}, queue_timeout={self.queue_timeout}s)")
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) on the worker pool and return its result.
+        Raises:
+            PipelineSaturatedError: If the request was shed because of load
+        """
+        if not self._slots.locked():
+            # A worker is free, no queueing needed
+            await self._slots.acquire()
+        else:
+            await self._wait_for_slot()
+
+        self._in_flight += 1
+        run_start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            # Run in the request's context so pipeline spans nest under the request span
+            context = contextvars.copy_context()
+            result = await loop.run_in_executor(self._executor, partial(context.run, fn, *args, **kwargs))
+            self._completed += 1
+            return result
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._total_run_time += time.perf_counter() - run_start
+            self._slots.release()
+
+    async def _wait_for_slot(self):
+        if self._queued >= self.max_queue:
+            self._rejected_queue_full += 1
+            logger.warning(f"Pipeline saturated: {self._in_flight} in flight, {self._queued} queued")
+            raise PipelineSaturatedError(
+                "The legal advice service is busy, please try again shortly.",
+                status_code=429,
+                retry_after=max(1, int(self.queue_timeout / 2)),
+            )
+
+        self._queued_total += 1
+        self._queued += 1
+        self._peak_queued = max(self._peak_queued, self._queued)
+        wait_start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected_timeout += 1
+            logger.warning(f"Request waited {self.queue_timeout}s for a pipeline worker, shedding it")
+            raise PipelineSaturatedError(
+                "The legal advice service is overloaded, please try again later.",
+                status_code=503,
+                retry_after=int(self.queue_timeout),
+            )
+        finally:
+            self._queued -= 1
+            self._total_queue_wait += time.perf_counter() - wait_start
+
+    def stats(self) -> dict:
+        started = self._completed + self._failed
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "queue_depth": self._queued,
+            "peak_queue_depth": self._peak_queued,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected_queue_full": self._rejected_queue_full,
+            "rejected_timeout": self._rejected_timeout,
+            "avg_queue_wait_seconds": round(self._total_queue_wait / self._queued_total, 3) if self._queued_total else 0.0,
+            "avg_run_seconds": round(self._total_run_time / started, 3) if started else 0.0,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,268 @@
+"""
+Per-stage latency, token and cache instrumentation of the legal pipeline.
+
+Every stage (easy answer, law selection, law lookup, rent analysis, contract
+analysis, each lawyer argument and rebuttal, each judge vote) runs inside
+PipelineMetrics.stage(), which opens an OpenTelemetry span and, when the stage
+ends, records its duration and token usage in in-process histograms. Cache
+lookups are counted by outcome and added to the span they happen in. /metrics
+renders the histograms and counters in the Prometheus text format.
+
+Spans are no-ops until configure_tracing() installs an exporting tracer provider.
+"""
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from opentelemetry import trace
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SERVICE_NAME = 'legal-crew-backend'
+# Seconds; LLM stages take from under a second to well over a minute
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0, 160.0)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+tracer = trace.get_tracer(__name__)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra: str = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter per label set, in the Prometheus data model."""
+
+    def __init__(self, name: str, description: str, labelnames: tuple = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}')
+        return lines
+
+
+class Histogram:
+    """Histogram with fixed bucket bounds per label set, in the Prometheus data model."""
+
+    def __init__(self, name: str, description: str, labelnames: tuple, buckets: tuple):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # Label values -> [per-bucket counts (the last one is +Inf), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                    cumulative += bucket_count
+                    le = f'le="{bound}"' if bound == '+Inf' else f'le="{_format_value(float(bound))}"'
+                    lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+                lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}')
+                lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {count}')
+        return lines
+
+
+class StageRecord:
+    """What a running stage reports about itself; recorded when the stage ends."""
+
+    def __init__(self, span):
+        self.span = span
+        self.outcome = 'ok'
+        self.prompt_tokens = None
+        self.completion_tokens = None
+        self.cached_prompt_tokens = None
+        self.llm_requests = None
+
+    def record_usage(self, prompt_tokens: int, completion_tokens: int, cached_prompt_tokens: int = 0,
+                     llm_requests: int = 0):
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.cached_prompt_tokens = cached_prompt_tokens
+        self.llm_requests = llm_requests
+
+
+class PipelineMetrics:
+    def __init__(self):
+        logger.info("Initializing PipelineMetrics")
+        self.stage_seconds = Histogram(
+            'legal_stage_duration_seconds', 'Duration of pipeline stages.',
+            ('stage', 'agent', 'outcome'), LATENCY_BUCKETS)
+        self.stage_prompt_tokens = Histogram(
+            'legal_stage_prompt_tokens', 'Prompt tokens sent to the LLM per pipeline stage.',
+            ('stage', 'agent'), TOKEN_BUCKETS)
+        self.stage_completion_tokens = Histogram(
+            'legal_stage_completion_tokens', 'Completion tokens received from the LLM per pipeline stage.',
+            ('stage', 'agent'), TOKEN_BUCKETS)
+        self.cached_prompt_tokens = Counter(
+            'legal_stage_cached_prompt_tokens_total', 'Prompt tokens served from the provider prompt cache.',
+            ('stage', 'agent'))
+        self.llm_requests = Counter(
+            'legal_llm_requests_total', 'LLM requests made by pipeline stages.', ('stage', 'agent'))
+        self.cache_lookups = Counter(
+            'legal_cache_lookups_total', 'Cache lookups by cache and outcome (hit or miss).', ('cache', 'outcome'))
+
+    @contextmanager
+    def stage(self, stage: str, agent: str = None, **attributes):
+        """
+        Run a pipeline stage as an OpenTelemetry span and record its duration and
+        token usage when it ends. Nested stages become child spans.
+        Args:
+            stage: Stage name, e.g. 'law_selection' or 'vote'
+            agent: Role of the agent running the stage, if any
+            attributes: Further span attributes, e.g. round or side; None values are left out
+        Yields:
+            A StageRecord to report token usage on
+        """
+        span_attributes = {'legal.stage': stage}
+        if agent:
+            span_attributes['legal.agent'] = agent
+        span_attributes.update({f'legal.{name}': value for name, value in attributes.items() if value is not None})
+
+        start = time.perf_counter()
+        with tracer.start_as_current_span(f'legal.{stage}', attributes=span_attributes) as span:
+            record = StageRecord(span)
+            try:
+                yield record
+            except BaseException:
+                record.outcome = 'error'
+                raise
+            finally:
+                self._record_stage(stage, agent or '', record, time.perf_counter() - start)
+
+    def _record_stage(self, stage: str, agent: str, record: StageRecord, seconds: float):
+        self.stage_seconds.observe(seconds, stage=stage, agent=agent, outcome=record.outcome)
+        if record.prompt_tokens is None:
+            return
+        record.span.set_attributes({
+            'llm.usage.prompt_tokens': record.prompt_tokens,
+            'llm.usage.completion_tokens': record.completion_tokens,
+            'llm.usage.cached_prompt_tokens': record.cached_prompt_tokens,
+            'llm.requests': record.llm_requests,
+        })
+        self.stage_prompt_tokens.observe(record.prompt_tokens, stage=stage, agent=agent)
+        self.stage_completion_tokens.observe(record.completion_tokens, stage=stage, agent=agent)
+        if record.cached_prompt_tokens:
+            self.cached_prompt_tokens.inc(record.cached_prompt_tokens, stage=stage, agent=agent)
+        if record.llm_requests:
+            self.llm_requests.inc(record.llm_requests, stage=stage, agent=agent)
+
+    def record_cache(self, cache: str, hit: bool, count: int = 1):
+        """Count cache lookups and annotate the current span with their outcome."""
+        if count <= 0:
+            return
+        outcome = 'hit' if hit else 'miss'
+        self.cache_lookups.inc(count, cache=cache, outcome=outcome)
+        span = trace.get_current_span()
+        if span.is_recording():
+            span.add_event('cache_lookup', {'legal.cache': cache, 'legal.cache.outcome': outcome, 'legal.cache.count': count})
+
+    def render(self, gauges: dict = None) -> str:
+        """
+        All metrics in the Prometheus text exposition format.
+        Args:
+            gauges: Optional point-in-time values to include, name -> (description, value)
+        """
+        lines = []
+        for metric in (self.stage_seconds, self.stage_prompt_tokens, self.stage_completion_tokens,
+                       self.cached_prompt_tokens, self.llm_requests, self.cache_lookups):
+            lines += metric.render()
+        for name, (description, value) in (gauges or {}).items():
+            lines += [f'# HELP {name} {description}', f'# TYPE {name} gauge', f'{name} {_format_value(value)}']
+        return '\n'.join(lines) + '\n'
+
+
+_pipeline_metrics = None
+_pipeline_metrics_lock = threading.Lock()
+
+
+def get_pipeline_metrics() -> PipelineMetrics:
+    """Process-wide PipelineMetrics."""
+    global _pipeline_metrics
+    with _pipeline_metrics_lock:
+        if _pipeline_metrics is None:
+            _pipeline_metrics = PipelineMetrics()
+        return _pipeline_metrics
+
+
+def configure_tracing(app=None) -> bool:
+    """
+    Export spans over OTLP/HTTP when OTEL_EXPORTER_OTLP_ENDPOINT (or
+    OTEL_EXPORTER_OTLP_TRACES_ENDPOINT) is set, and instrument the FastAPI app so
+    stage spans nest under their request span. Must run before the app starts.
+    Returns:
+        True if spans are exported
+    """
+    if os.getenv('OTEL_SDK_DISABLED', 'false').lower() == 'true':
+        return False
+    if not (os.getenv('OTEL_EXPORTER_OTLP_TRACES_ENDPOINT') or os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT')):
+        return False
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError as e:
+        logger.warning(f"OpenTelemetry span export disabled: {str(e)}")
+        return False
+
+    # crewai installs its own tracer provider for its anonymous telemetry unless that is
+    # disabled; ours must stay the global provider
+    os.environ.setdefault('CREWAI_DISABLE_TELEMETRY', 'true')
+    provider = TracerProvider(resource=Resource.create({
+        'service.name': os.getenv('OTEL_SERVICE_NAME', DEFAULT_SERVICE_NAME)
+    }))
+    # The exporter reads its endpoint, headers and timeout from the standard OTEL_EXPORTER_OTLP_* variables
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+
+    if app is not None:
+        try:
+            from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+            FastAPIInstrumentor.instrument_app(app, excluded_urls='metrics,pipeline-stats')
+        except ImportError as e:
+            logger.warning(f"FastAPI request spans disabled: {str(e)}")
+    logger.info("Exporting pipeline spans over OTLP")
+    return True
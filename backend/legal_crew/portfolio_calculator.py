@@ -0,0 +1,176 @@
+"""
+Column-wise rent calculations for whole housing portfolios.
+
+Array-based companion to PercentageCalculator: percentage changes, legality against
+the CPI/CAO-derived limits and new amounts are computed for every row at once with
+NumPy. Invalid rows do not raise; they get a validation error and NaN results while
+the rest of the portfolio is still computed.
+"""
+import logging
+import numpy as np
+from datetime import date
+from .percentage_calculator import PercentageCalculator
+from .cpi_tool import CPITool
+from .cao_tool import CAOTool
+
+logger = logging.getLogger(__name__)
+
+# Which indicator caps the increase of a row
+INDEXATIONS = ('cpi', 'cao', 'lowest')
+
+
+def to_float_column(values) -> tuple:
+    """
+    Convert a column to floats.
+    Returns:
+        (array of floats with NaN for missing or unreadable values, boolean array
+        marking the values that were present but not numeric)
+    """
+    try:
+        column = np.atleast_1d(np.asarray(values, dtype=float))
+        return column, np.zeros(column.shape, dtype=bool)
+    except (TypeError, ValueError):
+        pass
+    # Mixed column; convert value by value
+    column, unreadable = [], []
+    for value in np.atleast_1d(np.asarray(values, dtype=object)):
+        try:
+            column.append(np.nan if value is None else float(value))
+            unreadable.append(False)
+        except (TypeError, ValueError):
+            column.append(np.nan)
+            unreadable.append(True)
+    return np.array(column, dtype=float), np.array(unreadable, dtype=bool)
+
+
+class PortfolioCalculator:
+    def __init__(self, percentage_calculator: PercentageCalculator = None, cpi_tool: CPITool = None,
+                 cao_tool: CAOTool = None):
+        logger.info("Initializing Portfolio Calculator")
+        self.percentage_calculator = percentage_calculator or PercentageCalculator()
+        self.cpi_tool = cpi_tool or CPITool()
+        self.cao_tool = cao_tool or CAOTool()
+
+    def legal_limits(self, indexation, rows: int, base_percentage: float = 1.0, on_date: date = None) -> np.ndarray:
+        """
+        Maximum legal increase per row.
+        Args:
+            indexation: 'cpi', 'cao' or 'lowest' (of the two), for all rows or per row
+            rows: Number of rows
+            base_percentage: Percentage added on top of the indicator (default 1.0%)
+            on_date: Date of the increases (default today)
+        Returns:
+            Array of limits, NaN for rows with an unknown indexation
+        """
+        on_date = on_date or date.today()
+        cpi_limit = self.cpi_tool.calculate_legal_increase(base_percentage, on_date=on_date)
+        cao_limit = self.cao_tool.get_cao_index_on(on_date) + base_percentage
+        limit_by_indexation = {'cpi': cpi_limit, 'cao': cao_limit, 'lowest': min(cpi_limit, cao_limit)}
+        if np.ndim(indexation) == 0:
+            return np.full(rows, limit_by_indexation.get(str(indexation).lower(), np.nan))
+        lowered = np.char.lower(np.asarray(indexation, dtype=str))
+        return np.select(
+            [lowered == name for name in INDEXATIONS],
+            [limit_by_indexation[name] for name in INDEXATIONS],
+            default=np.nan
+        )
+
+    def check_rent_changes(self, current_rents, proposed_rents, indexation='cpi', base_percentage: float = 1.0,
+                           on_date: date = None) -> dict:
+        """
+        Check proposed rent changes for a whole portfolio.
+        Args:
+            current_rents: Column of current rents
+            proposed_rents: Column of proposed rents
+            indexation: 'cpi', 'cao' or 'lowest', for all rows or per row
+            base_percentage: Percentage added on top of the indicator (default 1.0%)
+            on_date: Date of the increases; the indicators in force then apply (default today)
+        Returns:
+            Dict of columns: percentage_change, legal_limit, is_legal, excess (percentage
+            points above the limit), max_legal_rent, valid and errors (None for valid rows)
+        """
+        current, current_unreadable = to_float_column(current_rents)
+        proposed, proposed_unreadable = to_float_column(proposed_rents)
+        if current.shape != proposed.shape or current.ndim != 1:
+            raise ValueError("current_rents and proposed_rents must be columns of the same length")
+        limits = self.legal_limits(indexation, current.size, base_percentage, on_date)
+
+        errors, valid = _first_error(current.size, [
+            (current_unreadable, "current rent is not a number"),
+            (proposed_unreadable, "proposed rent is not a number"),
+            (np.isnan(current) & ~current_unreadable, "current rent is missing"),
+            (np.isnan(proposed) & ~proposed_unreadable, "proposed rent is missing"),
+            (current <= 0, "current rent must be greater than 0"),
+            (proposed < 0, "proposed rent must not be negative"),
+            (np.isnan(limits), f"unknown indexation, expected one of {', '.join(INDEXATIONS)}"),
+        ])
+
+        percentage_change = np.where(valid, self.percentage_calculator.calculate_percentage_changes(current, proposed), np.nan)
+        is_legal = valid & self.percentage_calculator.are_increases_legal(percentage_change, limits)
+        excess = np.where(valid, np.maximum(percentage_change - limits, 0.0), np.nan)
+        max_legal_rent = np.where(valid, self.percentage_calculator.calculate_new_amounts(current, limits), np.nan)
+
+        logger.info(f"Checked {current.size} rent changes: {int(valid.sum())} valid, "
+                    f"{int((valid & ~is_legal).sum())} above the legal limit")
+        return {
+            'percentage_change': percentage_change,
+            'legal_limit': np.where(valid, limits, np.nan),
+            'is_legal': is_legal,
+            'excess': excess,
+            'max_legal_rent': max_legal_rent,
+            'valid': valid,
+            'errors': errors,
+        }
+
+    def calculate_new_rents(self, current_rents, percentage_changes) -> dict:
+        """
+        Apply percentage changes to a whole column of rents.
+        Returns:
+            Dict of columns: new_rent, valid and errors (None for valid rows)
+        """
+        current, current_unreadable = to_float_column(current_rents)
+        percentage, percentage_unreadable = to_float_column(percentage_changes)
+        current, percentage = np.broadcast_arrays(current, percentage)
+        current_unreadable, percentage_unreadable = np.broadcast_arrays(current_unreadable, percentage_unreadable)
+
+        errors, valid = _first_error(current.size, [
+            (current_unreadable, "current rent is not a number"),
+            (percentage_unreadable, "percentage change is not a number"),
+            (np.isnan(current) & ~current_unreadable, "current rent is missing"),
+            (np.isnan(percentage) & ~percentage_unreadable, "percentage change is missing"),
+            (current <= 0, "current rent must be greater than 0"),
+            (percentage <= -100, "percentage change must be greater than -100%"),
+        ])
+        return {
+            'new_rent': np.where(valid, self.percentage_calculator.calculate_new_amounts(current, percentage), np.nan),
+            'valid': valid,
+            'errors': errors,
+        }
+
+    def summarize(self, results: dict) -> dict:
+        """Portfolio-level totals for the output of check_rent_changes."""
+        valid = results['valid']
+        illegal = valid & ~results['is_legal']
+        return {
+            'rows': int(valid.size),
+            'valid': int(valid.sum()),
+            'invalid': int((~valid).sum()),
+            'legal': int(results['is_legal'].sum()),
+            'illegal': int(illegal.sum()),
+            'max_excess': float(np.nanmax(results['excess'])) if valid.any() else 0.0,
+            'mean_percentage_change': float(np.nanmean(results['percentage_change'])) if valid.any() else 0.0,
+        }
+
+
+def _first_error(rows: int, checks: list) -> tuple:
+    """
+    Apply (failed mask, message) checks in order.
+    Returns:
+        (per row the message of the first failing check or None, boolean array of rows that passed all checks)
+    """
+    errors = np.full(rows, None, dtype=object)
+    invalid = np.zeros(rows, dtype=bool)
+    for failed, message in checks:
+        errors[failed & ~invalid] = message
+        invalid |= failed
+    return errors, ~invalid
@@ -0,0 +1,60 @@
+"""
+Find the date a question or contract refers to (e.g. when a rent increase takes
+effect), so indicators and laws can be taken as they were on that date.
+"""
+import re
+from datetime import date
+
+MONTHS = {
+    'january': 1, 'jan': 1, 'januari': 1,
+    'february': 2, 'feb': 2, 'februari': 2,
+    'march': 3, 'mar': 3, 'maart': 3, 'mrt': 3,
+    'april': 4, 'apr': 4,
+    'may': 5, 'mei': 5,
+    'june': 6, 'jun': 6, 'juni': 6,
+    'july': 7, 'jul': 7, 'juli': 7,
+    'august': 8, 'aug': 8, 'augustus': 8,
+    'september': 9, 'sep': 9, 'sept': 9,
+    'october': 10, 'oct': 10, 'oktober': 10, 'okt': 10,
+    'november': 11, 'nov': 11,
+    'december': 12, 'dec': 12,
+}
+
+_MONTH_NAMES = '|'.join(sorted(MONTHS, key=len, reverse=True))
+_ISO_DATE = re.compile(r'\b(\d{4})-(\d{1,2})-(\d{1,2})\b')
+_NUMERIC_DATE = re.compile(r'\b(\d{1,2})[-/.](\d{1,2})[-/.](\d{4})\b')
+_DAY_MONTH_YEAR = re.compile(rf'\b(\d{{1,2}})(?:st|nd|rd|th)?\s+({_MONTH_NAMES})\.?\s+(\d{{4}})\b', re.IGNORECASE)
+_MONTH_DAY_YEAR = re.compile(rf'\b({_MONTH_NAMES})\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?,?\s+(\d{{4}})\b', re.IGNORECASE)
+_MONTH_YEAR = re.compile(rf'\b({_MONTH_NAMES})\.?\s+(\d{{4}})\b', re.IGNORECASE)
+
+
+def _make_date(year, month, day):
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+def find_reference_date(text: str):
+    """
+    Return the first date mentioned in the text, or None.
+    Understands 2024-07-01, 1-7-2024 / 01/07/2024 (day first, as in Dutch),
+    "1 July 2024", "1 juli 2024", "July 1, 2024" and "July 2024" (the 1st).
+    """
+    if not text:
+        return None
+    candidates = []
+    for match in _ISO_DATE.finditer(text):
+        candidates.append((match.start(), _make_date(match.group(1), match.group(2), match.group(3))))
+    for match in _NUMERIC_DATE.finditer(text):
+        candidates.append((match.start(), _make_date(match.group(3), match.group(2), match.group(1))))
+    for match in _DAY_MONTH_YEAR.finditer(text):
+        candidates.append((match.start(), _make_date(match.group(3), MONTHS[match.group(2).lower()], match.group(1))))
+    for match in _MONTH_DAY_YEAR.finditer(text):
+        candidates.append((match.start(), _make_date(match.group(3), MONTHS[match.group(1).lower()], match.group(2))))
+    if not candidates:
+        for match in _MONTH_YEAR.finditer(text):
+            candidates.append((match.start(), _make_date(match.group(2), MONTHS[match.group(1).lower()], 1)))
+
+    found = [found_date for _, found_date in sorted(candidates, key=lambda candidate: candidate[0]) if found_date]
+    return found[0] if found else None
@@ -0,0 +1,263 @@
+"""
+Deterministic fast path for rent-increase questions.
+
+Most rent-increase questions state the amounts or percentage outright, and the
+legality check is plain arithmetic that PercentageCalculator and CPITool already
+implement. This module extracts the numbers from the question and answers locally.
+It only answers questions that ask whether an increase is legal, and only assigns
+an amount a role (current rent, proposed rent, increase) from explicit wording
+around it, and only gives a verdict when the indicator store holds the CPI
+published for the date of the increase; anything else returns None so the LLM
+crew takes over. Batches of
+questions are computed in one vectorized pass.
+"""
+import logging
+import re
+import numpy as np
+from datetime import date
+from .cpi_tool import CPITool
+from .percentage_calculator import PercentageCalculator
+from .reference_date import find_reference_date
+
+logger = logging.getLogger(__name__)
+
+RENT_INCREASE_PHRASES = (
+    'rent increase', 'rent hike', 'rent raise', 'raise my rent', 'raise the rent', 'increase my rent',
+    'increase the rent', 'increasing my rent', 'raising my rent', 'huurverhoging',
+)
+
+# Situations where a different indicator or rule set may apply; leave those to the rent analyst
+NEEDS_ANALYST_PHRASES = (
+    'cao', 'wage', 'free sector', 'vrije sector', 'liberalised', 'liberalized', 'private sector',
+    'mid-rent', 'middenhuur', 'commercial', 'business premises', 'bedrijfsruimte', 'renovation',
+    'service cost', 'servicekosten',
+    # Social (rent-controlled) housing has its own maximum increases, not CPI + 1%
+    'social housing', 'social rent', 'sociale huur', 'rent-controlled', 'rent controlled', 'regulated',
+    'gereguleerd', 'housing association', 'housing corporation', 'corporatie', 'huurtoeslag',
+    'rent allowance', 'housing benefit', 'points system', 'puntenstelsel', 'wws',
+    # How often or when a landlord may raise the rent is not a question about the amount
+    'twice', 'second time', 'how often', 'again', 'tweede keer', 'opnieuw',
+)
+
+# The question has to ask whether the increase is allowed before the fast path gives a verdict
+_LEGALITY_PATTERN = re.compile(
+    r'\b(?:legal|illegal|lawful|unlawful|allowed|permitted|permissible|too (?:high|much)|excessive|'
+    r'toegestaan|wettelijk|te hoog)\b|\b(?:is|are) (?:this|that|it|these) (?:ok|okay|fine|acceptable)\b',
+    re.IGNORECASE
+)
+
+_NUMBER = r'\d[\d.,]*\d|\d'
+_AMOUNT_PATTERNS = (
+    re.compile(rf'(?:€|\beur(?:os?)?\b)\s*({_NUMBER})', re.IGNORECASE),
+    re.compile(rf'({_NUMBER})\s*(?:€|\beur(?:os?)?\b)', re.IGNORECASE),
+)
+_CURRENCY = r'(?:€|\beur(?:os?)?\b)'
+_FROM_TO_PATTERN = re.compile(
+    rf'\bfrom\s+(?:€\s*)?({_NUMBER})(?:\s*{_CURRENCY})?\s+to\s+(?:€\s*)?({_NUMBER})(?!\s*(?:%|percent))',
+    re.IGNORECASE
+)
+# The role of an amount follows from the words just before (or after) it
+_CONTEXT_CHARS = 40
+_DELTA_BEFORE = re.compile(
+    r'\b(?:increases?|increased|raises?|raised|hikes?|rises?|risen|goe?s up|went up|gone up|up|verhoging|verhoogd)'
+    r'\s+(?:of|by|with|met|van)\s*$'
+)
+_DELTA_AFTER = re.compile(r'^\s*(?:(?:per|a|each) month\s+)?(?:more|extra|increase|higher|meer)\b')
+_PROPOSED_BEFORE = re.compile(
+    r'\b(?:to|new rent(?: is| of| will be)?|proposed rent(?: is| of)?|new|proposed|will be|becomes?|'
+    r'naar|nieuwe huur(?: is| wordt| van)?|wordt)\s*:?\s*$'
+)
+_CURRENT_BEFORE = re.compile(
+    r'\b(?:current(?:ly)?(?: rent)?(?: is| of)?|now(?: pay(?:ing)?)?|i pay|paying|rent of|rent is|'
+    r'present rent(?: is| of)?|old rent(?: is| of)?|existing rent(?: is| of)?|huidige huur(?: is| van)?|'
+    r'betaal(?: ik)?(?: nu)?)\s*:?\s*$'
+)
+_PERCENT_PATTERN = re.compile(rf'({_NUMBER})\s*(?:%|percent\b|per cent\b|procent\b)', re.IGNORECASE)
+
+
+def is_rent_increase_question(question: str) -> bool:
+    question = question.lower()
+    return any(phrase in question for phrase in RENT_INCREASE_PHRASES)
+
+
+def asks_about_legality(question: str) -> bool:
+    """Whether the question asks if an increase is legal (or too high), as opposed to anything else about it."""
+    return bool(_LEGALITY_PATTERN.search(question))
+
+
+def _amount_role(question: str, start: int, end: int):
+    """'current', 'proposed' or 'delta' from the wording around an amount, or None without a clear cue."""
+    before = question[max(0, start - _CONTEXT_CHARS):start].lower()
+    after = question[end:end + _CONTEXT_CHARS].lower()
+    if _DELTA_BEFORE.search(before) or _DELTA_AFTER.search(after):
+        return 'delta'
+    if _CURRENT_BEFORE.search(before):
+        return 'current'
+    if _PROPOSED_BEFORE.search(before):
+        return 'proposed'
+    return None
+
+
+def parse_number(text: str):
+    """
+    Parse an amount written in Dutch (1.200,50) or English (1,200.50) notation.
+    Returns None if the number cannot be read unambiguously.
+    """
+    text = text.strip('.,')
+    if '.' in text and ',' in text:
+        decimal = '.' if text.rfind('.') > text.rfind(',') else ','
+        thousands = ',' if decimal == '.' else '.'
+        text = text.replace(thousands, '').replace(decimal, '.')
+    elif ',' in text or '.' in text:
+        separator = ',' if ',' in text else '.'
+        groups = text.split(separator)
+        if len(groups) == 2 and len(groups[1]) != 3:
+            text = f"{groups[0]}.{groups[1]}"
+        elif all(len(group) == 3 for group in groups[1:]):
+            text = ''.join(groups)
+        else:
+            return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+class RentIncreaseFastPath:
+    def __init__(self, cpi_tool: CPITool = None, percentage_calculator: PercentageCalculator = None):
+        logger.info("Initializing Rent Increase Fast Path")
+        self.cpi_tool = cpi_tool or CPITool()
+        self.percentage_calculator = percentage_calculator or PercentageCalculator()
+
+    def extract(self, question: str):
+        """
+        Extract the current rent, proposed rent and percentage from a question.
+        Amounts only count with an explicit cue: "from X to Y", "current/now X",
+        "new/proposed/to Y", or "an increase of X" (added to the current rent).
+        Returns:
+            Dict with 'current', 'proposed' and 'percentage' (each possibly None),
+            or None if the question is ambiguous
+        """
+        lowered = question.lower()
+        if any(phrase in lowered for phrase in NEEDS_ANALYST_PHRASES):
+            return None
+
+        percentages = [parse_number(match) for match in _PERCENT_PATTERN.findall(question)]
+        if None in percentages or len(percentages) > 1:
+            return None
+
+        roles = {}
+        from_to = _FROM_TO_PATTERN.search(question)
+        if from_to:
+            roles = {'current': [parse_number(from_to.group(1))], 'proposed': [parse_number(from_to.group(2))]}
+        else:
+            # The same amount can match both patterns ("€ 800 euro")
+            spans = {}
+            for pattern in _AMOUNT_PATTERNS:
+                for match in pattern.finditer(question):
+                    if not any(start <= match.start() < end or match.start() <= start < match.end() for start, end in spans):
+                        spans[(match.start(), match.end())] = parse_number(match.group(1))
+            for (start, end), amount in sorted(spans.items()):
+                role = _amount_role(question, start, end)
+                if role is None:
+                    # An amount we cannot place could be anything; leave it to the crew
+                    return None
+                roles.setdefault(role, []).append(amount)
+
+        amounts = [amount for values in roles.values() for amount in values]
+        if None in amounts or any(len(values) > 1 for values in roles.values()):
+            return None
+        current = roles.get('current', [None])[0]
+        proposed = roles.get('proposed', [None])[0]
+        delta = roles.get('delta', [None])[0]
+        if delta is not None:
+            if proposed is not None or current is None:
+                return None
+            proposed = current + delta
+
+        if current is not None and current <= 0:
+            return None
+        return {'current': current, 'proposed': proposed, 'percentage': percentages[0] if percentages else None}
+
+    def answer(self, question: str):
+        """
+        Answer a rent-increase question without the LLM.
+        Returns:
+            The answer text, or None if the question needs the full crew
+        """
+        return self.answer_batch([question])[0]
+
+    def answer_batch(self, questions: list) -> list:
+        """
+        Answer many rent-increase questions at once; the arithmetic runs vectorized
+        over the whole batch.
+        Returns:
+            One answer text (or None if the question needs the full crew) per question
+        """
+        answers = [None] * len(questions)
+        rows, stated_dates = [], []
+        for position, question in enumerate(questions):
+            if not is_rent_increase_question(question) or not asks_about_legality(question):
+                continue
+            extracted = self.extract(question)
+            if extracted is None:
+                logger.info("Rent fast path: question is ambiguous, falling back to the crew")
+                continue
+            # The limit is the one in force on the date the question mentions (today if none)
+            stated_date = find_reference_date(question)
+            if not self.cpi_tool.has_cpi_for(stated_date or date.today()):
+                # A stand-in CPI would give a verdict against the wrong limit
+                logger.info("Rent fast path: no published CPI for the date of the increase, falling back to the crew")
+                continue
+            rows.append((position, extracted))
+            stated_dates.append(stated_date)
+        if not rows:
+            return answers
+
+        def column(name):
+            return np.array([np.nan if extracted[name] is None else extracted[name] for _, extracted in rows])
+
+        current, proposed, stated = column('current'), column('proposed'), column('percentage')
+        calculated = self.percentage_calculator.calculate_percentage_changes(current, proposed)
+        percentage = np.where(np.isnan(calculated), stated, calculated)
+        proposed = np.where(np.isnan(proposed), self.percentage_calculator.calculate_new_amounts(current, stated), proposed)
+        # A stated percentage that contradicts the amounts is ambiguous
+        contradicted = ~np.isnan(calculated) & ~np.isnan(stated) & (np.abs(calculated - stated) > 0.1)
+        # Without a percentage (no amounts or only one) there is nothing to check
+        answerable = ~np.isnan(percentage) & (percentage > 0) & ~contradicted
+
+        limits_by_date = {
+            on_date: (self.cpi_tool.get_cpi_on(on_date), self.cpi_tool.calculate_legal_increase(on_date=on_date))
+            for on_date in {stated_date or date.today() for stated_date in stated_dates}
+        }
+        cpi, legal_limit = np.array([limits_by_date[stated_date or date.today()] for stated_date in stated_dates]).T
+        is_legal = self.percentage_calculator.are_increases_legal(percentage, legal_limit)
+
+        for row, (position, _) in enumerate(rows):
+            if not answerable[row]:
+                continue
+            logger.info(f"Rent fast path answered: {percentage[row]:.2f}% vs limit {legal_limit[row]:.2f}%")
+            answers[position] = self._format_answer(
+                current[row], proposed[row], percentage[row], bool(is_legal[row]), cpi[row], legal_limit[row],
+                stated_dates[row]
+            )
+        return answers
+
+    def _format_answer(self, current, proposed, percentage, is_legal, cpi, legal_limit, stated_date=None) -> str:
+        lines = ["Rent increase analysis:"]
+        if not np.isnan(current):
+            lines.append(f"- Current rent: €{current:.2f}")
+        if not np.isnan(proposed):
+            lines.append(f"- Proposed rent: €{proposed:.2f}")
+        lines.append(f"- Increase: {percentage:.2f}%")
+        in_force = f" on {stated_date.isoformat()}" if stated_date else ""
+        lines.append(f"- Maximum legal increase{in_force}: {legal_limit:.2f}% (CPI {cpi:.2f}% + {legal_limit - cpi:.2f}%)")
+        lines.append("")
+        if is_legal:
+            lines.append("This rent increase is legal: it stays within the maximum allowed increase.")
+            lines.append("The landlord must still propose the increase in writing at least two months before it takes effect.")
+        else:
+            lines.append(f"This rent increase is illegal: it exceeds the maximum allowed increase by {percentage - legal_limit:.2f} percentage points.")
+            lines.append("You can object to the proposal in writing before the increase takes effect. If the landlord does not "
+                         "withdraw it, you can ask the Huurcommissie (Rent Tribunal) to assess the increase.")
+        return "\n".join(lines)
@@ -0,0 +1,170 @@
+"""
+Result cache in front of LegalCrew.process_question.
+
+Keys combine the normalized question with everything else the answer depends on:
+the contract text, the CPI/CAO values (and the indicator history they come from)
+and the state of the law corpus. Entries are
+evicted least-recently-used once the entry or byte limit is reached, expire after a
+TTL, and the whole cache is dropped when the files in backend/laws change.
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from .cpi_tool import CPITool
+from .cao_tool import CAOTool
+
+logger = logging.getLogger(__name__)
+
+LAWS_DIR = Path(__file__).parent.parent / 'laws'
+
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+# How often to re-stat backend/laws for changes
+CORPUS_CHECK_SECONDS = 5.0
+
+
+def normalize_question(question: str) -> str:
+    """Collapse formatting differences that do not change the meaning of a question."""
+    question = question.lower().strip()
+    question = re.sub(r'\s*(?:percent|per cent|procent)\b', '%', question)
+    question = re.sub(r'(\d)\s+%', r'\1%', question)
+    question = re.sub(r'(?:€|\beur(?:os?)?\b)\s*(\d)', r'€\1', question)
+    question = re.sub(r"[^\w%€.,\s-]", ' ', question)
+    question = ' '.join(question.split())
+    return question.rstrip(' .,?!')
+
+
+def corpus_signature(laws_dir: Path = LAWS_DIR) -> str:
+    """Cheap signature of the law corpus files (name, size and modification time)."""
+    sha = hashlib.sha256()
+    for path in sorted(laws_dir.iterdir()):
+        if path.is_file():
+            stat = path.stat()
+            sha.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode('utf-8'))
+    return sha.hexdigest()[:16]
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = None, max_bytes: int = None, ttl_seconds: float = None):
+        self.max_entries = max_entries or int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+        self.max_bytes = max_bytes or int(os.getenv('RESPONSE_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+        self.ttl_seconds = ttl_seconds or float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', DEFAULT_TTL_SECONDS))
+        logger.info(f"Initializing ResponseCache (max_entries={self.max_entries}, "
+                    f"max_bytes={self.max_bytes}, ttl={self.ttl_seconds}s)")
+
+        self.cpi_tool = CPITool()
+        self.cao_tool = CAOTool()
+
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._corpus_signature = corpus_signature()
+        self._corpus_checked_at = time.monotonic()
+        self._indicators = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def make_key(self, question: str, contract_text: str = None) -> str:
+        return hashlib.sha256(
+            f"{normalize_question(question)}\x1f{self.context_key(contract_text)}".encode('utf-8')
+        ).hexdigest()
+
+    def context_key(self, contract_text: str = None) -> str:
+        """
+        Hash of everything besides the question that an answer depends on: the contract
+        text, the CPI/CAO values and the law corpus. Clears the cache when the indicators
+        or the corpus have changed.
+        """
+        self._check_corpus()
+        indicators = (self.cpi_tool.get_current_cpi(), self.cao_tool.get_current_cao_index())
+        if indicators != self._indicators:
+            if self._indicators is not None:
+                logger.info("CPI/CAO values changed, invalidating response cache")
+                self.invalidations += 1
+                self.clear()
+            self._indicators = indicators
+
+        contract_hash = hashlib.sha256(contract_text.encode('utf-8')).hexdigest() if contract_text else ''
+        parts = [
+            contract_hash,
+            f"cpi={indicators[0]}",
+            f"cao={indicators[1]}",
+            f"indicators={self.cpi_tool.indicator_store.version}",
+            f"corpus={self._corpus_signature}",
+        ]
+        return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, size, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str):
+        size = len(key) + len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _check_corpus(self):
+        now = time.monotonic()
+        if now - self._corpus_checked_at < CORPUS_CHECK_SECONDS:
+            return
+        self._corpus_checked_at = now
+        signature = corpus_signature()
+        if signature != self._corpus_signature:
+            logger.info("Law corpus changed, invalidating response cache")
+            self._corpus_signature = signature
+            self.invalidations += 1
+            self.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
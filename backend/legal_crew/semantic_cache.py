@@ -0,0 +1,155 @@
+"""
+Similarity cache of previous pipeline answers.
+
+Questions are embedded locally with chromadb's ONNX MiniLM model on the CPU, so a
+paraphrase of a question that was already answered ("can my landlord raise rent 8%?"
+vs "is an 8 percent rent hike allowed") is served without running the crew.
+
+A hit requires all of:
+- cosine similarity of the question embeddings of at least the threshold,
+- the same context key (contract, CPI/CAO values and law corpus, see
+  ResponseCache.context_key), so answers never cross those boundaries,
+- exactly the same numbers in both questions, because embeddings barely separate
+  "8%" from "3%" while the answer depends on it.
+
+The cache lives in memory, is bounded in size (least-recently-used entries are
+evicted first) and entries expire after a TTL.
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from .response_cache import normalize_question
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 0.92
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+COLLECTION_NAME = 'legal_answers'
+
+_NUMBER_PATTERN = re.compile(r'\d+(?:[.,]\d+)*')
+
+
+def question_numbers(question: str) -> str:
+    """The numbers in a question, in order, as a comparable string."""
+    return ' '.join(_NUMBER_PATTERN.findall(normalize_question(question)))
+
+
+def default_embedding_function():
+    """chromadb's bundled all-MiniLM-L6-v2 ONNX model, pinned to the CPU provider."""
+    from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+    return ONNXMiniLM_L6_V2(preferred_providers=['CPUExecutionProvider'])
+
+
+class SemanticCache:
+    def __init__(self, threshold: float = None, max_entries: int = None, ttl_seconds: float = None,
+                 embedding_function=None):
+        """
+        Args:
+            threshold: Minimum cosine similarity for a hit (default SEMANTIC_CACHE_THRESHOLD)
+            max_entries: Maximum number of cached answers (default SEMANTIC_CACHE_MAX_ENTRIES)
+            ttl_seconds: Entry lifetime (default SEMANTIC_CACHE_TTL_SECONDS)
+            embedding_function: chromadb embedding function (default: ONNX MiniLM on CPU)
+        Raises:
+            Exception: If chromadb or the embedding model cannot be loaded
+        """
+        self.threshold = threshold or float(os.getenv('SEMANTIC_CACHE_THRESHOLD', DEFAULT_THRESHOLD))
+        self.max_entries = max_entries or int(os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+        self.ttl_seconds = ttl_seconds or float(os.getenv('SEMANTIC_CACHE_TTL_SECONDS', DEFAULT_TTL_SECONDS))
+        logger.info(f"Initializing SemanticCache (threshold={self.threshold}, "
+                    f"max_entries={self.max_entries}, ttl={self.ttl_seconds}s)")
+
+        import chromadb
+        from chromadb.config import Settings
+        self._client = chromadb.EphemeralClient(Settings(anonymized_telemetry=False))
+        self._collection = self._client.get_or_create_collection(
+            COLLECTION_NAME,
+            embedding_function=embedding_function or default_embedding_function(),
+            metadata={'hnsw:space': 'cosine'},
+        )
+        # Load the model now so the first request does not pay for it
+        self._collection.query(query_texts=['warm up'], n_results=1)
+
+        self._order = OrderedDict()  # entry id -> expires_at, least recently used first
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def lookup(self, question: str, context_key: str):
+        """
+        Find the answer to a previously asked question that means the same thing.
+        Returns:
+            The cached answer, or None
+        """
+        numbers = question_numbers(question)
+        with self._lock:
+            if not self._order:
+                self.misses += 1
+                return None
+            result = self._collection.query(
+                query_texts=[normalize_question(question)],
+                n_results=1,
+                where={'$and': [{'context': context_key}, {'numbers': numbers}]},
+                include=['documents', 'metadatas', 'distances'],
+            )
+            if not result['ids'][0]:
+                self.misses += 1
+                return None
+
+            entry_id = result['ids'][0][0]
+            similarity = 1.0 - result['distances'][0][0]
+            if self._order.get(entry_id, 0) < time.monotonic():
+                self._delete([entry_id])
+                self.expirations += 1
+                self.misses += 1
+                return None
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            self._order.move_to_end(entry_id)
+            self.hits += 1
+        logger.info(f"Semantic cache hit (similarity {similarity:.3f}) "
+                    f"for question similar to: {result['documents'][0][0]}")
+        return result['metadatas'][0][0]['answer']
+
+    def store(self, question: str, context_key: str, answer: str):
+        normalized = normalize_question(question)
+        entry_id = hashlib.sha256(f"{context_key}\x1f{normalized}".encode('utf-8')).hexdigest()
+        with self._lock:
+            self._collection.upsert(
+                ids=[entry_id],
+                documents=[normalized],
+                metadatas=[{'context': context_key, 'numbers': question_numbers(question), 'answer': answer}],
+            )
+            self._order[entry_id] = time.monotonic() + self.ttl_seconds
+            self._order.move_to_end(entry_id)
+            overflow = len(self._order) - self.max_entries
+            if overflow > 0:
+                self._delete(list(self._order)[:overflow])
+                self.evictions += overflow
+
+    def _delete(self, entry_ids: list):
+        self._collection.delete(ids=entry_ids)
+        for entry_id in entry_ids:
+            self._order.pop(entry_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._order),
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
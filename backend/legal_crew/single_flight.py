@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller starts the work and
+    every caller that arrives while it is still running awaits the same result.
+
+    The work runs as its own task, so a caller disconnecting does not cancel it for
+    the others. Must be used from a single event loop.
+    """
+
+    def __init__(self):
+        logger.info("Initializing SingleFlight")
+        self._in_flight = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn):
+        """
+        Run the coroutine function fn for key, or join the run already in flight.
+        Returns:
+            The result of fn(); exceptions are raised to every waiting caller
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.info(f"Joining in-flight pipeline for key {key[:12]}")
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: str) -> bool:
+        """Whether a call for key is running, so do() would join it."""
+        return key in self._in_flight
+
+    def _finish(self, key: str, task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved even if every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "executions": self.executions,
+            "pipelines_saved": self.coalesced,
+        }
+
+
+class ThreadSingleFlight:
+    """
+    SingleFlight for blocking work running on several threads, such as the stages of
+    concurrent pipelines. The first caller to claim a key does the work and publishes
+    the outcome on the returned future; every caller that claims the key while that
+    future is pending waits on it instead.
+    """
+
+    def __init__(self):
+        logger.info("Initializing ThreadSingleFlight")
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def claim(self, key: str) -> tuple:
+        """
+        Claim the work for key.
+        Returns:
+            (future, True) if the caller must do the work and set the future's result
+            or exception, or (future, False) if it should wait on the future of the
+            caller already doing it
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._in_flight[key] = future
+            self.executions += 1
+        future.add_done_callback(lambda done, key=key: self._finish(key, done))
+        return future, True
+
+    def _finish(self, key: str, future):
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._in_flight),
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+            }
@@ -0,0 +1,123 @@
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STAGE_WORKERS = 16
+
+_stage_executor = None
+_stage_executor_lock = threading.Lock()
+
+
+def get_stage_executor() -> ThreadPoolExecutor:
+    """
+    Process-wide thread pool for independent pipeline stages (LLM round-trips).
+    Kept separate from the request-level PipelineExecutor so a pipeline waiting
+    on its stages can never starve them of workers.
+    """
+    global _stage_executor
+    with _stage_executor_lock:
+        if _stage_executor is None:
+            workers = int(os.getenv('LEGAL_CREW_STAGE_WORKERS', DEFAULT_STAGE_WORKERS))
+            logger.info(f"Initializing stage executor with {workers} workers")
+            _stage_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="legal-stage")
+        return _stage_executor
+
+
+def run_stages_concurrently(stages: dict, stop_when=None):
+    """
+    Run independent stages at the same time.
+    Args:
+        stages: Mapping of stage name to a zero-argument callable
+        stop_when: Optional predicate (name, result) -> bool; when it returns True
+            the remaining stages are abandoned and the results so far are returned
+    Returns:
+        (results, abandoned) where results maps stage name to result for every
+        stage that finished, and abandoned lists the futures of stages that were
+        still pending. Stages that had not started yet are cancelled; a stage
+        already talking to the LLM cannot be interrupted, so callers must not reuse
+        the agents involved until the abandoned futures are done.
+    Raises:
+        The first exception a stage raises. The futures of the stages still running
+        then are attached to it as abandoned_stages, for the same reason.
+    """
+    executor = get_stage_executor()
+    # Each stage runs in a copy of the caller's context, so its span nests under the caller's
+    futures = {executor.submit(contextvars.copy_context().run, fn): name for name, fn in stages.items()}
+    results = {}
+    pending = set(futures)
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                e.abandoned_stages = _abandon(pending)
+                if e.abandoned_stages:
+                    logger.info("Stage '%s' failed, abandoning %d running sibling(s)", name, len(e.abandoned_stages))
+                raise
+            if stop_when is not None and stop_when(name, results[name]):
+                logger.info("Stage '%s' ended the concurrent run early, abandoning %d sibling(s)", name, len(pending))
+                return results, _abandon(pending)
+
+    return results, []
+
+
+def _abandon(pending) -> list:
+    for future in pending:
+        future.cancel()
+    return [future for future in pending if not future.done()]
+
+
+class SpeculationStats:
+    """
+    Outcome of stages started speculatively, before it was known whether their
+    result would be needed: latency saved when it was used, and LLM time spent on
+    results that were discarded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._used = 0
+        self._discarded = 0
+        self._saved_seconds = 0.0
+        self._wasted_seconds = 0.0
+
+    def record_used(self, saved_seconds: float):
+        with self._lock:
+            self._used += 1
+            self._saved_seconds += max(saved_seconds, 0.0)
+
+    def record_discarded(self, wasted_seconds: float):
+        with self._lock:
+            self._discarded += 1
+            self._wasted_seconds += wasted_seconds
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "used": self._used,
+                "discarded": self._discarded,
+                "saved_seconds": round(self._saved_seconds, 6),
+                "wasted_seconds": round(self._wasted_seconds, 6),
+                "mean_saved_seconds": round(self._saved_seconds / self._used, 6) if self._used else 0.0,
+                "mean_wasted_seconds": round(self._wasted_seconds / self._discarded, 6) if self._discarded else 0.0,
+            }
+
+
+_speculation_stats = None
+_speculation_stats_lock = threading.Lock()
+
+
+def get_speculation_stats() -> SpeculationStats:
+    """Process-wide SpeculationStats."""
+    global _speculation_stats
+    with _speculation_stats_lock:
+        if _speculation_stats is None:
+            _speculation_stats = SpeculationStats()
+        return _speculation_stats
@@ -1,5 +1,6 @@
 from enum import Enum
-from typing import List, Dict, Optional
+from itertools import product
+from typing import List, Dict, Optional, Iterable
 
 class Vote(Enum):
     OBVIOUSLY_TENANT = "obviously_tenant"
@@ -8,6 +9,23 @@ class Vote(Enum):
     MOST_LIKELY_LANDLORD = "most_likely_landlord"
     OBVIOUSLY_LANDLORD = "obviously_landlord"
 
+def parse_vote(text: str) -> Optional[Vote]:
+    """
+    Read a judge's vote from its answer.
+    Returns:
+        The exact vote option the answer consists of, otherwise the option mentioned
+        first in it (judges often justify their vote), or None if it names none
+    """
+    cleaned = text.strip().lower()
+    try:
+        return Vote(cleaned)
+    except ValueError:
+        pass
+    mentioned = [(cleaned.find(vote.value), vote) for vote in Vote if vote.value in cleaned]
+    if not mentioned:
+        return None
+    return min(mentioned, key=lambda position_and_vote: position_and_vote[0])[1]
+
 class VotingTracker:
     def __init__(self):
         self.rounds: List[Dict[str, Vote]] = []
@@ -39,22 +57,46 @@ class VotingTracker:
         current_votes = self.get_current_round_votes()
         if not current_votes:
             return None
-            
+
+        return self._decide(current_votes.values(), self.current_round)
+
+    def is_round_decided(self, remaining_voters: int) -> bool:
+        """
+        Check whether the current round's outcome is already settled.
+        Args:
+            remaining_voters: Number of judges that have not voted yet this round
+        Returns:
+            True if no combination of the remaining votes can change what
+            check_decision_criteria will return once everyone has voted
+        """
+        votes = list(self.get_current_round_votes().values())
+        round_number = max(self.current_round, 1)
+        outcomes = set()
+        for remaining_votes in product(Vote, repeat=remaining_voters):
+            outcomes.add(self._decide(votes + list(remaining_votes), round_number))
+            if len(outcomes) > 1:
+                return False
+        return True
+
+    @staticmethod
+    def _decide(votes: Iterable[Vote], round_number: int) -> Optional[str]:
+        votes = list(votes)
+
         # Count votes
-        tenant_obvious = sum(1 for v in current_votes.values() if v == Vote.OBVIOUSLY_TENANT)
-        tenant_likely = sum(1 for v in current_votes.values() if v == Vote.MOST_LIKELY_TENANT)
-        landlord_obvious = sum(1 for v in current_votes.values() if v == Vote.OBVIOUSLY_LANDLORD)
-        landlord_likely = sum(1 for v in current_votes.values() if v == Vote.MOST_LIKELY_LANDLORD)
+        tenant_obvious = sum(1 for v in votes if v == Vote.OBVIOUSLY_TENANT)
+        tenant_likely = sum(1 for v in votes if v == Vote.MOST_LIKELY_TENANT)
+        landlord_obvious = sum(1 for v in votes if v == Vote.OBVIOUSLY_LANDLORD)
+        landlord_likely = sum(1 for v in votes if v == Vote.MOST_LIKELY_LANDLORD)
         
         # First round criteria
-        if self.current_round == 1:
+        if round_number == 1:
             if (tenant_obvious >= 3) or (tenant_obvious >= 2 and tenant_likely >= 1):
                 return "tenant"
             if (landlord_obvious >= 3) or (landlord_obvious >= 2 and landlord_likely >= 1):
                 return "landlord"
                 
         # Second and third round criteria
-        if self.current_round >= 2:
+        if round_number >= 2:
             tenant_total = tenant_obvious + tenant_likely
             landlord_total = landlord_obvious + landlord_likely
             
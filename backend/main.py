@@ -1,14 +1,36 @@
 from fastapi import FastAPI, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse, Response
 from typing import List
+import asyncio
 import json
+import os
+from datetime import datetime, timezone
 from pydantic import BaseModel
 from gemini_client import get_ai_explanation
-from legal_crew.legal_crew import LegalCrew
+from legal_crew.crew_pool import LegalCrewPool
+from legal_crew.pipeline_executor import PipelineExecutor, PipelineSaturatedError
+from legal_crew.law_retriever import get_law_retriever
+from legal_crew.law_ingestion import refresh_law_corpus
+from legal_crew.overview_index import get_overview_index
+from legal_crew.response_cache import ResponseCache
+from legal_crew.single_flight import SingleFlight
+from legal_crew.semantic_cache import SemanticCache
+from legal_crew.job_store import JobStore, COMPLETED, FAILED
+from legal_crew.rent_fast_path import RentIncreaseFastPath
+from legal_crew.stage_runner import get_speculation_stats
+from legal_crew.contract_ingestion import ContractIngestion, UploadTooLargeError, UnsupportedDocumentError, \
+    UploadSizeLimitMiddleware
+from legal_crew.contract_clauses import get_clause_cache, get_clause_flight
+from legal_crew.pipeline_metrics import get_pipeline_metrics, configure_tracing, PROMETHEUS_CONTENT_TYPE
 import logging
 
 app = FastAPI()
 
+# Refuse oversized uploads before Starlette receives and parses the multipart body; added
+# before CORS so its 413 responses still carry the CORS headers
+app.add_middleware(UploadSizeLimitMiddleware, paths=["/message-with-files", "/legal-advice/upload"])
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +44,89 @@ app.add_middleware(
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Export request and pipeline stage spans when an OTLP endpoint is configured
+configure_tracing(app)
+
+# Shared pool of LegalCrew instances and the worker pool that runs them, built once at startup
+crew_pool: LegalCrewPool | None = None
+pipeline_executor: PipelineExecutor | None = None
+response_cache: ResponseCache | None = None
+single_flight: SingleFlight | None = None
+semantic_cache: SemanticCache | None = None
+job_store: JobStore | None = None
+# Background tasks of the jobs running in this process, by job id
+active_jobs: dict = {}
+rent_fast_path: RentIncreaseFastPath | None = None
+contract_ingestion: ContractIngestion | None = None
+# Pipeline slots all /legal-advice/batch requests together may hold
+batch_slots: asyncio.Semaphore | None = None
+
+DEFAULT_BATCH_MAX_ITEMS = 500
+
+@app.on_event("startup")
+async def build_crew_pool():
+    global crew_pool, pipeline_executor, response_cache, single_flight, semantic_cache, job_store, rent_fast_path, \
+        contract_ingestion, batch_slots
+    if crew_pool is None:
+        crew_pool = LegalCrewPool()
+    if pipeline_executor is None:
+        # LEGAL_PIPELINE_MAX_IN_FLIGHT may lower the limit, but never run more pipelines at once
+        # than there are crews to run them
+        max_in_flight = int(os.getenv('LEGAL_PIPELINE_MAX_IN_FLIGHT', crew_pool.size))
+        if max_in_flight > crew_pool.size:
+            logger.warning(f"LEGAL_PIPELINE_MAX_IN_FLIGHT={max_in_flight} exceeds the crew pool size, "
+                           f"using {crew_pool.size}")
+            max_in_flight = crew_pool.size
+        pipeline_executor = PipelineExecutor(max_in_flight=max_in_flight)
+    if batch_slots is None:
+        # Batches share at most LEGAL_BATCH_MAX_IN_FLIGHT slots (default half the pipeline capacity),
+        # so interactive /legal-advice requests always find the rest free
+        default_batch_max = max(1, pipeline_executor.max_in_flight // 2)
+        batch_max_in_flight = min(int(os.getenv('LEGAL_BATCH_MAX_IN_FLIGHT', default_batch_max)),
+                                  pipeline_executor.max_in_flight)
+        logger.info(f"Batches may run {batch_max_in_flight} of {pipeline_executor.max_in_flight} pipelines at once")
+        batch_slots = asyncio.Semaphore(batch_max_in_flight)
+    if response_cache is None:
+        response_cache = ResponseCache()
+    if single_flight is None:
+        single_flight = SingleFlight()
+    if rent_fast_path is None:
+        rent_fast_path = RentIncreaseFastPath()
+    if contract_ingestion is None:
+        contract_ingestion = ContractIngestion()
+    await asyncio.to_thread(contract_ingestion.prune)
+    if semantic_cache is None and os.getenv('SEMANTIC_CACHE_ENABLED', 'true').lower() == 'true':
+        try:
+            semantic_cache = SemanticCache()
+        except Exception as e:
+            # The embedding model may be unavailable (e.g. no network on first download); run without it
+            logger.warning(f"Semantic cache disabled: {str(e)}")
+    # Load (or build) the law article store and its search index now rather than on the first request
+    get_law_retriever()
+    get_overview_index()
+    if job_store is None:
+        job_store = JobStore()
+    job_store.prune()
+    # Pick up jobs that were interrupted by the last shutdown; completed stages are reused
+    for job_id in job_store.unfinished_jobs():
+        start_job(job_id)
+
+@app.on_event("shutdown")
+async def stop_pipeline_executor():
+    if pipeline_executor is not None:
+        pipeline_executor.shutdown()
+    if contract_ingestion is not None:
+        contract_ingestion.shutdown()
+
+def run_legal_pipeline(question: str, contract_text: str = None, on_stage=None, completed_stages=None):
+    """
+    Borrow a crew from the pool and run the full pipeline. Blocking; runs on the pipeline executor.
+    """
+    with get_pipeline_metrics().stage("pipeline", contract=bool(contract_text), resumed=bool(completed_stages)):
+        with crew_pool.acquire() as legal_crew:
+            return str(legal_crew.process_question(
+                question, contract_text=contract_text, on_stage=on_stage, completed_stages=completed_stages))
+
 class MessageRequest(BaseModel):
     message: str
 
@@ -29,6 +134,125 @@ class LegalQuestion(BaseModel):
     question: str
     contract_text: str | None = None
 
+class BatchItem(BaseModel):
+    id: str | None = None
+    question: str
+    contract_text: str | None = None
+
+class LegalBatch(BaseModel):
+    items: List[BatchItem]
+
+async def compute_legal_advice(cache_key: str, context_key: str, question: str, contract_text: str = None,
+                               on_stage=None, completed_stages=None) -> str:
+    """
+    Run the pipeline for a question and cache the result. Concurrent identical
+    requests share one run through single_flight.
+    """
+    result = await pipeline_executor.run(run_legal_pipeline, question, contract_text, on_stage, completed_stages)
+    # Errors are not cached so the next request gets a fresh attempt
+    if not result.startswith("Error:"):
+        response_cache.set(cache_key, result)
+        if semantic_cache is not None:
+            await asyncio.to_thread(semantic_cache.store, question, context_key, result)
+    return result
+
+async def resolve_legal_advice(question: str, contract_text: str = None, on_stage=None, completed_stages=None) -> str:
+    """
+    Answer from the response or semantic cache, join an identical pipeline already in
+    flight, or run the pipeline. on_stage only receives stage events when this call
+    starts the pipeline itself.
+    """
+    cache_key = response_cache.make_key(question, contract_text)
+    context_key = response_cache.context_key(contract_text)
+    metrics = get_pipeline_metrics()
+    result = response_cache.get(cache_key)
+    metrics.record_cache("response", result is not None)
+    if result is not None:
+        logger.info("Legal advice served from response cache")
+    elif semantic_cache is not None:
+        # Embedding the question is CPU work; keep it off the event loop
+        result = await asyncio.to_thread(semantic_cache.lookup, question, context_key)
+        metrics.record_cache("semantic", result is not None)
+        if result is not None:
+            logger.info("Legal advice served from semantic cache")
+            response_cache.set(cache_key, result)
+    if result is None:
+        metrics.record_cache("single_flight", single_flight.in_flight(cache_key))
+        result = await single_flight.do(
+            cache_key, lambda: compute_legal_advice(cache_key, context_key, question, contract_text, on_stage, completed_stages)
+        )
+    return result
+
+def legal_advice_response(result: str) -> dict:
+    # Check if we need the contract
+    if "CONTRACT_NEEDED" in result:
+        return {
+            "status": "contract_needed",
+            "message": result
+        }
+
+    return {
+        "status": "success",
+        "result": result
+    }
+
+def start_job(job_id: str):
+    """Run a job in the background unless it is already running in this process."""
+    if job_id in active_jobs:
+        return
+    task = asyncio.ensure_future(run_job(job_id))
+    active_jobs[job_id] = task
+    task.add_done_callback(lambda done: active_jobs.pop(job_id, None))
+
+async def run_job(job_id: str):
+    """
+    Run a job's pipeline, persisting every stage result as it arrives. Stages the
+    job already completed in an earlier attempt are reused, not recomputed.
+    """
+    job = job_store.get_job(job_id, include_stages=False)
+    completed_stages = job_store.stage_results(job_id)
+    if completed_stages:
+        logger.info(f"Resuming job {job_id} with {len(completed_stages)} completed stage(s)")
+
+    def on_stage(event: dict):
+        # Called from pipeline threads
+        job_store.add_stage(job_id, event)
+
+    while True:
+        job_store.mark_running(job_id)
+        try:
+            result = await resolve_legal_advice(job["question"], job["contract_text"], on_stage, completed_stages)
+        except PipelineSaturatedError as e:
+            # Background jobs wait for capacity instead of being shed
+            logger.info(f"Pipeline saturated, job {job_id} retries in {e.retry_after}s")
+            job_store.mark_queued(job_id)
+            await asyncio.sleep(e.retry_after)
+            continue
+        except Exception as e:
+            logger.error(f"Error processing job {job_id}: {str(e)}", exc_info=True)
+            job_store.mark_failed(job_id, str(e))
+            return
+        job_store.mark_completed(job_id, result)
+        logger.info(f"Job {job_id} completed")
+        return
+
+def job_response(job: dict, since: int = 0) -> dict:
+    response = {
+        "status": "success",
+        "job_id": job["id"],
+        "job_status": job["status"],
+        "stage_count": len(job["stages"]),
+        "stages": job["stages"][since:]
+    }
+    if job["status"] == COMPLETED:
+        response["advice"] = legal_advice_response(job["result"])
+    elif job["status"] == FAILED:
+        response["message"] = job["error"]
+    return response
+
+def job_not_found(job_id: str) -> JSONResponse:
+    return JSONResponse(status_code=404, content={"status": "error", "message": f"Job {job_id} not found"})
+
 @app.get("/")
 async def root():
     return {"message": "Hello from the API!"}
@@ -50,22 +274,29 @@ async def receive_message_with_files(
     files: List[UploadFile] = File(...)
 ):
     """
-    Endpoint to receive a message with one or more files
-    """
-    # Process the files
-    file_details = []
-    for file in files:
-        file_details.append({
-            "filename": file.filename,
-            "content_type": file.content_type,
-            "size": 0  # You might want to add actual file size here
-        })
-    
+    Endpoint to receive a message with one or more files. Files are stored and their
+    text is extracted (PDF, DOCX or plain text), ready for contract analysis.
+    """
+    try:
+        ingested = await asyncio.gather(*(contract_ingestion.ingest(file) for file in files))
+    except (UploadTooLargeError, UnsupportedDocumentError) as e:
+        return JSONResponse(status_code=e.status_code, content={"status": "error", "message": str(e)})
+
     return {
         "status": "success",
         "message": message,
-        "files": file_details,
-        "received_at": "timestamp"  # You might want to add actual timestamp here
+        "files": [uploaded_file_details(file) for file in ingested],
+        "received_at": datetime.now(timezone.utc).isoformat()
+    }
+
+def uploaded_file_details(ingested: dict) -> dict:
+    return {
+        "filename": ingested["filename"],
+        "content_type": ingested["content_type"],
+        "size": ingested["size"],
+        "sha256": ingested["sha256"],
+        "kind": ingested["kind"],
+        "characters": len(ingested["text"])
     }
 
 @app.get("/ai-explanation")
@@ -92,28 +323,276 @@ async def get_legal_advice(request: LegalQuestion):
     """
     try:
         logger.info(f"Received legal advice request: {request.question}")
-        legal_crew = LegalCrew()
-        result = legal_crew.process_question(request.question)
+        result = await resolve_legal_advice(request.question, request.contract_text)
         logger.info(f"Legal advice response: {result}")
-
-        # Check if we need the contract
-        if "CONTRACT_NEEDED" in result:
-            return {
-                "status": "contract_needed",
-                "message": result
-            }
-
+        return legal_advice_response(result)
+    except PipelineSaturatedError as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"status": "error", "message": str(e)},
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except Exception as e:
+        logger.error(f"Error processing legal advice request: {str(e)}", exc_info=True)
         return {
-            "status": "success",
-            "result": result
+            "status": "error",
+            "message": str(e)
         }
+
+@app.post("/legal-advice/upload")
+async def get_legal_advice_for_upload(
+    question: str = Form(...),
+    files: List[UploadFile] = File(...)
+):
+    """
+    Legal advice on uploaded contract documents (PDF, DOCX or plain text). The files
+    are streamed to disk, their text is extracted off the API workers and the
+    combined text goes through the contract-analysis path.
+    """
+    try:
+        logger.info(f"Received legal advice upload with {len(files)} file(s): {question}")
+        ingested = await asyncio.gather(*(contract_ingestion.ingest(file) for file in files))
+        contract_text = "\n\n".join(file["text"].strip() for file in ingested if file["text"].strip())
+        if not contract_text:
+            return JSONResponse(
+                status_code=422,
+                content={"status": "error", "message": "No text could be extracted from the uploaded files"}
+            )
+        result = await resolve_legal_advice(question, contract_text)
+        return {**legal_advice_response(result), "files": [uploaded_file_details(file) for file in ingested]}
+    except (UploadTooLargeError, UnsupportedDocumentError) as e:
+        return JSONResponse(status_code=e.status_code, content={"status": "error", "message": str(e)})
+    except PipelineSaturatedError as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"status": "error", "message": str(e)},
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
-        logger.error(f"Error processing legal advice request: {str(e)}", exc_info=True)
+        logger.error(f"Error processing legal advice upload: {str(e)}", exc_info=True)
         return {
             "status": "error",
             "message": str(e)
         }
 
+@app.post("/legal-advice/stream")
+async def stream_legal_advice(request: LegalQuestion):
+    """
+    Streaming variant of /legal-advice. Responds with newline-delimited JSON: one
+    {"event": "stage", ...} line per pipeline stage as soon as it finishes (easy
+    answer, law selection, rent analysis, each argument and judge vote), then a
+    final {"event": "result", ...} or {"event": "error", ...} line.
+    """
+    logger.info(f"Received streaming legal advice request: {request.question}")
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def on_stage(event: dict):
+        # Called from pipeline threads
+        loop.call_soon_threadsafe(events.put_nowait, {"event": "stage", **event})
+
+    async def run_pipeline():
+        try:
+            result = await resolve_legal_advice(request.question, request.contract_text, on_stage)
+            await events.put({"event": "result", **legal_advice_response(result)})
+        except PipelineSaturatedError as e:
+            await events.put({"event": "error", "status": "error", "message": str(e),
+                              "status_code": e.status_code, "retry_after": e.retry_after})
+        except Exception as e:
+            logger.error(f"Error processing streaming legal advice request: {str(e)}", exc_info=True)
+            await events.put({"event": "error", "status": "error", "message": str(e)})
+        finally:
+            await events.put(None)
+
+    async def event_stream():
+        pipeline_task = asyncio.ensure_future(run_pipeline())
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield json.dumps(event) + "\n"
+        finally:
+            # Client went away: stop waiting. The pipeline itself keeps running and its result is cached
+            if not pipeline_task.done():
+                pipeline_task.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/legal-advice/batch")
+async def batch_legal_advice(request: LegalBatch):
+    """
+    Check many questions and contracts in one request. Identical items are answered
+    once, rent increases with clear amounts are computed for the whole batch in one
+    vectorized pass, and the rest share the pipeline's concurrency limits.
+
+    Responds with newline-delimited JSON: one {"event": "item", ...} line per item
+    as soon as its answer is available, then a {"event": "summary", ...} line.
+    """
+    max_items = int(os.getenv('LEGAL_BATCH_MAX_ITEMS', DEFAULT_BATCH_MAX_ITEMS))
+    if len(request.items) > max_items:
+        return JSONResponse(
+            status_code=413,
+            content={"status": "error", "message": f"A batch may contain at most {max_items} items"}
+        )
+    logger.info(f"Received legal advice batch with {len(request.items)} items")
+
+    # Items with the same cache key get the same answer; keep the positions of each
+    positions_by_key = {}
+    for position, item in enumerate(request.items):
+        key = response_cache.make_key(item.question, item.contract_text)
+        positions_by_key.setdefault(key, []).append(position)
+    unique = {key: request.items[positions[0]] for key, positions in positions_by_key.items()}
+
+    # Contracts always go to the contract analyzer, so only plain questions can take the fast path
+    fast_keys = [key for key, item in unique.items() if not item.contract_text]
+    fast_answers = dict(zip(fast_keys, rent_fast_path.answer_batch([unique[key].question for key in fast_keys])))
+    pipeline_keys = [key for key in unique if fast_answers.get(key) is None]
+    async def resolve_item(key: str):
+        item = unique[key]
+        async with batch_slots:
+            while True:
+                try:
+                    return key, await resolve_legal_advice(item.question, item.contract_text), None
+                except PipelineSaturatedError as e:
+                    # Batch items wait for capacity instead of failing
+                    await asyncio.sleep(e.retry_after)
+                except Exception as e:
+                    logger.error(f"Error processing batch item: {str(e)}", exc_info=True)
+                    return key, None, str(e)
+
+    def item_events(key: str, source: str, result: str = None, error: str = None):
+        for position in positions_by_key[key]:
+            event = {"event": "item", "index": position, "id": request.items[position].id, "source": source}
+            if error is not None:
+                event.update({"status": "error", "message": error})
+            else:
+                event.update(legal_advice_response(result))
+            yield json.dumps(event) + "\n"
+
+    async def result_stream():
+        errors = 0
+        for key in fast_keys:
+            if fast_answers[key] is not None:
+                for line in item_events(key, "fast_path", fast_answers[key]):
+                    yield line
+
+        tasks = [asyncio.ensure_future(resolve_item(key)) for key in pipeline_keys]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                key, result, error = await next_done
+                errors += error is not None
+                for line in item_events(key, "pipeline", result, error):
+                    yield line
+        finally:
+            # Client went away: stop scheduling the rest of the batch
+            for task in tasks:
+                task.cancel()
+
+        yield json.dumps({
+            "event": "summary",
+            "items": len(request.items),
+            "unique": len(unique),
+            "fast_path": len(unique) - len(pipeline_keys),
+            "pipeline": len(pipeline_keys),
+            "errors": errors
+        }) + "\n"
+
+    return StreamingResponse(
+        result_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/legal-advice/jobs", status_code=202)
+async def submit_legal_advice_job(request: LegalQuestion):
+    """
+    Submit a legal advice request as a background job. Returns the job id
+    immediately; poll GET /legal-advice/jobs/{job_id} for progress and the result.
+    """
+    logger.info(f"Received legal advice job: {request.question}")
+    job_id = job_store.create_job(request.question, request.contract_text)
+    start_job(job_id)
+    return job_response(job_store.get_job(job_id))
+
+@app.get("/legal-advice/jobs/{job_id}")
+async def get_legal_advice_job(job_id: str, since: int = 0):
+    """
+    Poll a job: its status, the stage results so far (from index since onwards)
+    and, once completed, the advice in the same shape /legal-advice returns.
+    """
+    job = job_store.get_job(job_id)
+    if job is None:
+        return job_not_found(job_id)
+    return job_response(job, since)
+
+@app.post("/legal-advice/jobs/{job_id}/resume", status_code=202)
+async def resume_legal_advice_job(job_id: str):
+    """
+    Restart a failed or interrupted job. Stages it already completed are reused.
+    """
+    job = job_store.get_job(job_id)
+    if job is None:
+        return job_not_found(job_id)
+    if job["status"] != COMPLETED:
+        start_job(job_id)
+    return job_response(job_store.get_job(job_id))
+
+@app.post("/laws/refresh")
+async def refresh_laws():
+    """
+    Ingest changes to the BWB files in backend/laws without a restart. Only new or
+    changed files are parsed, and only the affected laws are reloaded and reindexed.
+    """
+    report = await asyncio.to_thread(refresh_law_corpus)
+    return {
+        "status": "success",
+        "corpus_version": report["manifest"]["corpus_version"],
+        "parsed": report["parsed"],
+        "removed": report["removed"],
+        "unchanged": report["unchanged"],
+        "affected_laws": report["affected_laws"],
+        "seconds": round(report["seconds"], 3)
+    }
+
+@app.get("/pipeline-stats")
+async def get_pipeline_stats():
+    """
+    Endpoint to inspect pipeline load: in-flight runs, queue depth and shed requests
+    """
+    return {
+        "status": "success",
+        "pipeline": pipeline_executor.stats(),
+        "crew_pool": crew_pool.stats(),
+        "response_cache": response_cache.stats(),
+        "single_flight": single_flight.stats(),
+        "semantic_cache": semantic_cache.stats() if semantic_cache is not None else {"enabled": False},
+        "jobs": {**job_store.stats(), "active": len(active_jobs)},
+        "speculation": get_speculation_stats().stats(),
+        "contract_ingestion": contract_ingestion.stats(),
+        "clause_cache": get_clause_cache().stats(),
+        "clause_single_flight": get_clause_flight().stats()
+    }
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Per-stage latency and token histograms, cache lookups and pipeline load in the
+    Prometheus text format
+    """
+    pipeline = pipeline_executor.stats()
+    pool = crew_pool.stats()
+    gauges = {
+        "legal_pipeline_in_flight": ("Pipelines running.", pipeline["in_flight"]),
+        "legal_pipeline_queue_depth": ("Requests waiting for a pipeline slot.", pipeline["queue_depth"]),
+        "legal_crew_pool_available": ("Crews available in the pool.", pool["available"]),
+    }
+    return Response(content=get_pipeline_metrics().render(gauges), media_type=PROMETHEUS_CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
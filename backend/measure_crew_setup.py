@@ -0,0 +1,53 @@
+import time
+import tracemalloc
+import logging
+from legal_crew.legal_crew import LegalCrew
+from legal_crew.crew_pool import LegalCrewPool
+
+def measure_crew_setup(requests: int = 20, pool_size: int = 4):
+    """
+    Compare the per-request setup cost of building a fresh LegalCrew (the old
+    /legal-advice behaviour) with borrowing one from a LegalCrewPool.
+    No LLM calls are made; only agent/tool construction is measured.
+    """
+    # Keep the crew's INFO logging out of the timings
+    logging.disable(logging.INFO)
+
+    print(f"Measuring setup overhead over {requests} simulated requests")
+
+    # Fresh crew per request
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(requests):
+        LegalCrew()
+    fresh_seconds = time.perf_counter() - start
+    _, fresh_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Pooled crews: build cost is paid once at startup
+    pool = LegalCrewPool(size=pool_size)
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(requests):
+        with pool.acquire():
+            pass
+    pooled_seconds = time.perf_counter() - start
+    _, pooled_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"\nFresh LegalCrew per request:")
+    print(f"- Total: {fresh_seconds * 1000:.1f} ms")
+    print(f"- Per request: {fresh_seconds / requests * 1000:.3f} ms")
+    print(f"- Peak traced memory: {fresh_peak / 1024:.0f} KiB")
+
+    print(f"\nPooled LegalCrew (pool of {pool_size}):")
+    print(f"- One-off build at startup: {pool.build_seconds * 1000:.1f} ms")
+    print(f"- Total: {pooled_seconds * 1000:.3f} ms")
+    print(f"- Per request: {pooled_seconds / requests * 1000:.4f} ms")
+    print(f"- Peak traced memory: {pooled_peak / 1024:.0f} KiB")
+
+    saved = (fresh_seconds - pooled_seconds) / requests * 1000
+    print(f"\nSetup overhead removed per request: {saved:.3f} ms")
+
+if __name__ == "__main__":
+    measure_crew_setup()
@@ -0,0 +1,6 @@
+import os
+
+# Build crews offline; no test talks to the LLM. Set before legal_crew is imported
+os.environ.setdefault('GEMINI_API_KEY', 'offline-tests')
+os.environ.setdefault('CREWAI_DISABLE_TELEMETRY', 'true')
+os.environ.setdefault('OTEL_SDK_DISABLED', 'true')
@@ -0,0 +1,74 @@
+import threading
+import time
+import pytest
+from legal_crew.contract_clauses import (
+    clause_cache_text, get_clause_cache, has_issues, merge_clause_findings, segment_clauses)
+from legal_crew.legal_crew import LegalCrew
+
+CONTRACT = """Artikel 1 Het gehuurde
+1.1 Verhuurder verhuurt aan huurder de woning.
+
+Artikel 2 Huurprijs
+2.1 De huurprijs bedraagt EUR 900 per maand.
+2.2 De huurprijs wordt jaarlijks verhoogd met 15%.
+"""
+
+
+def test_segment_clauses():
+    clauses = segment_clauses(CONTRACT)
+    assert [clause['label'] for clause in clauses] == ["Artikel 1 Het gehuurde", "Artikel 2 Huurprijs"]
+    assert "15%" in clauses[1]['text']
+
+
+def test_clause_cache_text_ignores_numbering():
+    assert clause_cache_text("Artikel 7 Huur\n7.1 Tekst") == clause_cache_text("Artikel 3 Huur\n3.1 Tekst")
+
+
+@pytest.mark.parametrize("finding, expected", [
+    ("NO_ISSUES", False),
+    ("no_issues", False),
+    ("**NO_ISSUES**", False),
+    ("`NO_ISSUES`", False),
+    ("- NO_ISSUES", False),
+    ("The annual increase of 15% exceeds the legal maximum.", True),
+])
+def test_has_issues(finding, expected):
+    assert has_issues(finding) is expected
+
+
+def test_merge_clause_findings():
+    clauses = segment_clauses(CONTRACT)
+    report = merge_clause_findings(clauses, ["**NO_ISSUES**", "The increase exceeds the legal maximum."])
+    assert report.startswith("Contract analysis of 2 clause(s): 1 with potential issues.")
+    assert "### Artikel 2 Huurprijs" in report
+    assert "Artikel 1" not in report
+
+
+def test_concurrent_requests_analyse_a_clause_once():
+    get_clause_cache().clear()
+    calls = []
+    lock = threading.Lock()
+
+    def kickoff(agent, task, stage):
+        with lock:
+            calls.append(task.description)
+        time.sleep(0.2)
+        return "NO_ISSUES"
+
+    crews = [LegalCrew(concurrent_stages=True) for _ in range(2)]
+    for crew in crews:
+        crew._kickoff = kickoff
+    reports = [None, None]
+
+    def analyse(index):
+        reports[index] = crews[index]._analyze_clauses(segment_clauses(CONTRACT))
+
+    threads = [threading.Thread(target=analyse, args=(index,)) for index in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    assert len(calls) == len(segment_clauses(CONTRACT))
+    assert reports[0] == reports[1]
+    assert "0 with potential issues" in reports[0]
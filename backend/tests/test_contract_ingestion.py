@@ -0,0 +1,104 @@
+import asyncio
+import io
+import os
+import time
+import httpx
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from starlette.datastructures import Headers, UploadFile as StarletteUploadFile
+from legal_crew.contract_ingestion import ContractIngestion, UploadSizeLimitMiddleware
+
+LIMIT = 1000
+
+
+def upload_app():
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, paths=["/upload"], max_bytes=LIMIT)
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"status": "success", "size": len(await file.read())}
+
+    @app.post("/other")
+    async def other(file: UploadFile = File(...)):
+        return {"status": "success", "size": len(await file.read())}
+
+    return app
+
+
+def multipart(size: int) -> tuple:
+    boundary = "test-boundary"
+    body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"contract.txt\"\r\n"
+            f"Content-Type: text/plain\r\n\r\n").encode() + b"x" * size + f"\r\n--{boundary}--\r\n".encode()
+    return body, {"content-type": f"multipart/form-data; boundary={boundary}"}
+
+
+def post(path: str, size: int, chunked: bool = False) -> httpx.Response:
+    body, headers = multipart(size)
+
+    async def chunks():
+        for start in range(0, len(body), 256):
+            yield body[start:start + 256]
+
+    async def send():
+        transport = httpx.ASGITransport(app=upload_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, content=chunks() if chunked else body, headers=headers)
+
+    return asyncio.run(send())
+
+
+def test_small_upload_passes():
+    response = post("/upload", 100)
+    assert response.status_code == 200
+    assert response.json() == {"status": "success", "size": 100}
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_oversized_upload_is_refused(chunked):
+    response = post("/upload", 5000, chunked=chunked)
+    assert response.status_code == 413
+    assert response.json() == {"status": "error", "message": f"Upload exceeds the limit of {LIMIT} bytes"}
+
+
+def test_other_paths_are_not_limited():
+    assert post("/other", 5000, chunked=True).status_code == 200
+
+
+@pytest.fixture
+def ingestion(tmp_path):
+    ingestion = ContractIngestion(upload_dir=tmp_path, workers=1)
+    yield ingestion
+    ingestion.shutdown()
+
+
+def text_upload(text: str) -> StarletteUploadFile:
+    return StarletteUploadFile(io.BytesIO(text.encode('utf-8')), filename="contract.txt",
+                               headers=Headers({"content-type": "text/plain"}))
+
+
+def test_identical_upload_is_extracted_once(ingestion):
+    async def ingest_twice():
+        first = await ingestion.ingest(text_upload("Artikel 1 Het gehuurde"))
+        second = await ingestion.ingest(text_upload("Artikel 1 Het gehuurde"))
+        return first, second
+
+    first, second = asyncio.run(ingest_twice())
+    assert first["text"] == second["text"] == "Artikel 1 Het gehuurde"
+    assert first["sha256"] == second["sha256"]
+    stats = ingestion.stats()
+    assert stats["extractions"] == 1
+    assert stats["text_cache_hits"] == 1
+
+
+def test_prune_deletes_only_expired_uploads(ingestion):
+    stored = asyncio.run(ingestion.ingest(text_upload("Artikel 1 Het gehuurde")))
+    old = ingestion.upload_dir / 'files' / 'old'
+    old.write_bytes(b"old contract")
+    two_days_ago = time.time() - 2 * 24 * 60 * 60
+    os.utime(old, (two_days_ago, two_days_ago))
+
+    assert ingestion.prune(retention_seconds=24 * 60 * 60) == 1
+    assert not old.exists()
+    assert os.path.exists(stored["path"])
+    assert ingestion.stats()["pruned_files"] == 1
@@ -0,0 +1,23 @@
+from datetime import date
+from legal_crew.indicator_store import IndicatorStore, INDICATORS_PATH
+
+
+def test_shipped_series_values_by_date():
+    store = IndicatorStore(INDICATORS_PATH)
+    # The 2022 CPI applies to the increases of 1 July 2023, until the next year's figure
+    assert store.value_on('cpi', date(2023, 7, 1)) == 10.0
+    assert store.value_on('cpi', date(2024, 6, 30)) == 10.0
+    assert store.value_on('cpi', date(2024, 7, 1)) == 3.8
+    assert store.value_on('cao', date(2024, 7, 1)) == 6.1
+    assert store.effective_date('cpi', date(2024, 12, 1)) == date(2024, 7, 1)
+    assert store.value_on('cpi', date(2015, 1, 1)) is None
+
+
+def test_covers_only_the_year_after_a_value(tmp_path):
+    indicators = tmp_path / 'indicators.csv'
+    indicators.write_text("indicator,effective_date,value\ncpi,2023-07-01,10.0\n", encoding='utf-8')
+    store = IndicatorStore(indicators)
+    assert store.covers('cpi', date(2024, 6, 30))
+    assert not store.covers('cpi', date(2024, 7, 2))
+    assert not store.covers('cpi', date(2023, 6, 30))
+    assert not store.covers('cao', date(2024, 1, 1))
@@ -0,0 +1,62 @@
+import pytest
+from legal_crew.law_catalogue import TitleCatalogue, build_title_catalogue, normalize_title, title_aliases
+
+LAWS = {
+    'BWBR0003221': {'citeertitel': 'Huurprijzenwet woonruimte', 'intitule': ''},
+    'BWBR0014315': {'citeertitel': 'Uitvoeringswet huurprijzen woonruimte', 'intitule': ''},
+    'BWBR0003237': {'citeertitel': 'Besluit huurprijzen woonruimte', 'intitule': ''},
+    'BWBR0014931': {'citeertitel': 'Besluit kleine herstellingen', 'intitule': ''},
+    'BWBR0014932': {'citeertitel': 'Besluit servicekosten', 'intitule': ''},
+    'BWBR0005288': {'citeertitel': 'Burgerlijk Wetboek Boek 5', 'intitule': 'Burgerlijk Wetboek Boek 5, Zakelijke rechten'},
+    'BWBR0005290': {'citeertitel': 'Burgerlijk Wetboek Boek 7', 'intitule': ''},
+    'BWBR0035303': {'citeertitel': 'Huisvestingswet 2014', 'intitule': ''},
+}
+
+
+@pytest.fixture(scope='module')
+def catalogue():
+    return TitleCatalogue(build_title_catalogue(LAWS))
+
+
+def test_normalize_title():
+    assert normalize_title("  'Huurprijzenwet  Woonruimte'. ") == 'huurprijzenwet woonruimte'
+
+
+def test_title_aliases():
+    assert title_aliases('Huurprijzenwet woonruimte') == ['hpw', 'huurprijzenwet']
+    assert 'bw boek 7' in title_aliases('Burgerlijk Wetboek Boek 7')
+    assert title_aliases('Huisvestingswet 2014') == ['hvw 2014', 'huisvestingswet']
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("Huurprijzenwet woonruimte", 'BWBR0003221'),
+    ("Huurprijzenwet", 'BWBR0003221'),
+    ("Hpw", 'BWBR0003221'),
+    ("Besluit huurprijzen", 'BWBR0003237'),
+    ("BWBR0014315", 'BWBR0014315'),
+    ("Burgerlijk Wetboek Boek 5, Zakelijke rechten", 'BWBR0005288'),
+    ("BW Boek 7", 'BWBR0005290'),
+    ("Huisvestingswet", 'BWBR0035303'),
+    # Leading words of exactly one title
+    ("Uitvoeringswet", 'BWBR0014315'),
+    # Small spelling differences
+    ("Huurprijzenwet woonruimten", 'BWBR0003221'),
+    ("Besluit kleine herstelingen", 'BWBR0014931'),
+    # A truncated long title
+    ("Besluit kleine herstel", 'BWBR0014931'),
+])
+def test_resolve(catalogue, title, expected):
+    assert catalogue.resolve(title) == expected
+
+
+@pytest.mark.parametrize("title", [
+    # Leading words of several titles
+    "Besluit",
+    "Burgerlijk Wetboek",
+    # A book number the catalogue does not have
+    "Burgerlijk Wetboek Boek 6",
+    "Wet op de huurtoeslag",
+    "",
+])
+def test_resolve_unknown_or_ambiguous(catalogue, title):
+    assert catalogue.resolve(title) is None
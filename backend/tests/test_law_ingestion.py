@@ -0,0 +1,34 @@
+import json
+import shutil
+import threading
+from pathlib import Path
+from legal_crew.article_store import LAWS_DIR, MANIFEST_NAME
+from legal_crew.law_ingestion import ingest_laws
+
+
+def test_concurrent_ingests_do_not_collide(tmp_path):
+    laws_dir, store_dir = tmp_path / 'laws', tmp_path / 'store'
+    laws_dir.mkdir()
+    # The smallest laws keep the test fast
+    for path in sorted(Path(LAWS_DIR).glob('BWBR*.xml'), key=lambda path: path.stat().st_size)[:5]:
+        shutil.copy(path, laws_dir / path.name)
+
+    errors, reports = [], []
+
+    def ingest():
+        try:
+            reports.append(ingest_laws(laws_dir, store_dir, full=True, workers=1))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=ingest) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    assert errors == []
+    assert len(reports) == 8
+    manifest = json.loads((store_dir / MANIFEST_NAME).read_text(encoding='utf-8'))
+    assert sorted(manifest['files']) == sorted(path.name for path in laws_dir.iterdir())
+    assert not list(store_dir.glob('*.tmp'))
@@ -0,0 +1,104 @@
+import pytest
+from datetime import date
+from legal_crew.cpi_tool import CPITool
+from legal_crew.indicator_store import IndicatorStore
+from legal_crew.rent_fast_path import RentIncreaseFastPath, parse_number
+
+
+@pytest.fixture
+def fast_path(tmp_path):
+    # CPI 3% makes the legal limit 4%; the 2000 row stands in for every year up to the current one
+    indicators = tmp_path / 'indicators.csv'
+    indicators.write_text("indicator,effective_date,value\ncpi,2000-01-01,2.0\n"
+                          f"cpi,{date.today().isoformat()},3.0\ncao,{date.today().isoformat()},3.0\n", encoding='utf-8')
+    return RentIncreaseFastPath(cpi_tool=CPITool(IndicatorStore(indicators)))
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("800", 800.0),
+    ("1.200,50", 1200.5),
+    ("1,200.50", 1200.5),
+    ("1.200", 1200.0),
+    ("3,5", 3.5),
+    ("1.2.3", None),
+])
+def test_parse_number(text, expected):
+    assert parse_number(text) == expected
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("My landlord announced a rent increase from €900 to €990 per month. Is that legal?",
+     {'current': 900.0, 'proposed': 990.0, 'percentage': None}),
+    ("Is my rent increase from 900 euro to 990 euro allowed?",
+     {'current': 900.0, 'proposed': 990.0, 'percentage': None}),
+    # An increase of an amount is a delta on the current rent, not the current rent
+    ("Is a rent increase of €50 on my rent of €800 legal?",
+     {'current': 800.0, 'proposed': 850.0, 'percentage': None}),
+    # "to €840" is the proposed rent
+    ("Is a rent increase of 5% to €840 legal?",
+     {'current': None, 'proposed': 840.0, 'percentage': 5.0}),
+    ("I pay €800, is a rent increase of 5% legal?",
+     {'current': 800.0, 'proposed': None, 'percentage': 5.0}),
+    ("My current rent is €1.200,50 and the new rent will be €1.250. Is this rent increase legal?",
+     {'current': 1200.5, 'proposed': 1250.0, 'percentage': None}),
+    ("Is a rent increase of 3% legal?",
+     {'current': None, 'proposed': None, 'percentage': 3.0}),
+])
+def test_extract_with_explicit_cues(fast_path, question, expected):
+    assert fast_path.extract(question) == expected
+
+
+@pytest.mark.parametrize("question", [
+    # Two amounts without cues could be either way round
+    "Rent increase: €800 and €850, is that legal?",
+    # An amount next to a percentage without a cue
+    "Is a rent increase of 5% on €800 legal?",
+    "Is a rent increase of €40 extra legal?",
+    "Is a rent increase of 3% or 4% legal?",
+    "Can my landlord do a rent increase twice a year? It was 3% in January, is that legal?",
+    "Is a rent increase of 5% legal in the free sector?",
+])
+def test_extract_ambiguous(fast_path, question):
+    assert fast_path.extract(question) is None
+
+
+def test_answer_batch(fast_path):
+    answers = fast_path.answer_batch([
+        "Is a rent increase of €50 on my rent of €800 legal?",
+        "Is a rent increase of 5% to €840 legal?",
+        "My landlord announced a rent increase from €900 to €930. Is that legal?",
+        # Not asking whether the increase is legal
+        "Can my landlord do a rent increase twice a year? It was 3% in January",
+        "When does a rent increase of 3% take effect?",
+        "Rent increase: €800 and €850, is that legal?",
+        "Can my landlord evict me?",
+        # Social housing has its own maximum increases
+        "My housing association announced a rent increase from €700 to €720. Is that legal?",
+    ])
+
+    assert "- Increase: 6.25%" in answers[0]
+    assert "This rent increase is illegal" in answers[0]
+    assert "- Current rent" not in answers[1]
+    assert "- Proposed rent: €840.00" in answers[1]
+    assert "This rent increase is illegal" in answers[1]
+    assert "- Increase: 3.33%" in answers[2]
+    assert "This rent increase is legal" in answers[2]
+    assert answers[3:] == [None, None, None, None, None]
+
+
+def test_answer_matches_answer_batch(fast_path):
+    question = "Is a rent increase of 3% legal?"
+    assert fast_path.answer(question) == fast_path.answer_batch([question])[0]
+    assert "This rent increase is legal" in fast_path.answer(question)
+
+
+def test_no_verdict_without_a_published_figure(fast_path, tmp_path):
+    # The fixture only has a figure from 2000 in force in 2024, a stand-in
+    assert fast_path.answer("Is a rent increase of 3% on 1 July 2024 legal?") is None
+
+    indicators = tmp_path / 'published.csv'
+    indicators.write_text("indicator,effective_date,value\ncpi,2000-01-01,3.0\ncpi,2024-07-01,3.0\n", encoding='utf-8')
+    published = RentIncreaseFastPath(cpi_tool=CPITool(IndicatorStore(indicators)))
+    answer = published.answer("Is a rent increase of 3% on 1 July 2024 legal?")
+    assert "- Maximum legal increase on 2024-07-01: 4.00%" in answer
+    assert "This rent increase is legal" in answer
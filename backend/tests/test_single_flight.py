@@ -0,0 +1,27 @@
+import threading
+import pytest
+from legal_crew.single_flight import ThreadSingleFlight
+
+
+def test_second_claim_waits_for_the_first():
+    flight = ThreadSingleFlight()
+    future, owner = flight.claim("clause")
+    joined, joined_owner = flight.claim("clause")
+    assert owner and not joined_owner
+    assert joined is future
+
+    threading.Timer(0.05, future.set_result, args=("NO_ISSUES",)).start()
+    assert joined.result(timeout=5) == "NO_ISSUES"
+    assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 1}
+
+
+def test_key_can_be_claimed_again_after_failure():
+    flight = ThreadSingleFlight()
+    future, _ = flight.claim("clause")
+    joined, _ = flight.claim("clause")
+    future.set_exception(RuntimeError("analysis failed"))
+    with pytest.raises(RuntimeError):
+        joined.result(timeout=5)
+
+    _, owner = flight.claim("clause")
+    assert owner
@@ -0,0 +1,46 @@
+import threading
+import pytest
+from legal_crew.crew_pool import LegalCrewPool
+from legal_crew.legal_crew import LegalCrew
+from legal_crew.stage_runner import run_stages_concurrently
+
+
+def failing_and_running_stages():
+    """A stage that fails while its sibling is still running, and the event that lets the sibling finish."""
+    started, release = threading.Event(), threading.Event()
+
+    def running():
+        started.set()
+        release.wait(timeout=10)
+        return "done"
+
+    def failing():
+        started.wait(timeout=10)
+        raise RuntimeError("stage failed")
+
+    return {"running": running, "failing": failing}, release
+
+
+def test_failed_stage_reports_running_siblings():
+    stages, release = failing_and_running_stages()
+    with pytest.raises(RuntimeError) as excinfo:
+        run_stages_concurrently(stages)
+
+    abandoned = excinfo.value.abandoned_stages
+    assert len(abandoned) == 1
+    assert not abandoned[0].done()
+    release.set()
+    assert abandoned[0].result(timeout=10) == "done"
+
+
+def test_crew_is_not_reused_while_a_failed_stage_sibling_runs():
+    pool = LegalCrewPool(size=1, crew_factory=lambda: LegalCrew(concurrent_stages=True))
+    stages, release = failing_and_running_stages()
+    with pytest.raises(RuntimeError):
+        with pool.acquire() as crew:
+            crew._run_stages(stages)
+
+    assert pool.stats()["available"] == 0
+    release.set()
+    with pool.acquire(timeout=10) as reacquired:
+        assert reacquired is crew
@@ -0,0 +1,49 @@
+import pytest
+from legal_crew.voting_tracker import Vote, VotingTracker, parse_vote
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("obviously_tenant", Vote.OBVIOUSLY_TENANT),
+    ("  Most_Likely_Landlord\n", Vote.MOST_LIKELY_LANDLORD),
+    # The first option mentioned wins, not the first in enum order
+    ("Vote: most_likely_landlord. The tenant's claim that this is obviously_tenant is overstated.",
+     Vote.MOST_LIKELY_LANDLORD),
+    ("not_sure, although it is not obviously_landlord", Vote.NOT_SURE),
+    ("I cannot decide.", None),
+])
+def test_parse_vote(text, expected):
+    assert parse_vote(text) == expected
+
+
+def tracker_with(votes, round_number=1):
+    tracker = VotingTracker()
+    for _ in range(round_number):
+        tracker.start_new_round()
+    for index, vote in enumerate(votes):
+        tracker.record_vote(f"judge {index}", vote)
+    return tracker
+
+
+@pytest.mark.parametrize("votes, round_number, remaining, decided", [
+    # Round one needs 3 obvious votes, or 2 obvious and 1 likely
+    ([], 1, 3, False),
+    ([Vote.OBVIOUSLY_TENANT, Vote.OBVIOUSLY_TENANT], 1, 1, False),
+    # No third vote can produce a decision
+    ([Vote.OBVIOUSLY_TENANT, Vote.OBVIOUSLY_LANDLORD], 1, 1, True),
+    ([Vote.OBVIOUSLY_TENANT, Vote.NOT_SURE], 1, 1, True),
+    ([Vote.OBVIOUSLY_TENANT, Vote.OBVIOUSLY_TENANT, Vote.MOST_LIKELY_TENANT], 1, 0, True),
+    # Later rounds need 2 obvious or likely votes for a side
+    ([Vote.MOST_LIKELY_TENANT, Vote.MOST_LIKELY_TENANT], 2, 1, True),
+    ([Vote.OBVIOUSLY_TENANT, Vote.OBVIOUSLY_LANDLORD], 2, 1, False),
+    ([Vote.NOT_SURE, Vote.NOT_SURE], 3, 1, True),
+])
+def test_is_round_decided(votes, round_number, remaining, decided):
+    assert tracker_with(votes, round_number).is_round_decided(remaining) == decided
+
+
+def test_is_round_decided_agrees_with_final_decision():
+    tracker = tracker_with([Vote.MOST_LIKELY_TENANT, Vote.MOST_LIKELY_TENANT], round_number=2)
+    assert tracker.is_round_decided(1)
+    for last_vote in Vote:
+        final = tracker_with([Vote.MOST_LIKELY_TENANT, Vote.MOST_LIKELY_TENANT, last_vote], round_number=2)
+        assert final.check_decision_criteria() == "tenant"